@@ -0,0 +1,305 @@
+"""
+Content-addressed result cache for Mutest.
+
+The verdict of a mutant only depends on the code it mutates and on the tests
+that run against it. Each result is stored under a key made from:
+    - the hash of the source of the enclosing function (or of the whole
+      module for points outside any function)
+    - the mutation descriptor, with its line relative to that function so
+      that edits elsewhere in the file do not invalidate it
+    - the hash of the test files the test command runs
+    - the test command itself
+
+A rerun after an edit only executes the mutants of the functions (or tests)
+that changed; everything else is read back from .mutest_cache/results.
+Verdicts that depend on the run's options are only reused when they still
+hold: no_coverage needs recorded coverage (reachability on), and a survivor
+of only the tests that reach it needs unconfirmed test selection.
+Changes to helpers that a mutated function calls are not detected, so use
+--no-cache after refactoring shared code.
+
+The mutation point index of each source file (with the bytecode digests
+used to skip equivalent mutants) is kept in .mutest_cache/points, keyed by
+the file's content, so unchanged files are not parsed again. The tests that
+killed mutants of each source file (see killhistory.py) are kept in
+.mutest_cache/kills.
+"""
+import ast
+import fnmatch
+import hashlib
+import json
+import os
+import shlex
+import sys
+from forkserver import parse_pytest_command
+from mutest001 import MODULE_SCOPE, MUTEST_VERSION, function_scopes
+from sandbox import IGNORED_PATTERNS
+
+
+CACHE_DIR = '.mutest_cache'
+
+# Bump when the meaning of a stored verdict changes
+CACHE_VERSION = 2
+
+# Bump when the layout of a stored point index changes
+POINT_INDEX_VERSION = 1
+
+# Timeouts depend on machine load, so they are always re-checked
+CACHEABLE_STATUSES = ('killed', 'survived', 'no_coverage')
+
+# Files pytest loads when it collects a directory
+TEST_FILE_PATTERNS = ('test_*.py', '*_test.py', 'conftest.py')
+
+
+def _digest(*parts):
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part.encode('utf-8') if isinstance(part, str) else part)
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+
+def _ignored(name):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in IGNORED_PATTERNS)
+
+
+def collect_test_files(test_command, root='.'):
+    """
+    Test files a test command runs, as far as can be told from its arguments
+
+    Paths named on the command line are used as given (directories are
+    searched for pytest test files and conftest.py); if none are named the
+    whole project under root is searched. conftest.py files above a named
+    path are included as well.
+
+    Returns:
+        Sorted list of file paths
+    """
+    args = parse_pytest_command(test_command)
+    if args is None:
+        try:
+            args = shlex.split(test_command)[1:]
+        except ValueError:
+            args = []
+
+    targets = []
+    for arg in args:
+        path = arg.split('::')[0]
+        if not arg.startswith('-') and os.path.exists(path):
+            targets.append(path)
+    if not targets:
+        targets = [root]
+
+    root = os.path.abspath(root)
+    files = set()
+    for target in targets:
+        target = os.path.abspath(target)
+        if os.path.isfile(target):
+            files.add(target)
+        else:
+            for dirpath, dirnames, filenames in os.walk(target):
+                dirnames[:] = [d for d in dirnames if not _ignored(d)]
+                for filename in filenames:
+                    if any(fnmatch.fnmatch(filename, p) for p in TEST_FILE_PATTERNS):
+                        files.add(os.path.join(dirpath, filename))
+
+        # conftest.py files between the target and the project root
+        directory = os.path.dirname(target) if os.path.isfile(target) else target
+        while directory.startswith(root):
+            conftest = os.path.join(directory, 'conftest.py')
+            if os.path.isfile(conftest):
+                files.add(conftest)
+            if directory == root:
+                break
+            directory = os.path.dirname(directory)
+
+    return sorted(files)
+
+
+def hash_files(paths):
+    """Hash the names and contents of a set of files"""
+    sha = hashlib.sha256()
+    for path in sorted(paths):
+        sha.update(os.path.relpath(path).encode('utf-8') + b'\0')
+        try:
+            with open(path, 'rb') as f:
+                sha.update(f.read())
+        except OSError:
+            pass
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+
+class ResultCache:
+    """Verdicts of previous runs, keyed by what each verdict depends on"""
+
+    def __init__(self, source_file_path, test_command, cache_dir=CACHE_DIR, tests_hash=None):
+        """
+        Args:
+            source_file_path: Source file whose mutants are looked up
+            test_command: Command the tests are run with
+            cache_dir: Directory the results are stored in
+            tests_hash: hash_files() of the test files, if already known
+                        (caches of several source files can share it)
+        """
+        self.source_file_path = source_file_path
+        self.test_command = test_command
+        self.results_dir = os.path.join(cache_dir, 'results')
+
+        with open(source_file_path, 'r') as f:
+            self.source_code = f.read()
+        self.source_lines = self.source_code.splitlines(keepends=True)
+
+        # Parsed on first use, so setting up the caches of many files is cheap
+        self._scopes = None
+
+        if tests_hash is None:
+            tests_hash = hash_files(collect_test_files(test_command))
+        self.tests_hash = tests_hash
+        self.hits = 0
+
+    @property
+    def scopes(self):
+        """Line span (first, last) of every function scope, by qualified name"""
+        if self._scopes is None:
+            scopes = {}
+            for qualname, node in function_scopes(ast.parse(self.source_code)):
+                first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                scopes[qualname] = (first, node.end_lineno)
+            self._scopes = scopes
+        return self._scopes
+
+    def _scope(self, mutation_info):
+        """(first line, source hash) of the scope a mutation point belongs to"""
+        scope = self.scopes.get(mutation_info.get('function', MODULE_SCOPE))
+        if scope is None:
+            return 1, _digest(self.source_code)
+        first, last = scope
+        return first, _digest(''.join(self.source_lines[first - 1:last]))
+
+    def key(self, mutation_info):
+        """Cache key of a mutant"""
+        first, scope_hash = self._scope(mutation_info)
+        descriptor = json.dumps([
+            mutation_info['type'],
+            mutation_info['original'],
+            mutation_info['mutated'],
+            mutation_info['line'] - first,
+            mutation_info['col'],
+            mutation_info.get('end_line', mutation_info['line']) - first,
+            mutation_info.get('end_col'),
+            mutation_info.get('op_index', 0),
+        ])
+        return _digest(
+            str(CACHE_VERSION),
+            os.path.relpath(self.source_file_path),
+            scope_hash,
+            descriptor,
+            self.tests_hash,
+            self.test_command
+        )
+
+    def _path(self, key):
+        return os.path.join(self.results_dir, key[:2], key + '.json')
+
+    def get(self, mutation_info):
+        """
+        Look up the verdict of a mutant
+
+        Returns:
+            dict with 'status' (and 'return_code' if the tests ran), or None
+        """
+        try:
+            with open(self._path(self.key(mutation_info)), 'r') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if record.get('status') not in CACHEABLE_STATUSES:
+            return None
+        self.hits += 1
+        return record
+
+    def put(self, mutation_info, result):
+        """Store the verdict of a mutant (timeouts are not stored)"""
+        if result['status'] not in CACHEABLE_STATUSES:
+            return
+
+        record = {'status': result['status']}
+        if 'return_code' in result:
+            record['return_code'] = result['return_code']
+        if 'killing_tests' in result:
+            record['killing_tests'] = result['killing_tests']
+        if 'selected_tests' in result and not result.get('confirmed'):
+            # Only the tests that reach the mutant ran (see MutationTestExecutor._reusable())
+            record['selected_tests'] = result['selected_tests']
+
+        path = self._path(self.key(mutation_info))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(record, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache result: {e}")
+
+
+def kill_history_path(source_file_path, test_command, cache_dir=CACHE_DIR):
+    """File the kill history of a source file and test command is kept in"""
+    key = _digest(os.path.relpath(source_file_path), test_command)
+    return os.path.join(cache_dir, 'kills', key + '.json')
+
+
+class PointIndexCache:
+    """Mutation point indexes of source files, keyed by their content"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        """
+        Args:
+            cache_dir: Directory the indexes are stored in
+        """
+        self.index_dir = os.path.join(cache_dir, 'points')
+
+    def key(self, source_code):
+        """
+        Cache key of the index of a source
+
+        Node paths and bytecode digests depend on the Python version, and
+        points on the Mutest version, so both are part of the key.
+        """
+        return _digest(
+            str(POINT_INDEX_VERSION),
+            MUTEST_VERSION,
+            sys.version,
+            source_code
+        )
+
+    def _path(self, key):
+        return os.path.join(self.index_dir, key[:2], key + '.json')
+
+    def get(self, source_code):
+        """
+        Look up the index of a source
+
+        Returns:
+            The index dict stored by put(), or None
+        """
+        try:
+            with open(self._path(self.key(source_code)), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and 'points' in entry else None
+
+    def put(self, source_code, entry):
+        """Store the index of a source (see MutantGenerator._load_index())"""
+        path = self._path(self.key(source_code))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache mutation points: {e}")
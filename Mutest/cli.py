@@ -3,15 +3,23 @@ Command-line interface for Mutest mutation testing tool.
 Provides easy-to-use commands for running mutation tests and generating reports.
 """
 import click
+import json
 import sys
 import os
 from pathlib import Path
-from mutest001 import MutantGenerator, MutationTestExecutor
-from report import generate_text_report, generate_html_report, generate_json_report
+from mutest001 import MUTEST_VERSION, MutantGenerator, MutationTestExecutor, resolve_jobs
+from cache import PointIndexCache, ResultCache, collect_test_files, hash_files, kill_history_path
+from gitdiff import GitDiffError
+from killhistory import KillHistory
+from killmatrix import KillMatrix, keyword_selection, minimize_tests
+from store import ResultStore
+from project import ProjectRun, discover_sources, enumerate_file, enumerate_sources
+from report import SurvivorStream, generate_text_report, generate_html_report, generate_json_report
+from sampling import threshold_verdict
 
 
 @click.group()
-@click.version_option(version='0.0.1', prog_name='Mutest')
+@click.version_option(version=MUTEST_VERSION, prog_name='Mutest')
 def cli():
     """
     🧬 Mutest - Mutation Testing Tool
@@ -24,8 +32,12 @@ def cli():
 
 
 @cli.command()
-@click.argument('source_file', type=click.Path(exists=True))
+@click.argument('sources', nargs=-1, required=True)
 @click.argument('test_command')
+@click.option('--include', multiple=True, metavar='PATTERN',
+              help='Only mutate files found in directories or globs that match PATTERN (default *.py, repeatable)')
+@click.option('--exclude', multiple=True, metavar='PATTERN',
+              help='Skip files or directories matching PATTERN (repeatable); test files are always skipped')
 @click.option('--report-format', '-f',
               type=click.Choice(['text', 'html', 'json', 'all'], case_sensitive=False),
               help='Output format for the report (if not specified, you will be prompted)')
@@ -34,22 +46,116 @@ def cli():
               help='Output file path (auto-generated if not specified)')
 @click.option('--verbose', '-v', is_flag=True,
               help='Show detailed output during mutation testing')
-def run(source_file, test_command, report_format, output, verbose):
+@click.option('--jobs', '-j', type=click.IntRange(min=0), default=0, show_default=True,
+              help='Number of parallel workers, each in its own copy of the project (0 = one per CPU core)')
+@click.option('--runner',
+              type=click.Choice(['subprocess', 'forkserver'], case_sensitive=False),
+              default='subprocess', show_default=True,
+              help='How tests run per mutant: a fresh test command, or a warm pytest process forked per mutant')
+@click.option('--inject/--no-inject', default=True, show_default=True,
+              help='Serve mutants from memory through an import hook instead of rewriting the source file (pytest commands)')
+@click.option('--schemata', is_flag=True,
+              help='Compile all mutants into one switchable module, loaded once per test process')
+@click.option('--test-selection', is_flag=True,
+              help='Record per-test coverage once and run only the tests that reach each mutated line')
+@click.option('--confirm-survivors', is_flag=True,
+              help='With --test-selection, re-run surviving mutants against the full test suite')
+@click.option('--reachability/--no-reachability', default=True, show_default=True,
+              help='Report mutants on lines no test executes as NO COVERAGE without running them (pytest commands)')
+@click.option('--timeout-factor', type=click.FloatRange(min=0), default=2.0, show_default=True,
+              help='Per-mutant timeout as a multiple of the baseline test duration...')
+@click.option('--timeout-constant', type=click.FloatRange(min=0), default=1.0, show_default=True,
+              help='...plus this many seconds')
+@click.option('--baseline-runs', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Times to run the original tests when measuring the baseline duration')
+@click.option('--recheck-timeouts', is_flag=True,
+              help='Re-run timed-out mutants once with a longer limit before reporting them')
+@click.option('--cache/--no-cache', 'use_cache', default=True, show_default=True,
+              help='Reuse verdicts of mutants whose function and tests are unchanged since a previous run, and the mutation points of unchanged files')
+@click.option('--since', metavar='REF',
+              help='Only mutate lines changed against a git ref (e.g. origin/main), including uncommitted changes')
+@click.option('--resume', is_flag=True,
+              help='Pick up an interrupted run of the same source, tests and mutants where it stopped')
+@click.option('--tce/--no-tce', default=True, show_default=True,
+              help='Skip mutants that compile to the same bytecode as the original or as another mutant')
+@click.option('--sample', type=click.FloatRange(min=0, max=1, min_open=True),
+              help='Test a stratified random fraction of the mutants (e.g. 0.1) and report a confidence interval')
+@click.option('--sample-per-operator', 'per_operator', type=click.IntRange(min=1), metavar='N',
+              help='Test at most N randomly chosen mutants of each operator type')
+@click.option('--seed', type=int, default=0, show_default=True,
+              help='Seed of the mutant sample')
+@click.option('--confidence', type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+              default=0.95, show_default=True,
+              help='Confidence level of the interval reported around a sampled mutation score')
+@click.option('--stop-margin', type=click.FloatRange(min=0, min_open=True), metavar='POINTS',
+              help='Test mutants in random order and stop once the score is known to within +/- POINTS percent')
+@click.option('--stop-threshold', type=click.FloatRange(min=0, max=100), metavar='SCORE',
+              help='Test mutants in random order and stop once the score is known to be above or below SCORE percent')
+@click.option('--kill-matrix', is_flag=True,
+              help='Record which tests kill each mutant (pytest commands) and export the kill matrix in the JSON report')
+@click.option('--fail-fast', is_flag=True,
+              help="Run each mutant's tests most likely killer first and stop at the first failure (pytest commands)")
+@click.option('--survivors-first', is_flag=True,
+              help='Test the mutants most likely to survive first and write survivors to '
+                   'reports/survivors.txt as soon as they are confirmed')
+def run(sources, test_command, include, exclude, report_format, output, verbose, jobs, runner, inject, schemata,
+        test_selection, confirm_survivors, reachability, timeout_factor, timeout_constant,
+        baseline_runs, recheck_timeouts, use_cache, since, resume, tce, sample,
+        per_operator, seed, confidence, stop_margin, stop_threshold, kill_matrix, fail_fast,
+        survivors_first):
     """
-    Run mutation tests on a source file.
+    Run mutation tests on source files.
 
-    SOURCE_FILE: Path to the Python source file to mutate
+    SOURCES: Python source files, directories or glob patterns to mutate
 
     TEST_COMMAND: Command to run tests (e.g., "pytest tests/")
 
+    Several files are tested together: one baseline run, one queue of
+    mutants shared by all workers, and a report with a per-file breakdown.
+
     Examples:
 
         mutest run math_utils.py "pytest tests/test_math.py"
 
+        mutest run src/ "pytest tests/" --exclude "src/legacy/*"
+
+        mutest run "src/**/models.py" "pytest tests/" --jobs 8
+
         mutest run src/calculator.py "python -m pytest tests/" --report-format html
 
         mutest run utils.py "pytest" -f json -o results.json
+
+        mutest run utils.py "pytest" --jobs 8
+
+        mutest run utils.py "pytest tests/" --runner forkserver
+
+        mutest run utils.py "pytest tests/" --runner forkserver --schemata
+
+        mutest run utils.py "pytest tests/" --test-selection --confirm-survivors
+
+        mutest run utils.py "pytest tests/" --baseline-runs 3 --timeout-factor 3 --recheck-timeouts
+
+        mutest run utils.py "pytest tests/" --no-cache
+
+        mutest run utils.py "pytest tests/" --fail-fast
+
+        mutest run src/ "pytest tests/" --survivors-first
+
+        mutest run utils.py "pytest tests/" --since origin/main
+
+        mutest run utils.py "pytest tests/" --resume
+
+        mutest run utils.py "pytest tests/" --sample 0.1 --seed 7
+
+        mutest run utils.py "pytest tests/" --stop-margin 2 --confidence 0.95
+
+        mutest run utils.py "pytest tests/" --stop-threshold 80
+
+        mutest run utils.py "pytest tests/" --kill-matrix -f json
     """
+    if sample and per_operator:
+        raise click.UsageError("--sample and --sample-per-operator cannot be combined")
+
     click.echo("=" * 60)
     click.echo(click.style("MUTEST - Mutation Testing", fg='cyan', bold=True))
     click.echo("=" * 60)
@@ -74,43 +180,131 @@ def run(source_file, test_command, report_format, output, verbose):
         )
         click.echo()
 
+    source_files = discover_sources(sources, include, exclude)
+    if not source_files:
+        click.echo(click.style("❌ No Python source files found.", fg='red'), err=True)
+        sys.exit(1)
+    if len(source_files) == 1:
+        source_file = source_files[0]
+    else:
+        source_file = f"{', '.join(sources)} ({len(source_files)} files)"
+
     # Display configuration
     click.echo(f"Source file: {click.style(source_file, fg='green')}")
     click.echo(f"Test command: {click.style(test_command, fg='green')}")
     click.echo(f"Report format: {click.style(report_format, fg='green')}")
+    click.echo(f"Workers: {click.style(str(resolve_jobs(jobs)), fg='green')}")
+    click.echo(f"Runner: {click.style(runner, fg='green')}")
+    if since:
+        click.echo(f"Changed since: {click.style(since, fg='green')}")
     click.echo()
 
-    # Read source code
-    try:
-        with open(source_file, 'r') as f:
-            source_code = f.read()
-    except Exception as e:
-        click.echo(click.style(f"❌ Error reading file: {e}", fg='red'), err=True)
-        sys.exit(1)
-
-    # Generate mutants
-    click.echo(click.style("Generating mutants...", fg='yellow'))
-    generator = MutantGenerator()
-    mutants = generator.generate_mutants(source_code)
-    click.echo(click.style(f"Generated {len(mutants)} mutants", fg='green'))
-    click.echo()
+    store = ResultStore()
+    tests_hash = hash_files(collect_test_files(test_command)) if use_cache else None
+
+    def make_executor(path):
+        return MutationTestExecutor(
+            path, test_command,
+            jobs=jobs,
+            runner=runner,
+            inject=inject,
+            test_selection=test_selection,
+            confirm_survivors=confirm_survivors,
+            reachability=reachability,
+            timeout_factor=timeout_factor,
+            timeout_constant=timeout_constant,
+            baseline_runs=baseline_runs,
+            recheck_timeouts=recheck_timeouts,
+            cache=ResultCache(path, test_command, tests_hash=tests_hash) if use_cache else None,
+            store=store,
+            resume=resume,
+            confidence=confidence,
+            stop_margin=stop_margin,
+            stop_threshold=stop_threshold,
+            seed=seed,
+            kill_matrix=kill_matrix,
+            fail_fast=fail_fast,
+            history=KillHistory.load(kill_history_path(path, test_command)) if use_cache and fail_fast else None,
+            survivors_first=survivors_first
+        )
 
-    if len(mutants) == 0:
-        click.echo(click.style("No mutations found. The source file may not have mutable operators.", fg='yellow'))
-        sys.exit(0)
+    options = dict(since=since, schemata=schemata, tce=tce, sample=sample,
+                   per_operator=per_operator, seed=seed,
+                   index_cache=PointIndexCache() if use_cache else None)
+    if len(source_files) == 1:
+        # Generate mutants
+        click.echo(click.style("Generating mutants...", fg='yellow'))
+        generated = _generate_mutants(source_file, options)
+        mutants = generated['mutants']
+        population = generated['population']
+        counts = {key: generated[key]
+                  for key in ('equivalent_count', 'duplicate_count', 'out_of_scope_count')}
+
+        click.echo(click.style(f"Generated {len(mutants)} mutants", fg='green'))
+        if counts['equivalent_count'] or counts['duplicate_count']:
+            click.echo(f"Skipped {counts['equivalent_count']} equivalent and "
+                       f"{counts['duplicate_count']} duplicate mutants (identical bytecode)")
+        if since:
+            click.echo(f"Skipped {counts['out_of_scope_count']} mutants outside lines changed since {since}")
+        click.echo()
 
-    # Run mutation tests
-    executor = MutationTestExecutor(source_file, test_command)
+        if len(mutants) < population:
+            click.echo(f"Sampled {len(mutants)} of {population} mutants (seed {seed})")
+            click.echo()
+
+        if not mutants:
+            store.close()
+            if since:
+                click.echo(click.style(f"No mutations on lines changed since {since}.", fg='green'))
+            else:
+                click.echo(click.style("No mutations found. The source file may not have mutable operators.", fg='yellow'))
+            sys.exit(0)
+    else:
+        # Mutants are enumerated in a process pool and tested as each file is done
+        click.echo(click.style(f"Enumerating mutants of {len(source_files)} files...", fg='yellow'))
 
     if verbose:
         click.echo(click.style("Running mutation tests (verbose mode)...", fg='yellow'))
 
-    results = executor.run_mutation_tests(mutants)
+    survivor_stream = None
+    if survivors_first:
+        survivor_stream = SurvivorStream('reports/survivors.txt', test_command)
+        click.echo(f"Survivors are written to {click.style(survivor_stream.output_file, fg='green')} "
+                   f"as soon as they are confirmed")
+
+    try:
+        if len(source_files) == 1:
+            results = make_executor(source_file).run_mutation_tests(
+                mutants, population=population, on_result=survivor_stream)
+        else:
+            executors = [make_executor(path) for path in source_files]
+            results = ProjectRun(executors, enumerate_sources(source_files, **options),
+                                 on_result=survivor_stream).run()
+            if results:
+                counts = {key: results[key]
+                          for key in ('equivalent_count', 'duplicate_count', 'out_of_scope_count')}
+    except KeyboardInterrupt:
+        click.echo()
+        click.echo(click.style("Interrupted. Completed verdicts are saved; "
+                               "rerun with --resume to continue.", fg='yellow'), err=True)
+        sys.exit(130)
+    finally:
+        store.close()
 
     if not results:
         click.echo(click.style("Mutation testing failed. See errors above.", fg='red'), err=True)
         sys.exit(1)
 
+    if not results['total']:
+        click.echo(click.style("No mutations found. The source files may not have mutable operators.", fg='yellow'))
+        sys.exit(0)
+
+    if since:
+        results['since'] = since
+        results['out_of_scope_count'] = counts['out_of_scope_count']
+    results['equivalent_count'] = counts['equivalent_count']
+    results['duplicate_count'] = counts['duplicate_count']
+
     # Display quick summary
     click.echo()
     click.echo("=" * 60)
@@ -120,11 +314,53 @@ def run(source_file, test_command, report_format, output, verbose):
     click.echo(click.style(f"Killed: {results['killed_count']}", fg='green'))
     click.echo(click.style(f"Survived: {results['survived_count']}", fg='red' if results['survived_count'] > 0 else 'green'))
     click.echo(f"Timeout: {results['timeout_count']}")
+    click.echo(click.style(f"No Coverage: {results['no_coverage_count']}", fg='red' if results['no_coverage_count'] > 0 else 'green'))
+    if results['cached_count']:
+        click.echo(f"From Cache: {results['cached_count']}")
+    if since:
+        click.echo(f"Out of Scope: {results['out_of_scope_count']} (unchanged since {since})")
+    if results['equivalent_count'] or results['duplicate_count']:
+        click.echo(f"Equivalent: {results['equivalent_count']}, Duplicates: {results['duplicate_count']} (not run)")
 
     score = results['mutation_score']
     score_color = 'green' if score >= 80 else 'yellow' if score >= 60 else 'red'
     click.echo()
     click.echo(f"Mutation Score: {click.style(f'{score:.2f}%', fg=score_color, bold=True)}")
+    if results['sampled']:
+        low, high = results['score_interval']
+        click.echo(f"{confidence:.0%} Confidence Interval: {low:.2f}% - {high:.2f}% "
+                   f"(sample of {results['total']} from {results['population']} mutants)")
+    if results['stopped_early']:
+        click.echo(f"Stopped early after executing {results['executed_count']} mutants")
+        if stop_threshold is not None:
+            # A stop on --stop-margin can leave the interval straddling the threshold
+            verdict = threshold_verdict(results['score_interval'], stop_threshold)
+            if verdict is None:
+                click.echo(click.style(f"Undecided whether the score is above {stop_threshold:g}% "
+                                       f"at {confidence:.0%} confidence", fg='yellow'))
+            else:
+                click.echo(click.style(f"Score is {verdict} {stop_threshold:g}% at {confidence:.0%} confidence",
+                                       fg='green' if verdict == 'above' else 'red'))
+    if results['no_coverage_count']:
+        click.echo(f"Covered Mutation Score: {results['covered_mutation_score']:.2f}%")
+    if results.get('kill_matrix') is not None:
+        matrix = results['kill_matrix']
+        click.echo(f"Kill Matrix: {len(matrix.tests)} tests x {len(matrix.mutants)} mutants "
+                   f"(in the JSON report)")
+    fail_fast_kills = [r for r in results['killed'] if 'tests_run' in r]
+    if fail_fast_kills:
+        first = sum(1 for r in fail_fast_kills if r['tests_run'] <= 1)
+        per_kill = sum(r['tests_run'] for r in fail_fast_kills) / len(fail_fast_kills)
+        click.echo(f"Fail-fast: {first} of {len(fail_fast_kills)} killed mutants fell to the first "
+                   f"test run ({per_kill:.1f} tests per kill)")
+    if results.get('files'):
+        click.echo()
+        click.echo("Per file:")
+        for entry in results['files']:
+            file_score = entry['mutation_score']
+            file_color = 'green' if file_score >= 80 else 'yellow' if file_score >= 60 else 'red'
+            click.echo(f"  {click.style(f'{file_score:6.2f}%', fg=file_color)}  "
+                       f"{entry['killed_count']}/{entry['total']} killed  {entry['source_file']}")
     click.echo()
 
     # Generate reports
@@ -146,7 +382,7 @@ def run(source_file, test_command, report_format, output, verbose):
     click.echo()
 
     # Exit with appropriate code
-    if results['survived_count'] > 0:
+    if results['survived_count'] + results['no_coverage_count'] > 0:
         click.echo(click.style("Some mutants survived. Consider improving your tests!", fg='yellow'))
         sys.exit(0)  # Don't fail CI/CD, just warn
     else:
@@ -154,41 +390,209 @@ def run(source_file, test_command, report_format, output, verbose):
         sys.exit(0)
 
 
+def _generate_mutants(source_file, options):
+    """
+    Generate (and sample) the mutants of one source file, exiting on errors
+
+    Args:
+        source_file: Path of the source file
+        options: Keyword arguments of project.enumerate_file()
+
+    Returns:
+        enumerate_file() dict
+    """
+    try:
+        return enumerate_file(source_file, **options)
+    except OSError as e:
+        click.echo(click.style(f"❌ Error reading file {source_file}: {e}", fg='red'), err=True)
+    except GitDiffError as e:
+        click.echo(click.style(f"❌ Could not diff against {options['since']}: {e}", fg='red'), err=True)
+    except SyntaxError as e:
+        click.echo(click.style(f"❌ Could not parse {source_file}: {e}", fg='red'), err=True)
+    sys.exit(1)
+
+
 @cli.command()
-@click.argument('source_file', type=click.Path(exists=True))
-def preview(source_file):
+@click.argument('sources', nargs=-1, required=True)
+@click.option('--include', multiple=True, metavar='PATTERN',
+              help='Only preview files found in directories or globs that match PATTERN (default *.py, repeatable)')
+@click.option('--exclude', multiple=True, metavar='PATTERN',
+              help='Skip files or directories matching PATTERN (repeatable); test files are always skipped')
+@click.option('--summary', '-s', is_flag=True,
+              help='Print mutation point counts per file, function and operator instead of every mutation')
+@click.option('--cache/--no-cache', 'use_cache', default=True, show_default=True,
+              help='Reuse the mutation points of files that are unchanged since they were last indexed')
+def preview(sources, include, exclude, summary, use_cache):
     """
     Preview mutations without running tests.
 
-    Shows all possible mutations that would be generated for a source file.
+    Lists the mutation points of source files, directories or glob
+    patterns. Only the points are enumerated: no mutant is compiled or
+    rendered, so this is fast enough to size a run before starting it.
+    Counts are taken before equivalent and duplicate mutants are skipped.
 
-    Example:
+    Examples:
 
         mutest preview math_utils.py
+
+        mutest preview src/ --summary
     """
     click.echo("=" * 60)
     click.echo(click.style("MUTATION PREVIEW", fg='cyan', bold=True))
     click.echo("=" * 60)
     click.echo()
 
-    try:
-        with open(source_file, 'r') as f:
-            source_code = f.read()
-    except Exception as e:
-        click.echo(click.style(f"❌ Error reading file: {e}", fg='red'), err=True)
+    source_files = discover_sources(sources, include, exclude)
+    if not source_files:
+        click.echo(click.style("❌ No Python source files found.", fg='red'), err=True)
         sys.exit(1)
 
-    generator = MutantGenerator()
-    mutants = generator.generate_mutants(source_code)
+    generator = MutantGenerator(index_cache=PointIndexCache() if use_cache else None)
+    points_by_file = []
+    for path in source_files:
+        try:
+            with open(path, 'r') as f:
+                source_code = f.read()
+            points = generator.mutation_points(source_code)
+        except (OSError, SyntaxError, ValueError) as e:
+            click.echo(click.style(f"❌ Skipping {path}: {e}", fg='red'), err=True)
+            continue
+        points_by_file.append((path, points))
+
+    total = sum(len(points) for _, points in points_by_file)
+    click.echo(f"Found {click.style(str(total), fg='green', bold=True)} possible mutations"
+               f"{f' in {len(points_by_file)} files' if len(source_files) > 1 else ''}:")
+    click.echo()
 
-    click.echo(f"Found {click.style(str(len(mutants)), fg='green', bold=True)} possible mutations:")
+    if summary:
+        _print_point_counts(points_by_file)
+        return
+
+    for path, points in points_by_file:
+        if len(source_files) > 1:
+            click.echo(click.style(f"{path} ({len(points)})", fg='cyan', bold=True))
+            click.echo()
+        for i, info in enumerate(points, 1):
+            click.echo(f"{i}. {click.style(info['type'], fg='yellow')}")
+            click.echo(f"   Line {info['line']}: {click.style(info['original'], fg='red')} → {click.style(info['mutated'], fg='green')}")
+            click.echo()
+
+
+def _print_point_counts(points_by_file):
+    """Print mutation point counts per file, per function and per operator"""
+    by_function = {}
+    by_operator = {}
+    for path, points in points_by_file:
+        for info in points:
+            key = (path, info['function'])
+            by_function[key] = by_function.get(key, 0) + 1
+            key = (info['type'], info['original'])
+            by_operator[key] = by_operator.get(key, 0) + 1
+
+    click.echo(click.style("Per file:", bold=True))
+    for path, points in sorted(points_by_file, key=lambda item: -len(item[1])):
+        click.echo(f"  {len(points):7d}  {path}")
     click.echo()
 
-    for i, mutant in enumerate(mutants, 1):
-        info = mutant['info']
-        click.echo(f"{i}. {click.style(info['type'], fg='yellow')}")
-        click.echo(f"   Line {info['line']}: {click.style(info['original'], fg='red')} → {click.style(info['mutated'], fg='green')}")
-        click.echo()
+    click.echo(click.style("Per function:", bold=True))
+    for (path, function), count in sorted(by_function.items(), key=lambda item: -item[1]):
+        click.echo(f"  {count:7d}  {path}::{function}")
+    click.echo()
+
+    click.echo(click.style("Per operator:", bold=True))
+    for (operator_type, original), count in sorted(by_operator.items(), key=lambda item: -item[1]):
+        click.echo(f"  {count:7d}  {operator_type} {original}")
+
+
+@cli.command()
+@click.argument('report', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', '-f', 'output_format', type=click.Choice(['nodeids', 'k'], case_sensitive=False),
+              default='nodeids', show_default=True,
+              help='Emit the kept tests as pytest node ids, or as a -k expression of their names')
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              help='Write the selection to a file instead of printing it')
+def minimize(report, output_format, output):
+    """
+    Pick a small, fast subset of the tests that keeps the mutation score.
+
+    REPORT: JSON report of a `mutest run --kill-matrix` run
+
+    Tests are chosen by greedy set cover over the kill matrix, preferring
+    tests that kill many mutants per second of run time, until every mutant
+    the full suite kills is killed again.
+
+    A -k expression matches test names as substrings, so it can select more
+    tests than the node id list (test_add also matches test_add_negative,
+    same-named tests in other classes or files, every case of a
+    parametrized test); a note says how many.
+
+    Examples:
+
+        mutest minimize reports/mutest_report.json -o fast_tests.txt
+
+        pytest $(cat fast_tests.txt)
+
+        mutest minimize reports/mutest_report.json -f k
+    """
+    click.echo("=" * 60)
+    click.echo(click.style("TEST SUITE MINIMIZATION", fg='cyan', bold=True))
+    click.echo("=" * 60)
+    click.echo()
+
+    try:
+        with open(report, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        matrix = KillMatrix.from_dict(data['kill_matrix'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        click.echo(click.style(f"❌ No kill matrix in {report} ({e}). "
+                               "Run mutest with --kill-matrix -f json first.", fg='red'), err=True)
+        sys.exit(1)
+
+    kept = minimize_tests(matrix)
+    killed = bin(matrix.killed()).count('1')
+
+    if not kept:
+        # An empty selection would make pytest run the whole suite
+        click.echo(click.style("No test kills any mutant, there is nothing to select.", fg='yellow'))
+        if output:
+            click.echo(f"Selection not saved to {output}.")
+        return
+
+    click.echo(f"Tests kept: {click.style(str(len(kept)), fg='green', bold=True)} of {len(matrix.tests)}")
+    click.echo(f"Mutants killed: {killed} of {len(matrix.mutants)} (unchanged)")
+    if matrix.durations:
+        full = sum(matrix.durations.values())
+        subset = sum(matrix.durations.get(test, 0.0) for test in kept)
+        saved = full - subset
+        click.echo(f"Test time: {full:.2f}s -> {subset:.2f}s "
+                   f"(saves {saved:.2f}s, {saved / full:.0%})" if full else
+                   f"Test time: {full:.2f}s -> {subset:.2f}s")
+    else:
+        click.echo("Test time: unknown (the report has no test durations)")
+    click.echo()
+
+    if output_format == 'k':
+        selection, extra = keyword_selection(matrix.tests, kept)
+        usage = f'pytest -k "{selection}"'
+        if extra:
+            click.echo(click.style(f"Note: the -k expression also selects {len(extra)} other "
+                                   f"test{'s' if len(extra) > 1 else ''} (e.g. {extra[0]}), "
+                                   f"use -f nodeids for the exact subset.", fg='yellow'))
+            click.echo()
+    else:
+        selection = '\n'.join(kept)
+        usage = f"pytest $(cat {output})" if output else None
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(selection + '\n')
+        click.echo(f"Selection saved: {click.style(output, fg='green')}")
+        if usage:
+            click.echo(f"Run it with: {usage}")
+    elif output_format == 'k':
+        click.echo(usage)
+    else:
+        click.echo(selection)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+"""
+Per-test coverage map for Mutest.
+
+The baseline test run on the original code can be instrumented with the
+mutest_runtime line recorder, which records which test node ids execute which
+lines of the source file. Each mutant then only needs to run the tests that
+actually reach its mutated lines, and mutants on lines no test executes are
+known to survive without running anything.
+"""
+import json
+import os
+import tempfile
+
+
+class CoverageMap:
+    """Which tests execute which lines of a source file"""
+
+    def __init__(self, tests, global_lines=()):
+        """
+        Args:
+            tests: Mapping of test node id -> iterable of executed line numbers
+            global_lines: Lines executed outside any test (at import or
+                          collection time), which every test depends on
+        """
+        self.tests = {nodeid: set(lines) for nodeid, lines in tests.items()}
+        self.global_lines = set(global_lines)
+
+        self.line_tests = {}
+        for nodeid, lines in self.tests.items():
+            for line in lines:
+                self.line_tests.setdefault(line, set()).add(nodeid)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('tests', {}), data.get('global', ()))
+
+    def is_empty(self):
+        """True if no line of the file ran at all during the recorded run"""
+        return not self.line_tests and not self.global_lines
+
+    def tests_for(self, mutation_info):
+        """
+        Tests that execute the lines of a mutation
+
+        Returns:
+            Sorted list of node ids (empty if no test reaches the mutation),
+            or None if the lines run at import time and every test depends
+            on them
+        """
+        first = mutation_info['line']
+        last = mutation_info.get('end_line') or first
+        lines = range(first, last + 1)
+
+        if any(line in self.global_lines for line in lines):
+            return None
+
+        tests = set()
+        for line in lines:
+            tests.update(self.line_tests.get(line, ()))
+        return sorted(tests)
+
+
+def instrument_env(env, source_file_paths):
+    """
+    Environment for a test run that records per-test line coverage
+
+    Args:
+        env: Environment that makes mutest_runtime importable
+        source_file_paths: Source file (or list of files) to record coverage for
+
+    Returns:
+        (env, output_path) - pass output_path to load_coverage_maps() after the run
+    """
+    if isinstance(source_file_paths, str):
+        source_file_paths = [source_file_paths]
+
+    handle, output_path = tempfile.mkstemp(prefix='mutest-coverage-', suffix='.json')
+    os.close(handle)
+
+    env = dict(env)
+    env['MUTEST_COVERAGE_PATH'] = os.pathsep.join(os.path.realpath(path) for path in source_file_paths)
+    env['MUTEST_COVERAGE_OUT'] = output_path
+    return env, output_path
+
+
+def load_coverage_maps(output_path):
+    """
+    Read (and remove) the coverage recorded by an instrumented run
+
+    Returns:
+        dict of real source path -> CoverageMap (every recorded file is
+        present, with no tests if none executed it), or None if nothing
+        was recorded
+    """
+    try:
+        with open(output_path, 'r') as f:
+            files = json.load(f)['files']
+        return {path: CoverageMap.from_dict(data) for path, data in files.items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+def load_coverage_map(output_path, source_file_path):
+    """
+    Read (and remove) the coverage recorded for one source file
+
+    Returns:
+        CoverageMap, or None if nothing was recorded
+    """
+    maps = load_coverage_maps(output_path)
+    if maps is None:
+        return None
+    return maps.get(os.path.realpath(source_file_path))
@@ -0,0 +1,416 @@
+"""
+Fork-server test runner for Mutest.
+
+Starting a fresh interpreter, importing pytest, loading plugins and collecting
+tests dominates the run time of small, fast test suites. The fork server pays
+that cost once: it starts a single warm process that has pytest and the test
+modules loaded, and for every mutant it forks a child that swaps in only the
+mutated module and runs the already-collected test items.
+
+The module has two halves:
+    - ForkServer, the client used by MutationTestExecutor
+    - main(), the server itself, started by ForkServer.start()
+
+Client and server talk over stdin/stdout using one JSON object per line.
+"""
+import json
+import os
+import select
+import shlex
+import signal
+import subprocess
+import sys
+import time
+import types
+try:
+    # The server runs inside the test process, where the runtime is a top-level module
+    import mutest_runtime
+except ImportError:
+    from runtime import mutest_runtime
+
+
+# Runs this file as the server. Started as `python forkserver.py`, the server
+# would have the Mutest directory first on sys.path while it collects the
+# project's tests, and Mutest's modules would shadow the project's; with -c
+# the project (the working directory) comes first and run_path() adds nothing.
+SERVER_LAUNCHER = 'import runpy; runpy.run_path({path!r}, run_name="__main__")'
+
+# Launchers that are recognised as "run pytest" in a test command
+PYTEST_LAUNCHERS = (
+    ['pytest'],
+    ['py.test'],
+    ['python', '-m', 'pytest'],
+    ['python3', '-m', 'pytest'],
+)
+
+
+def split_pytest_command(test_command):
+    """
+    Split a test command into its pytest launcher and the pytest arguments
+
+    Returns:
+        (launcher, args) lists, or None if the command does not simply run
+        pytest (pipes, other runners, environment prefixes...)
+    """
+    try:
+        argv = shlex.split(test_command)
+    except ValueError:
+        return None
+
+    if any(token in ('|', '&&', '||', ';', '>', '<') for token in argv):
+        return None
+
+    for launcher in PYTEST_LAUNCHERS:
+        head = argv[:len(launcher)]
+        if len(head) == len(launcher) and [os.path.basename(head[0])] + head[1:] == launcher:
+            return head, argv[len(launcher):]
+
+    if argv[:2] == [sys.executable, '-m'] and argv[2:3] == ['pytest']:
+        return argv[:3], argv[3:]
+
+    return None
+
+
+def parse_pytest_command(test_command):
+    """
+    Extract the pytest arguments from a test command
+
+    Returns:
+        List of arguments passed to pytest, or None if the command does not
+        simply run pytest
+    """
+    split = split_pytest_command(test_command)
+    return split[1] if split else None
+
+
+def fork_supported():
+    """Return True if this platform can run the fork server"""
+    return hasattr(os, 'fork')
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class ForkServerError(Exception):
+    """Raised when the fork server cannot be started or stops responding"""
+
+
+class ForkServer:
+    """Client for a warm pytest process that forks once per mutant"""
+
+    def __init__(self, test_command, cwd=None, env=None):
+        """
+        Args:
+            test_command: pytest command line used to collect the tests
+            cwd: Directory to start the server in (default: current directory)
+            env: Environment for the server process (default: this
+                 process's); the runtime directory is added to its PYTHONPATH
+        """
+        self.test_command = test_command
+        self.cwd = cwd
+        self.env = env
+        self.process = None
+        self.collected = 0
+
+    def start(self, timeout=120):
+        """Start the server and wait until test collection has finished"""
+        args = parse_pytest_command(self.test_command)
+        if args is None:
+            raise ForkServerError(f"not a pytest command: {self.test_command}")
+        if not fork_supported():
+            raise ForkServerError("os.fork() is not available on this platform")
+
+        env = dict(os.environ if self.env is None else self.env)
+        runtime_dir = os.path.dirname(os.path.abspath(mutest_runtime.__file__))
+        pythonpath = env.get('PYTHONPATH')
+        env['PYTHONPATH'] = runtime_dir + (os.pathsep + pythonpath if pythonpath else '')
+
+        self.process = subprocess.Popen(
+            [sys.executable, '-c', SERVER_LAUNCHER.format(path=os.path.abspath(__file__))] + args,
+            cwd=self.cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+
+        reply = self._read_reply(timeout)
+        if not reply.get('ready'):
+            self.close()
+            raise ForkServerError(reply.get('error', 'fork server failed to start'))
+
+        self.collected = reply.get('collected', 0)
+        return self
+
+    def run_mutant(self, source_path, code, timeout, select=None, outcomes=None,
+                   order=None, fail_fast=False):
+        """
+        Run the collected tests against a mutated version of source_path
+
+        Args:
+            select: Node ids of the only tests to run (None = all collected)
+            outcomes: File the node ids of failed tests are written to
+                      (see mutest_runtime.OutcomeRecorder), or None
+            order: Node ids of tests to run first, in this order
+            fail_fast: Stop at the first failing test
+
+        Returns:
+            The test return code (0 = all passed), or None on timeout
+        """
+        self._send({
+            'path': os.path.realpath(source_path),
+            'code': code,
+            'timeout': timeout,
+            'select': select,
+            'outcomes': outcomes,
+            'order': order,
+            'fail_fast': fail_fast
+        })
+        return self._read_result(timeout)
+
+    def run_schemata_mutant(self, source_path, mutant_id, timeout, select=None, outcomes=None,
+                            order=None, fail_fast=False):
+        """
+        Run the collected tests with one mutant of a schemata module active
+
+        The schemata module for source_path is loaded into the server once;
+        each call only forks and switches the active mutant id.
+
+        Args:
+            select: Node ids of the only tests to run (None = all collected)
+            outcomes: File the node ids of failed tests are written to, or None
+            order: Node ids of tests to run first, in this order
+            fail_fast: Stop at the first failing test
+
+        Returns:
+            The test return code (0 = all passed), or None on timeout
+        """
+        self._send({
+            'schemata': os.path.realpath(source_path),
+            'active': mutant_id,
+            'timeout': timeout,
+            'select': select,
+            'outcomes': outcomes,
+            'order': order,
+            'fail_fast': fail_fast
+        })
+        return self._read_result(timeout)
+
+    def _read_result(self, timeout):
+        # The server enforces the timeout itself; the margin covers the fork
+        reply = self._read_reply(timeout + 30)
+        if 'error' in reply:
+            raise ForkServerError(reply['error'])
+        return reply.get('return_code')
+
+    def close(self):
+        """Stop the server process"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def _send(self, message):
+        try:
+            self.process.stdin.write(json.dumps(message) + '\n')
+            self.process.stdin.flush()
+        except (OSError, AttributeError) as e:
+            raise ForkServerError(f"fork server is not running: {e}")
+
+    def _read_reply(self, timeout):
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            raise ForkServerError("fork server stopped responding")
+        line = self.process.stdout.readline()
+        if not line:
+            raise ForkServerError("fork server exited unexpectedly")
+        return json.loads(line)
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def find_module_by_path(path):
+    """Return the imported module whose file is path, if any"""
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, '__file__', None)
+        if module_file and os.path.realpath(module_file) == path:
+            return module
+    return None
+
+
+def swap_module(path, code):
+    """
+    Replace the module at path with mutated code
+
+    If the module is already imported, the mutated code is executed in the
+    existing module namespace and names that other modules imported from it
+    (`from module import func`) are rebound to the new objects. Otherwise the
+    mutated code is served to whichever import happens first.
+    """
+    module = find_module_by_path(path)
+    if module is None:
+        sys.meta_path.insert(0, mutest_runtime.MutantFinder(path, code))
+        return
+
+    old_namespace = dict(module.__dict__)
+    mutest_runtime.exec_code(code, module)
+
+    # Only functions and classes are rebound: other values (small ints,
+    # interned strings) may be shared by unrelated modules
+    replaced = {}
+    for name, old_value in old_namespace.items():
+        new_value = module.__dict__.get(name)
+        if new_value is not old_value and isinstance(old_value, (type, types.FunctionType)):
+            replaced[id(old_value)] = (old_value, new_value)
+
+    for other in list(sys.modules.values()):
+        namespace = getattr(other, '__dict__', None)
+        if other is module or not isinstance(namespace, dict):
+            continue
+        for name, value in list(namespace.items()):
+            entry = replaced.get(id(value))
+            if entry is not None and entry[0] is value:
+                namespace[name] = entry[1]
+
+
+def run_items(session):
+    """Run the collected test items the way pytest's main loop does"""
+    items = session.items
+    for i, item in enumerate(items):
+        nextitem = items[i + 1] if i + 1 < len(items) else None
+        item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+        if session.shouldfail or session.shouldstop:
+            break
+    return 1 if session.testsfailed else 0
+
+
+def wait_for_child(pid, timeout):
+    """Wait for a forked test run; returns its exit code or None on timeout"""
+    deadline = time.monotonic() + timeout
+    delay = 0.0005
+    while True:
+        finished, status = os.waitpid(pid, os.WNOHANG)
+        if finished:
+            if os.WIFEXITED(status):
+                return os.WEXITSTATUS(status)
+            return 1
+        if time.monotonic() >= deadline:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+class ForkServerPlugin:
+    """pytest plugin that takes over the run loop once collection is done"""
+
+    def __init__(self, requests, replies):
+        self.requests = requests
+        self.replies = replies
+        self.started = False
+        self.schemata_loaded = set()
+
+    def reply(self, message):
+        self.replies.write(json.dumps(message) + '\n')
+        self.replies.flush()
+
+    def pytest_runtest_logreport(self, report):
+        # Only set in forked children that were asked for their outcomes
+        if mutest_runtime.OUTCOMES is not None:
+            mutest_runtime.OUTCOMES.add(report)
+
+    def pytest_runtestloop(self, session):
+        if session.testsfailed:
+            self.reply({'ready': False, 'error': 'errors during test collection'})
+            return True
+
+        self.started = True
+        self.reply({'ready': True, 'collected': len(session.items)})
+
+        for line in self.requests:
+            request = json.loads(line)
+            self.reply(self.handle(session, request))
+
+        return True
+
+    def handle(self, session, request):
+        schemata_path = request.get('schemata')
+        if schemata_path and schemata_path not in self.schemata_loaded:
+            # Loaded once in the server; with no mutant active it behaves
+            # exactly like the original module
+            try:
+                swap_module(schemata_path, mutest_runtime.load_schemata(schemata_path))
+            except Exception as e:
+                return {'error': f'could not load schemata module: {e}'}
+            self.schemata_loaded.add(schemata_path)
+
+        pid = os.fork()
+        if pid == 0:
+            # Child: own process group so a timeout can kill everything it spawned
+            code = 1
+            try:
+                os.setpgid(0, 0)
+                if schemata_path:
+                    mutest_runtime.activate(request['active'])
+                else:
+                    swap_module(request['path'], request['code'])
+                if request.get('select') is not None:
+                    mutest_runtime.select_items(session.items, request['select'])
+                if request.get('order'):
+                    mutest_runtime.order_items(session.items, request['order'])
+                if request.get('fail_fast'):
+                    mutest_runtime.apply_fail_fast(session.config)
+                if request.get('outcomes'):
+                    mutest_runtime.OUTCOMES = mutest_runtime.OutcomeRecorder(request['outcomes'])
+                code = run_items(session)
+                if mutest_runtime.OUTCOMES is not None:
+                    mutest_runtime.OUTCOMES.write()
+            finally:
+                os._exit(code)
+
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass
+        return {'return_code': wait_for_child(pid, request['timeout'])}
+
+
+def main(args):
+    """Collect tests once, then serve mutant requests until stdin closes"""
+    # Keep private copies of the protocol pipes; pytest's output capture
+    # redirects fds 0 and 1 while tests run
+    requests = os.fdopen(os.dup(0), 'r')
+    replies = os.fdopen(os.dup(1), 'w')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    try:
+        import pytest
+    except ImportError:
+        replies.write(json.dumps({'ready': False, 'error': 'pytest is not installed'}) + '\n')
+        return 1
+
+    plugin = ForkServerPlugin(requests, replies)
+    exit_code = pytest.main(args + ['-p', 'no:cacheprovider'], plugins=[plugin])
+    if not plugin.started:
+        plugin.reply({'ready': False, 'error': f'pytest exited with code {int(exit_code)}'})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,91 @@
+"""
+Git diff scoping for Mutest.
+
+For pull-request gating only the mutants on lines a change touched matter.
+This module asks git which lines of a source file differ from a base ref
+(including uncommitted changes in the working tree) so that MutantGenerator
+can skip every mutation point outside those lines.
+"""
+import os
+import re
+import subprocess
+
+
+# New-file side of a unified diff hunk header: @@ -a,b +start,count @@
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+class GitDiffError(Exception):
+    """Raised when git cannot tell which lines changed"""
+
+
+def _git(args, cwd, error=None):
+    """Run a git command and return its output, raising GitDiffError (with error, or git's message) on failure"""
+    try:
+        result = subprocess.run(['git'] + args, cwd=cwd, capture_output=True, text=True)
+    except OSError as e:
+        raise GitDiffError(f"could not run git: {e}")
+    if result.returncode != 0:
+        raise GitDiffError(result.stderr.strip() or error or f"git {args[0]} failed")
+    return result.stdout
+
+
+def parse_diff(diff_text):
+    """
+    Line numbers (in the new version of the file) touched by a unified diff
+
+    Pure deletions mark the lines on both sides of the removed block, since
+    the code around them may now behave differently.
+    """
+    lines = set()
+    for line in diff_text.splitlines():
+        match = HUNK_HEADER.match(line)
+        if not match:
+            continue
+        start = int(match.group(1))
+        count = int(match.group(2)) if match.group(2) is not None else 1
+        if count == 0:
+            lines.update((start, start + 1))
+        else:
+            lines.update(range(start, start + count))
+    return lines
+
+
+def changed_lines(source_file_path, ref):
+    """
+    Lines of a source file that differ from its version at a git ref
+
+    Args:
+        source_file_path: File to compare (working tree version)
+        ref: Commit, branch or tag to compare against (e.g. 'origin/main')
+
+    Returns:
+        Set of changed line numbers (every line for files git does not track)
+
+    Raises:
+        GitDiffError if the file is not in a git repository or ref is unknown
+    """
+    path = os.path.abspath(source_file_path)
+    directory = os.path.dirname(path)
+    name = os.path.basename(path)
+
+    _git(['rev-parse', '--verify', '--quiet', f'{ref}^{{commit}}'], directory,
+         error=f"unknown git ref '{ref}'")
+
+    tracked = subprocess.run(
+        ['git', 'ls-files', '--error-unmatch', name],
+        cwd=directory, capture_output=True
+    ).returncode == 0
+    if not tracked:
+        with open(path, 'r') as f:
+            return set(range(1, len(f.read().splitlines()) + 1))
+
+    diff = _git(['diff', '--no-color', '--no-ext-diff', '--unified=0', ref, '--', name], directory)
+    return parse_diff(diff)
+
+
+def touches_lines(mutation_info, lines):
+    """True if the span of a mutation point overlaps any of the given lines"""
+    first = mutation_info['line']
+    last = mutation_info.get('end_line') or first
+    return any(line in lines for line in range(first, last + 1))
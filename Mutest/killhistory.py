@@ -0,0 +1,107 @@
+"""
+Kill history for Mutest.
+
+Most mutants are killed, and a killed mutant only needs one failing test. A
+test that killed a mutant on the same line, or elsewhere in the same
+function, is far more likely to kill the next one than a test picked in file
+order. With --fail-fast every mutant's tests run in this order:
+
+    1. tests that killed mutants on the same line
+    2. tests that killed mutants in the same function
+    3. tests that killed mutants anywhere in the file
+    4. tests that reach the mutated lines (from the coverage map)
+    5. everything else, in collection order
+
+ties going to the faster test, and the run stops at the first failure. The
+history grows as the run goes, and with the cache enabled it is kept in
+.mutest_cache/kills so the next run starts with what this one learned.
+"""
+import json
+import os
+import threading
+
+
+class KillHistory:
+    """How often each test killed mutants, by line and by function of one source file"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: JSON file the history is loaded from and saved to
+                  (None = keep it in memory only)
+        """
+        self.path = path
+        # line -> test -> kills, function -> test -> kills, test -> kills
+        self.lines = {}
+        self.functions = {}
+        self.tests = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """History saved at path, or an empty one if there is none yet"""
+        history = cls(path)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            history.lines = {int(line): tests for line, tests in data['lines'].items()}
+            history.functions = data['functions']
+            history.tests = data['tests']
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        return history
+
+    def save(self):
+        """Write the history to its path (atomically)"""
+        if self.path is None:
+            return
+        with self._lock:
+            data = {'lines': self.lines, 'functions': self.functions, 'tests': self.tests}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f'{self.path}.{os.getpid()}.tmp'
+                with open(temp_path, 'w') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Warning: Could not save kill history: {e}")
+
+    def record(self, mutation_info, killing_tests):
+        """Count a kill for every test that killed a mutant (safe to call from several threads)"""
+        with self._lock:
+            line_tests = self.lines.setdefault(mutation_info['line'], {})
+            function_tests = self.functions.setdefault(mutation_info['function'], {})
+            for test in killing_tests:
+                line_tests[test] = line_tests.get(test, 0) + 1
+                function_tests[test] = function_tests.get(test, 0) + 1
+                self.tests[test] = self.tests.get(test, 0) + 1
+
+    def order(self, mutation_info, reaching=None, durations=None):
+        """
+        Tests to run first against a mutant, most likely killer first
+
+        Args:
+            mutation_info: The mutant's mutation point
+            reaching: Tests that execute the mutated lines, if known
+            durations: Run time in seconds of the tests, by node id
+
+        Returns:
+            List of node ids; tests not in it run after them in collection order
+        """
+        durations = durations or {}
+        with self._lock:
+            line_tests = dict(self.lines.get(mutation_info['line'], {}))
+            function_tests = dict(self.functions.get(mutation_info['function'], {}))
+            file_tests = dict(self.tests)
+
+        reaching = set(reaching or ())
+        if reaching:
+            # A test that never executes the mutated lines cannot kill the mutant
+            file_tests = {test: kills for test, kills in file_tests.items() if test in reaching}
+        candidates = set(file_tests) | reaching
+
+        def likelihood(test):
+            return (-line_tests.get(test, 0), -function_tests.get(test, 0),
+                    -file_tests.get(test, 0), durations.get(test, 0.0), test)
+
+        return sorted(candidates, key=likelihood)
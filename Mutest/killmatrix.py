@@ -0,0 +1,204 @@
+"""
+Kill matrix for Mutest.
+
+With --kill-matrix every mutant's test run reports which tests failed, so
+the results say not only whether a mutant was killed but by which tests.
+The kill matrix collects this as one bitset per test (a Python int, bit j
+set if the test kills mutant j):
+
+                 mutant  1 2 3 4 5
+    test_add             1 0 0 1 0
+    test_discount        0 1 1 1 0
+
+This keeps the matrix small for large suites and makes the questions asked
+of it cheap: which tests kill a mutant, which mutants a set of tests
+kills (an OR of rows), how many kills a test contributes (a popcount).
+
+minimize_tests() uses it to pick a small, fast subset of the suite that
+kills every mutant the whole suite kills.
+"""
+
+
+class KillMatrix:
+    """Which tests kill which mutants, one bitset of mutants per test"""
+
+    def __init__(self, tests=(), mutants=(), durations=None):
+        """
+        Args:
+            tests: Node ids of the tests (rows)
+            mutants: Keys of the mutants (columns), e.g. mutant numbers or
+                     (source file, mutant number) pairs
+            durations: Run time in seconds of the tests on the original
+                       code, by node id, where known
+        """
+        self.tests = []
+        self.mutants = []
+        self.rows = []
+        self.durations = dict(durations or {})
+        self._test_index = {}
+        self._mutant_index = {}
+        for test in tests:
+            self.add_test(test)
+        for mutant in mutants:
+            self.add_mutant(mutant)
+
+    def add_test(self, test):
+        """Row index of a test, adding it if needed"""
+        index = self._test_index.get(test)
+        if index is None:
+            index = self._test_index[test] = len(self.tests)
+            self.tests.append(test)
+            self.rows.append(0)
+        return index
+
+    def add_mutant(self, mutant):
+        """Column index of a mutant, adding it if needed"""
+        index = self._mutant_index.get(mutant)
+        if index is None:
+            index = self._mutant_index[mutant] = len(self.mutants)
+            self.mutants.append(mutant)
+        return index
+
+    def record(self, mutant, killing_tests):
+        """Record the tests that killed a mutant (none for a survivor)"""
+        column = 1 << self.add_mutant(mutant)
+        for test in killing_tests:
+            self.rows[self.add_test(test)] |= column
+
+    @classmethod
+    def from_results(cls, results, durations=None):
+        """
+        Build the matrix of result dicts
+
+        Every tested mutant becomes a column, keyed by its mutant number,
+        or by (source file, mutant number) for results of several files.
+        Results without 'killing_tests' only add an empty column. Every
+        test with a known duration gets a row, even if it kills nothing.
+        """
+        matrix = cls(sorted(durations or ()), durations=durations)
+        for result in sorted(results, key=_result_key):
+            matrix.record(_result_key(result), result.get('killing_tests') or ())
+        return matrix
+
+    def killed_by(self, test):
+        """Bitset of the mutants a test kills"""
+        index = self._test_index.get(test)
+        return 0 if index is None else self.rows[index]
+
+    def killers(self, mutant):
+        """Tests that kill a mutant"""
+        index = self._mutant_index.get(mutant)
+        if index is None:
+            return []
+        bit = 1 << index
+        return [test for test, row in zip(self.tests, self.rows) if row & bit]
+
+    def killed(self, tests=None):
+        """Bitset of the mutants killed by a set of tests (None = all tests)"""
+        rows = self.rows if tests is None else [self.killed_by(test) for test in tests]
+        bits = 0
+        for row in rows:
+            bits |= row
+        return bits
+
+    def mutants_in(self, bits):
+        """Mutant keys of the set bits of a bitset"""
+        return [mutant for i, mutant in enumerate(self.mutants) if bits >> i & 1]
+
+    def kill_counts(self):
+        """Number of mutants each test kills, by test"""
+        return {test: bin(row).count('1') for test, row in zip(self.tests, self.rows)}
+
+    def to_dict(self):
+        """
+        JSON form of the matrix
+
+        Each row is the test's bitset as a hex string (bit j = column j).
+        """
+        return {
+            'tests': list(self.tests),
+            'mutants': [list(m) if isinstance(m, tuple) else m for m in self.mutants],
+            'rows': [format(row, 'x') for row in self.rows],
+            'durations': dict(self.durations),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict()"""
+        matrix = cls(data['tests'],
+                     [tuple(m) if isinstance(m, list) else m for m in data['mutants']],
+                     data.get('durations'))
+        matrix.rows = [int(row, 16) for row in data['rows']]
+        return matrix
+
+
+def minimize_tests(matrix):
+    """
+    Small, fast subset of the tests that kills every mutant the whole suite kills
+
+    Greedy weighted set cover: repeatedly take the test with the most newly
+    killed mutants per second of run time (tests without a known duration
+    count as taking as long as the average test), then drop tests whose
+    kills the rest of the selection already covers.
+
+    Returns:
+        List of node ids, in the order they were picked
+    """
+    known = [d for d in matrix.durations.values() if d > 0]
+    default = sum(known) / len(known) if known else 1.0
+
+    def cost(test):
+        # A floor keeps instant tests from dividing by zero
+        return max(matrix.durations.get(test, default), 1e-6)
+
+    target = matrix.killed()
+    rows = {test: matrix.killed_by(test) for test in matrix.tests if matrix.killed_by(test)}
+    selected = []
+    covered = 0
+    while covered != target:
+        test = max(rows, key=lambda t: (bin(rows[t] & ~covered).count('1') / cost(t),
+                                        bin(rows[t]).count('1'), t))
+        selected.append(test)
+        covered |= rows.pop(test)
+
+    # Tests picked early can become redundant once later picks cover them
+    for test in sorted(selected, key=cost, reverse=True):
+        others = matrix.killed(t for t in selected if t != test)
+        if others == target:
+            selected.remove(test)
+    return selected
+
+
+def keyword_selection(tests, kept):
+    """
+    pytest -k expression for a set of tests, and the other tests it also selects
+
+    -k matches its names as case-insensitive substrings of every part of a
+    node id (directories, file, class, test name and parameters), so
+    test_add also selects test_add_negative, and same-named tests in other
+    classes or files are selected too.
+
+    Args:
+        tests: Node ids of the whole suite
+        kept: Node ids the expression is for
+
+    Returns:
+        (expression, extra) - the -k expression, and the node ids of tests
+        outside kept it selects as well
+    """
+    # Test names without their class, module or parameters
+    names = sorted({test.split('::')[-1].split('[')[0] for test in kept})
+    kept = set(kept)
+
+    def selected(test):
+        path, *rest = test.split('::')
+        parts = [part.lower() for part in path.split('/') + rest]
+        return any(name.lower() in part for name in names for part in parts)
+
+    extra = [test for test in tests if test not in kept and selected(test)]
+    return ' or '.join(names), extra
+
+def _result_key(result):
+    if result.get('source_file') is not None:
+        return (result['source_file'], result['mutant_number'])
+    return result['mutant_number']
@@ -8,33 +8,70 @@ The goal of this prototype is to validate the parsing and mutation generation pr
 and ensure the tool can reliably create mutants before integrating test execution,
 scoring, and reporting in later stages.
 """
+import abc
 import ast
-import astor
 import copy
+import hashlib
 import subprocess
 import tempfile
 import os
 import shutil
+import shlex
+import signal
+import random
+import threading
+import time
+import types
+from contextlib import nullcontext
+from sandbox import WorkerSandbox, is_inside
+from forkserver import ForkServer, ForkServerError, split_pytest_command
+try:
+    # Inside a test process, the runtime is the plugin pytest already loaded
+    from mutest_runtime import encode_payload, read_outcomes, MAX_ENV_PAYLOAD
+except ImportError:
+    from runtime.mutest_runtime import encode_payload, read_outcomes, MAX_ENV_PAYLOAD
+from coverage_map import CoverageMap, instrument_env, load_coverage_maps
+from schemata import build_schemata
+from gitdiff import touches_lines
+from killhistory import KillHistory
+from killmatrix import KillMatrix
+from patching import SourcePatcher
+from points import mutation_applied, path_step
+from priority import SurvivalPredictor
+from sampling import score_interval, threshold_verdict
+
+
+MUTEST_VERSION = '0.0.1'
 
 
 # ============================================================================
 # MUTATION OPERATORS
 # ============================================================================
 
-class MutationOperator(ast.NodeTransformer):
-    """Base class for mutation operators"""
+class MutationOperator(abc.ABC):
+    """
+    Base class for mutation operators
 
-    def __init__(self):
-        self.mutations = []
+    Operators are not ast.NodeTransformers: they only name the mutations of
+    a node. MutationPointIndexer finds the nodes of every operator in one
+    pass, and the mutants are applied by node path (see points.py).
+    """
 
-    def get_mutations(self):
-        """Return list of mutations applied"""
-        return self.mutations
+    # Node type the operator mutates and the type of its mutation points
+    node_type = None
+    point_type = None
+
+    @abc.abstractmethod
+    def mutations(self, node):
+        """List of (op_index, original, mutated) operator names for a node"""
 
 
 class ArithmeticOperatorMutator(MutationOperator):
     """Mutates arithmetic operators: +, -, *, /, //, %, **"""
 
+    node_type = ast.BinOp
+    point_type = 'ArithmeticOperator'
+
     MUTATIONS = {
         ast.Add: [ast.Sub, ast.Mult, ast.Div],
         ast.Sub: [ast.Add, ast.Mult, ast.Div],
@@ -45,27 +82,18 @@ class ArithmeticOperatorMutator(MutationOperator):
         ast.Pow: [ast.Mult, ast.Div],
     }
 
-    def visit_BinOp(self, node):
-        """Visit binary operation nodes and mutate operators"""
-        self.generic_visit(node)
-
+    def mutations(self, node):
         op_type = type(node.op)
-        if op_type in self.MUTATIONS:
-            for mutation_op in self.MUTATIONS[op_type]:
-                self.mutations.append({
-                    'type': 'ArithmeticOperator',
-                    'original': op_type.__name__,
-                    'mutated': mutation_op.__name__,
-                    'line': node.lineno,
-                    'col': node.col_offset
-                })
-
-        return node
+        return [(0, op_type.__name__, mutation_op.__name__)
+                for mutation_op in self.MUTATIONS.get(op_type, [])]
 
 
 class ComparisonOperatorMutator(MutationOperator):
     """Mutates comparison operators: <, >, <=, >=, ==, !="""
 
+    node_type = ast.Compare
+    point_type = 'ComparisonOperator'
+
     MUTATIONS = {
         ast.Lt: [ast.LtE, ast.Gt, ast.GtE],
         ast.LtE: [ast.Lt, ast.Gt, ast.GtE],
@@ -75,233 +103,686 @@ class ComparisonOperatorMutator(MutationOperator):
         ast.NotEq: [ast.Eq],
     }
 
-    def visit_Compare(self, node):
-        """Visit comparison nodes and mutate operators"""
-        self.generic_visit(node)
-
-        for i, op in enumerate(node.ops):
-            op_type = type(op)
-            if op_type in self.MUTATIONS:
-                for mutation_op in self.MUTATIONS[op_type]:
-                    self.mutations.append({
-                        'type': 'ComparisonOperator',
-                        'original': op_type.__name__,
-                        'mutated': mutation_op.__name__,
-                        'line': node.lineno,
-                        'col': node.col_offset
-                    })
-
-        return node
+    def mutations(self, node):
+        return [(i, type(op).__name__, mutation_op.__name__)
+                for i, op in enumerate(node.ops)
+                for mutation_op in self.MUTATIONS.get(type(op), [])]
 
 
 class LogicalOperatorMutator(MutationOperator):
     """Mutates logical operators: and, or"""
 
-    def visit_BoolOp(self, node):
-        """Visit boolean operation nodes and mutate operators"""
-        self.generic_visit(node)
+    node_type = ast.BoolOp
+    point_type = 'LogicalOperator'
 
-        op_type = type(node.op)
+    def mutations(self, node):
         mutation_op = ast.Or if isinstance(node.op, ast.And) else ast.And
-
-        self.mutations.append({
-            'type': 'LogicalOperator',
-            'original': op_type.__name__,
-            'mutated': mutation_op.__name__,
-            'line': node.lineno,
-            'col': node.col_offset
-        })
-
-        return node
+        return [(0, type(node.op).__name__, mutation_op.__name__)]
 
 
 # ============================================================================
-# SINGLE MUTATION APPLICATORS
+# MUTANT GENERATOR
 # ============================================================================
 
-class SingleArithmeticMutator(ast.NodeTransformer):
-    """Applies a single arithmetic mutation"""
-
-    def __init__(self, mutation_info):
-        self.mutation_info = mutation_info
-        self.applied = False
-
-        self.op_map = {
-            'Add': ast.Add, 'Sub': ast.Sub, 'Mult': ast.Mult,
-            'Div': ast.Div, 'FloorDiv': ast.FloorDiv, 'Mod': ast.Mod,
-            'Pow': ast.Pow
-        }
+# Scope name of mutation points outside any function
+MODULE_SCOPE = '<module>'
 
-    def visit_BinOp(self, node):
-        self.generic_visit(node)
 
-        if (not self.applied and
-            node.lineno == self.mutation_info['line'] and
-            type(node.op).__name__ == self.mutation_info['original']):
+def function_scopes(tree):
+    """
+    Every function in a parsed module with its qualified name
 
-            node.op = self.op_map[self.mutation_info['mutated']]()
-            self.applied = True
+    Returns:
+        List of (qualname, node), each function listed before the
+        functions nested in it (e.g. 'Cart.total' or 'outer.inner')
+    """
+    scopes = []
 
-        return node
-
-
-class SingleComparisonMutator(ast.NodeTransformer):
-    """Applies a single comparison mutation"""
-
-    def __init__(self, mutation_info):
-        self.mutation_info = mutation_info
-        self.applied = False
-
-        self.op_map = {
-            'Lt': ast.Lt, 'LtE': ast.LtE, 'Gt': ast.Gt,
-            'GtE': ast.GtE, 'Eq': ast.Eq, 'NotEq': ast.NotEq
-        }
+    def walk(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = prefix + child.name
+                scopes.append((qualname, child))
+                walk(child, qualname + '.')
+            elif isinstance(child, ast.ClassDef):
+                walk(child, prefix + child.name + '.')
+            else:
+                walk(child, prefix)
 
-    def visit_Compare(self, node):
-        self.generic_visit(node)
+    walk(tree, '')
+    return scopes
 
-        if (not self.applied and
-            node.lineno == self.mutation_info['line']):
 
-            for i, op in enumerate(node.ops):
-                if type(op).__name__ == self.mutation_info['original']:
-                    node.ops[i] = self.op_map[self.mutation_info['mutated']]()
-                    self.applied = True
-                    break
+class MutationPointIndexer:
+    """Collects the mutation points of every operator in one pass over a tree"""
 
-        return node
+    def __init__(self, operators):
+        self.operators = {}
+        for operator in operators:
+            self.operators.setdefault(operator.node_type, []).append(operator)
 
+    def index(self, tree):
+        """
+        Mutation points of a parsed module, in tree order
 
-class SingleLogicalMutator(ast.NodeTransformer):
-    """Applies a single logical mutation"""
+        The tree is walked depth first, each node before its children and
+        the children in ast.iter_fields() order. That is not always source
+        order: a function's decorators come after its body, the condition
+        of `a if cond else b` before `a`, and an outer operator before the
+        operators in its operands.
 
-    def __init__(self, mutation_info):
-        self.mutation_info = mutation_info
-        self.applied = False
+        Returns:
+            List of mutation info dicts, each with a sequential 'id' starting
+            at 1, the 'path' of its node (see points.py), its exact span,
+            and the qualified name of its enclosing 'function'
+        """
+        points = []
+        # (node, path, qualname prefix, enclosing function); an explicit
+        # stack, since long operator chains nest deeper than the recursion limit
+        stack = [(tree, '', '', MODULE_SCOPE)]
+        while stack:
+            node, path, prefix, function = stack.pop()
+
+            for operator in self.operators.get(type(node), []):
+                for op_index, original, mutated in operator.mutations(node):
+                    mutation_info = {
+                        'type': operator.point_type,
+                        'original': original,
+                        'mutated': mutated,
+                        'line': node.lineno,
+                        'col': node.col_offset,
+                        'end_line': node.end_lineno,
+                        'end_col': node.end_col_offset,
+                    }
+                    if isinstance(node, ast.Compare):
+                        mutation_info['op_index'] = op_index
+                    mutation_info['id'] = len(points) + 1
+                    mutation_info['path'] = path
+                    mutation_info['function'] = function
+                    points.append(mutation_info)
+
+            children = []
+            for field, value in ast.iter_fields(node):
+                # Decorators are evaluated outside the function they decorate
+                inner_prefix, inner_function = prefix, function
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and field != 'decorator_list':
+                    inner_function = prefix + node.name
+                    inner_prefix = inner_function + '.'
+                elif isinstance(node, ast.ClassDef) and field != 'decorator_list':
+                    inner_prefix = prefix + node.name + '.'
+
+                if isinstance(value, ast.AST):
+                    children.append((value, path + '.' + field if path else field,
+                                     inner_prefix, inner_function))
+                elif isinstance(value, list):
+                    for i, item in enumerate(value):
+                        if isinstance(item, ast.AST):
+                            step = path_step(field, i)
+                            children.append((item, path + '.' + step if path else step,
+                                             inner_prefix, inner_function))
+            stack.extend(reversed(children))
+
+        return points
+
+
+def code_digest(code):
+    """Hash a code object and every code object nested in it, ignoring line numbers"""
+    sha = hashlib.sha256()
+
+    def feed(code):
+        sha.update(code.co_code)
+        sha.update(getattr(code, 'co_exceptiontable', b''))
+        sha.update(repr((code.co_name, code.co_names, code.co_varnames, code.co_freevars,
+                         code.co_cellvars, code.co_argcount, code.co_posonlyargcount,
+                         code.co_kwonlyargcount, code.co_flags)).encode('utf-8'))
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                feed(const)
+            else:
+                # The type name keeps 1, 1.0 and True apart
+                sha.update(repr((type(const).__name__, const)).encode('utf-8'))
 
-    def visit_BoolOp(self, node):
-        self.generic_visit(node)
+    feed(code)
+    return sha.hexdigest()
 
-        if (not self.applied and
-            node.lineno == self.mutation_info['line']):
 
-            if self.mutation_info['mutated'] == 'And':
-                node.op = ast.And()
-            else:
-                node.op = ast.Or()
-            self.applied = True
+def scope_digest(tree, node, mutation_info=None):
+    """
+    Bytecode digest of one function of a parsed module
 
-        return node
+    The function is compiled on its own (decorators and default values
+    included). Points outside any function (node is None), and functions
+    that cannot be compiled on their own (nonlocal declarations), use the
+    whole module. With mutation_info, the digest is of the mutated code
+    (the mutation is applied to the tree for the time of the compile).
+    """
+    with mutation_applied(tree, mutation_info) if mutation_info else nullcontext():
+        if node is not None:
+            try:
+                module = ast.Module(body=[node], type_ignores=[])
+                return code_digest(compile(module, '<mutest>', 'exec'))
+            except (SyntaxError, ValueError):
+                pass
+        return code_digest(compile(tree, '<mutest>', 'exec'))
 
 
-# ============================================================================
-# MUTANT GENERATOR
-# ============================================================================
-
 class MutantGenerator:
     """Generates mutants by applying mutation operators to source code"""
 
-    def __init__(self):
+    def __init__(self, schemata=False, tce=True, index_cache=None):
+        """
+        Args:
+            schemata: Leave the code of mutants that can be switched on at
+                      runtime in a schemata module unrendered (see schemata.py)
+            tce: Compile every mutant and skip those whose function compiles
+                 to the same bytecode as the original (equivalent) or as an
+                 earlier mutant (duplicate)
+            index_cache: cache.PointIndexCache to load the mutation points
+                         (and bytecode digests) of unchanged sources from,
+                         instead of parsing them again (None = no caching)
+        """
+        self.schemata = schemata
+        self.tce = tce
+        self.index_cache = index_cache
+        self.out_of_scope_count = 0
+        self.equivalent = []
+        self.duplicates = []
         self.operators = [
             ArithmeticOperatorMutator(),
             ComparisonOperatorMutator(),
             LogicalOperatorMutator()
         ]
 
-    def generate_mutants(self, source_code):
+    def find_mutation_points(self, source_code):
+        """
+        Find every mutation point in source code without rendering any mutant
+
+        Returns:
+            (tree, points) - the parsed module and a list of mutation info
+            dicts, in tree order (see MutationPointIndexer.index())
+        """
+        tree = ast.parse(source_code)
+        points = MutationPointIndexer(self.operators).index(tree)
+
+        return tree, points
+
+    def mutation_points(self, source_code):
+        """
+        Mutation points of source code, from the index cache if it has them
+
+        Returns:
+            List of mutation info dicts, as from find_mutation_points()
+        """
+        return self._load_index(source_code)[0]['points']
+
+    def _load_index(self, source_code):
+        """
+        The cached index entry of source code, or a new one
+
+        Returns:
+            (entry, tree) - entry holds the 'points' and the bytecode
+            'digests' and schemata ids computed so far; tree is the parsed
+            module, or None if the entry came from the cache
+        """
+        if self.index_cache is not None:
+            entry = self.index_cache.get(source_code)
+            if entry is not None:
+                return entry, None
+
+        tree, points = self.find_mutation_points(source_code)
+        # The stored points must stay free of the flags set on mutants
+        entry = {'points': [dict(info) for info in points], 'scope_digests': {}, 'digests': {}}
+        if self.index_cache is not None:
+            self.index_cache.put(source_code, entry)
+        return entry, tree
+
+    def generate_mutants(self, source_code, lines=None):
         """
         Generate all possible mutants from source code
 
+        Same as iter_mutants(), collected into a list.
+        """
+        return list(self.iter_mutants(source_code, lines))
+
+    def iter_mutants(self, source_code, lines=None):
+        """
+        Yield the mutants of source code one at a time
+
+        Mutants are lightweight descriptors: their source code is only
+        rendered (see render_mutant()) when a worker is about to run them,
+        so memory does not grow with the size of the module.
+
         Args:
             source_code: Python source code as string
-
-        Returns:
-            List of mutants, each containing:
-                - code: The mutated source code
-                - info: Details about the mutation
+            lines: Only generate mutants whose span touches one of these line
+                   numbers (None = all); the number of points left out is
+                   kept in out_of_scope_count
+
+        With tce enabled, the mutation info of skipped mutants is kept in
+        equivalent and duplicates (with 'duplicate_of' set to the id of the
+        mutant they duplicate); both are complete once the iterator is
+        exhausted.
+
+        With an index cache, unchanged sources are not parsed again, and
+        bytecode digests computed once are reused (new ones are stored when
+        the iterator is exhausted).
+
+        Yields:
+            Mutants, each containing:
+                - info: Details about the mutation ('schema' is set for
+                        mutants left to the schemata module in schemata mode)
         """
-        tree = ast.parse(source_code)
-        mutants = []
-
-        # Apply each operator
-        for operator in self.operators:
-            # Reset mutations for this operator
-            operator.mutations = []
-
-            # Visit the tree to find mutation points
-            operator.visit(copy.deepcopy(tree))
-
-            # Generate a mutant for each mutation point
-            for mutation_info in operator.mutations:
-                mutated_tree = self._apply_mutation(tree, mutation_info, operator)
-                try:
-                    mutated_code = astor.to_source(mutated_tree)
-                    mutants.append({
-                        'code': mutated_code,
-                        'info': mutation_info
-                    })
-                except Exception as e:
-                    print(f"Warning: Could not generate mutant: {e}")
-
-        return mutants
-
-    def _apply_mutation(self, tree, mutation_info, operator):
-        """Apply a specific mutation to the tree"""
-        mutated_tree = copy.deepcopy(tree)
-
-        # Create a new instance of the operator for single mutation
-        if mutation_info['type'] == 'ArithmeticOperator':
-            mutator = SingleArithmeticMutator(mutation_info)
-        elif mutation_info['type'] == 'ComparisonOperator':
-            mutator = SingleComparisonMutator(mutation_info)
-        elif mutation_info['type'] == 'LogicalOperator':
-            mutator = SingleLogicalMutator(mutation_info)
+        entry, tree = self._load_index(source_code)
+        points = [dict(info) for info in entry['points']]
+
+        def parsed():
+            nonlocal tree
+            if tree is None:
+                tree = ast.parse(source_code)
+            return tree
+
+        self.out_of_scope_count = 0
+        if lines is not None:
+            in_scope = [info for info in points if touches_lines(info, lines)]
+            self.out_of_scope_count = len(points) - len(in_scope)
         else:
-            return mutated_tree
-
-        return mutator.visit(mutated_tree)
+            in_scope = points
+
+        updated = False
+        switched = set()
+        if self.schemata:
+            if entry.get('switched') is None:
+                _, schema_ids = build_schemata(copy.deepcopy(parsed()), points)
+                entry['switched'] = sorted(schema_ids)
+                updated = True
+            switched = set(entry['switched'])
+
+        self.equivalent = []
+        self.duplicates = []
+        scopes = None
+        original_digests = entry['scope_digests']
+        digests = entry['digests']
+        seen_digests = {}
+
+        for mutation_info in in_scope:
+            if mutation_info['id'] in switched:
+                mutation_info['schema'] = True
+
+            if self.tce:
+                scope = mutation_info['function']
+                key = str(mutation_info['id'])
+                if scope not in original_digests or key not in digests:
+                    if scopes is None:
+                        scopes = dict(function_scopes(parsed()))
+                    try:
+                        if scope not in original_digests:
+                            original_digests[scope] = scope_digest(parsed(), scopes.get(scope))
+                        digests[key] = scope_digest(parsed(), scopes.get(scope), mutation_info)
+                    except (SyntaxError, ValueError):
+                        digests[key] = None
+                    updated = True
+                digest = digests[key]
+
+                if digest is not None and digest == original_digests.get(scope):
+                    mutation_info['equivalent'] = True
+                    self.equivalent.append(mutation_info)
+                    continue
+                if digest is not None and (scope, digest) in seen_digests:
+                    mutation_info['duplicate_of'] = seen_digests[(scope, digest)]
+                    self.duplicates.append(mutation_info)
+                    continue
+                seen_digests[(scope, digest)] = mutation_info['id']
+
+            yield {'info': mutation_info}
+
+        if updated and self.index_cache is not None:
+            self.index_cache.put(source_code, entry)
+
+    def render_mutant(self, source_code, mutation_info):
+        """Render the source code of a single mutant"""
+        return SourcePatcher(source_code).render(mutation_info)
 
 
 # ============================================================================
 # TEST EXECUTOR
 # ============================================================================
 
+def resolve_jobs(jobs):
+    """Turn a --jobs value into a worker count (0 or None means auto-detect)"""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, int(jobs))
+
+
+# Directory holding mutest_runtime.py and nothing else of Mutest, added to
+# PYTHONPATH of test processes (Mutest's other modules would shadow the project's)
+RUNTIME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runtime')
+
+
+def run_test_command(command, timeout, cwd=None, env=None, pass_fds=()):
+    """
+    Run a shell test command, killing its whole process group on timeout
+
+    Returns:
+        subprocess.CompletedProcess
+
+    Raises:
+        subprocess.TimeoutExpired if the command did not finish in time
+    """
+    process = subprocess.Popen(
+        command,
+        shell=True,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        pass_fds=pass_fds,
+        start_new_session=(os.name == 'posix')
+    )
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if os.name == 'posix':
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            process.kill()
+        process.communicate()
+        raise
+
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def restore_backup(source_file_path):
+    """
+    Restore a source file left mutated by an interrupted in-place run
+
+    Returns:
+        True if a leftover .backup was found and moved back
+    """
+    backup_path = source_file_path + '.backup'
+    if not os.path.exists(backup_path):
+        return False
+
+    shutil.move(backup_path, source_file_path)
+    print(f"WARNING: Restored {source_file_path} from a backup left by an interrupted run.")
+    return True
+
+
+# Ways of running the test command against a mutant
+RUNNERS = ('subprocess', 'forkserver')
+
+# Per-mutant timeout used until the baseline run has been measured
+DEFAULT_TIMEOUT = 10
+
+# A timed-out mutant is re-checked with this many times the normal limit
+RECHECK_TIMEOUT_FACTOR = 4
+
+# Early stopping never trusts an estimate built on fewer mutants than this
+MIN_EARLY_STOP_MUTANTS = 20
+
+
+def _write_pipe(fd, payload):
+    """Write a mutant payload into a pipe and close it"""
+    try:
+        with os.fdopen(fd, 'w') as pipe:
+            pipe.write(payload)
+    except OSError:
+        pass
+
+
 class MutationTestExecutor:
     """Executes tests against mutants to determine if they are killed or survived"""
 
-    def __init__(self, source_file_path, test_command="pytest"):
+    def __init__(self, source_file_path, test_command="pytest", jobs=None, runner='subprocess',
+                 inject=True, test_selection=False, confirm_survivors=False, reachability=True,
+                 timeout_factor=2.0, timeout_constant=1.0, baseline_runs=1, recheck_timeouts=False,
+                 cache=None, store=None, resume=False, confidence=0.95,
+                 stop_margin=None, stop_threshold=None, seed=0, kill_matrix=False,
+                 fail_fast=False, history=None, survivors_first=False):
         """
         Args:
             source_file_path: Path to the source file to mutate
             test_command: Command to run tests (default: pytest)
+            jobs: Number of parallel workers (0 = one per CPU core,
+                  None = run mutants one at a time)
+            runner: 'subprocess' to run test_command for every mutant, or
+                    'forkserver' to fork a warm pytest process per mutant
+            inject: Serve mutants from memory through an import hook instead
+                    of writing them to disk (pytest commands only)
+            test_selection: Record per-test coverage once and run only the
+                            tests that reach each mutated line (pytest commands only)
+            confirm_survivors: With test_selection, re-run mutants that
+                               survive their selected tests against the full suite
+            reachability: Instrument the baseline run and mark mutants on
+                          lines no test executes as 'no_coverage' without
+                          running them (pytest commands only)
+            timeout_factor: Per-mutant timeout is timeout_factor times the
+                            baseline test duration...
+            timeout_constant: ...plus this many seconds
+            baseline_runs: Number of times the original tests are run to
+                           measure the baseline duration (the slowest run counts)
+            recheck_timeouts: Re-run timed-out mutants once with a longer
+                              limit before classifying them as 'timeout'
+            cache: cache.ResultCache to reuse verdicts of unchanged mutants
+                   from and store new verdicts in (None = no caching)
+            store: store.ResultStore every verdict is committed to as soon
+                   as it is known (None = keep results in memory only)
+            resume: With store, pick up the last unfinished run of the same
+                    source, tests and mutants instead of starting over
+            confidence: Confidence level of the interval reported around
+                        the mutation score of a sample
+            stop_margin: Test mutants in random order and stop once the
+                         score's confidence interval is within this many
+                         percentage points either side of the estimate
+            stop_threshold: Test mutants in random order and stop once the
+                            confidence interval lies entirely above or below
+                            this score (for "is the score above N%?" gates)
+            seed: Seed of the random order used by early stopping
+            kill_matrix: Record which tests fail for every mutant, and
+                         summarize them in a killmatrix.KillMatrix
+                         (pytest commands only)
+            fail_fast: Run each mutant's tests most likely killer first and
+                       stop at the first failure (pytest commands only)
+            history: killhistory.KillHistory the test order is learned in
+                     (None = start from nothing and keep it in memory)
+            survivors_first: Test the mutants most likely to survive first
+                             (see priority.py); ignored with early stopping
         """
+        if runner not in RUNNERS:
+            raise ValueError(f"Unknown runner '{runner}', expected one of {RUNNERS}")
+
         self.source_file_path = source_file_path
         self.test_command = test_command
+        self.jobs = jobs
+        self.runner = runner
+        self.plugin_command = self._injected_command()
+        self.inject_command = self.plugin_command if inject else None
+        self.test_selection = test_selection
+        self.confirm_survivors = confirm_survivors
+        self.reachability = reachability
+        self.timeout_factor = timeout_factor
+        self.timeout_constant = timeout_constant
+        self.baseline_runs = max(1, int(baseline_runs))
+        self.recheck_timeouts = recheck_timeouts
+        self.baseline_duration = None
+        self.timeout = DEFAULT_TIMEOUT
+        self.cache = cache
+        self.store = store
+        self.resume = resume
+        self.run_id = None
+        self.confidence = confidence
+        self.stop_margin = stop_margin
+        self.stop_threshold = stop_threshold
+        self.seed = seed
+        self.kill_matrix = kill_matrix
+        self.fail_fast = fail_fast
+        self.history = history if history is not None else KillHistory()
+        self.survivors_first = survivors_first
+        self.test_durations = {}
+        self.stopped_early = False
+        self.coverage = None
         self.results = []
+        self.reused = []
+        # Renders mutants from the source as it was when the first one was needed
+        self._patcher = None
+        self._patcher_lock = threading.Lock()
+
+    def _injected_command(self):
+        """The test command with the mutest_runtime plugin added, or None if it does not run pytest"""
+        split = split_pytest_command(self.test_command)
+        if split is None:
+            return None
+        launcher, args = split
+        return shlex.join(launcher + ['-p', 'mutest_runtime'] + args)
+
+    def _runtime_env(self):
+        """Environment for test processes that load the mutest_runtime plugin"""
+        env = dict(os.environ)
+        pythonpath = env.get('PYTHONPATH')
+        env['PYTHONPATH'] = RUNTIME_DIR + (os.pathsep + pythonpath if pythonpath else '')
+        return env
+
+    def run_original_tests(self, peers=()):
+        """
+        Run tests on original code to ensure they pass
+
+        The baseline runs are timed to derive the per-mutant timeout. When
+        reachability or test selection is enabled, the first run also records
+        which tests execute which lines of the source file. With the kill
+        matrix, the duration of every test is kept in test_durations (from
+        the last run, which is not slowed down by coverage recording unless
+        it is the only one); fail-fast uses them as well, to try faster
+        tests first.
 
-    def run_original_tests(self):
-        """Run tests on original code to ensure they pass"""
+        Args:
+            peers: Executors of other source files tested with the same
+                   command and options; the same runs record their coverage
+                   too and set their timeout, so each file does not need a
+                   baseline of its own
+        """
         print("Running tests on original code...")
-        result = subprocess.run(
-            self.test_command,
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            print("WARNING: Original tests are failing!")
-            print(result.stdout)
-            print(result.stderr)
-            return False
 
-        print("Original tests passed!\n")
+        if self.kill_matrix and not self.plugin_command:
+            print("Note: the kill matrix needs a pytest test command.")
+            self.kill_matrix = False
+        if self.fail_fast and not self.plugin_command:
+            print("Note: fail-fast needs a pytest test command.")
+            self.fail_fast = False
+        if self.fail_fast and self.kill_matrix:
+            print("Note: the kill matrix needs every failing test, fail-fast is off.")
+            self.fail_fast = False
+
+        executors = [self] + list(peers)
+        command, env, coverage_path = self.test_command, None, None
+        if self._wants_coverage():
+            command = self.plugin_command
+            env, coverage_path = instrument_env(
+                self._runtime_env(), [executor.source_file_path for executor in executors])
+        instrumented = coverage_path is not None
+
+        durations = []
+        for _ in range(self.baseline_runs):
+            outcomes = None
+            if self.kill_matrix or self.fail_fast:
+                fd, outcomes = tempfile.mkstemp(prefix='mutest-outcomes-', suffix='.json')
+                os.close(fd)
+                command = self.plugin_command
+                env = dict(env or self._runtime_env(), MUTEST_OUTCOMES_OUT=outcomes)
+
+            started = time.monotonic()
+            result = subprocess.run(
+                command,
+                shell=True,
+                capture_output=True,
+                text=True,
+                env=env
+            )
+            durations.append(time.monotonic() - started)
+
+            if outcomes:
+                recorded = read_outcomes(outcomes)
+                os.remove(outcomes)
+                if recorded is not None:
+                    self.test_durations = recorded.get('durations', {})
+
+            if coverage_path:
+                maps = load_coverage_maps(coverage_path)
+                if maps is not None:
+                    for executor in executors:
+                        executor.coverage = maps.get(
+                            os.path.realpath(executor.source_file_path), CoverageMap({}))
+                command, env, coverage_path = self.test_command, None, None
+
+            if result.returncode != 0:
+                print("WARNING: Original tests are failing!")
+                print(result.stdout)
+                print(result.stderr)
+                return False
+
+        print("Original tests passed!")
+        if instrumented and self.coverage is None:
+            print("WARNING: Could not record coverage, every mutant runs the full suite.")
+        elif self.coverage is not None and not peers:
+            print(f"Recorded line coverage of {len(self.coverage.tests)} tests.")
+        elif self.coverage is not None:
+            print(f"Recorded line coverage of {len(executors)} source files.")
+
+        # An empty map cannot tell untested code from code the tests only
+        # run in a subprocess, which the recorder does not see
+        for executor in executors:
+            if executor.coverage is not None and executor.coverage.is_empty():
+                print(f"WARNING: No test executed {executor.source_file_path} in the test process "
+                      f"(code run in a subprocess is not recorded), its mutants run the full suite.")
+                executor.coverage = None
+
+        for executor in executors:
+            executor.test_selection = self.test_selection
+            executor.kill_matrix = self.kill_matrix
+            executor.fail_fast = self.fail_fast
+            executor.test_durations = self.test_durations
+            executor.baseline_duration = max(durations)
+            executor.timeout = executor.mutant_timeout(executor.baseline_duration)
+        print(f"Baseline: {self.baseline_duration:.2f}s "
+              f"(slowest of {len(durations)} run{'s' if len(durations) > 1 else ''}), "
+              f"per-mutant timeout: {self.timeout:.2f}s")
+        print()
         return True
 
-    def execute_mutant(self, mutant, mutant_number):
+    def mutant_timeout(self, baseline_duration):
+        """Per-mutant timeout in seconds for a measured baseline duration"""
+        return self.timeout_factor * baseline_duration + self.timeout_constant
+
+    def _wants_coverage(self):
+        """True if the baseline run should record per-test line coverage"""
+        if not self.plugin_command:
+            if self.reachability or self.test_selection:
+                print("Note: reachability and test selection need a pytest test command.")
+            return False
+
+        if self.test_selection and not (self.inject_command or self.runner == 'forkserver'):
+            print("Note: test selection needs in-memory injection or the fork server, "
+                  "running the full suite per mutant.")
+            self.test_selection = False
+
+        return self.reachability or self.test_selection
+
+    def execute_mutant(self, mutant, mutant_number, select=None, timeout=None, outcomes=None,
+                       order=None):
         """
         Execute tests against a single mutant
 
+        Test selection needs the mutest_runtime plugin, so select is
+        ignored here and the whole suite runs.
+
+        Args:
+            timeout: Time limit in seconds (default: the per-mutant timeout)
+            outcomes: File the failed tests are written to (see _run_on())
+            order: Node ids of tests to run first (see _run_on())
+
         Returns:
             dict with status ('killed' or 'survived') and details
         """
@@ -315,46 +796,336 @@ class MutationTestExecutor:
 
         try:
             # Write mutated code to source file
+            mutated_code = self._mutant_code(mutant)
             with open(self.source_file_path, 'w') as f:
-                f.write(mutant['code'])
+                f.write(mutated_code)
 
             # Run tests
-            result = subprocess.run(
-                self.test_command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=10
+            command, env = self._plugin_command(outcomes, order)
+            result = run_test_command(command, timeout=timeout or self.timeout, env=env)
+            return self._verdict(mutant, mutant_number, result.returncode)
+
+        except subprocess.TimeoutExpired:
+            return self._verdict(mutant, mutant_number, None)
+
+        finally:
+            # Restore original file
+            shutil.move(backup_path, self.source_file_path)
+
+    def execute_mutant_in_sandbox(self, mutant, mutant_number, sandbox, select=None, timeout=None,
+                                  outcomes=None, order=None):
+        """
+        Execute tests against a single mutant inside a worker sandbox
+
+        The mutant is written to the sandbox copy of the source file and the
+        test command runs from the sandbox root, so the working copy is never
+        modified.
+        """
+        target_path = sandbox.path_for(self.source_file_path)
+
+        try:
+            with open(target_path, 'w') as f:
+                f.write(self._mutant_code(mutant))
+
+            command, env = self._plugin_command(outcomes, order)
+            result = run_test_command(
+                command,
+                timeout=timeout or self.timeout,
+                cwd=sandbox.root,
+                env=sandbox.env(env)
             )
+            return self._verdict(mutant, mutant_number, result.returncode)
 
-            # Determine if mutant was killed
-            if result.returncode != 0:
-                status = 'killed'
+        except subprocess.TimeoutExpired:
+            return self._verdict(mutant, mutant_number, None)
+
+        finally:
+            with open(target_path, 'w') as f:
+                f.write(self._original_code)
+
+    def execute_mutant_in_memory(self, mutant, mutant_number, select=None, timeout=None,
+                                 outcomes=None, order=None):
+        """
+        Execute tests against a single mutant served from memory
+
+        The mutant travels to the test process as an encoded request in an
+        environment variable (or an inherited pipe when it is large) and the
+        mutest_runtime import hook serves it in place of the file on disk.
+        Nothing is written, so any number of these can run side by side in
+        the same checkout.
+
+        Args:
+            select: Node ids of the only tests to run (None = whole suite)
+            timeout: Time limit in seconds (default: the per-mutant timeout)
+            outcomes: File the failed tests are written to (see _run_on())
+            order: Node ids of tests to run first (see _run_on())
+        """
+        request = {'id': mutant_number, 'select': select, 'order': order,
+                   'fail_fast': self.fail_fast}
+        if self._uses_schemata(mutant):
+            request['schemata'] = os.path.realpath(self.source_file_path)
+            request['active'] = mutant['info']['id']
+        else:
+            request['path'] = os.path.realpath(self.source_file_path)
+            request['code'] = self._mutant_code(mutant)
+
+        env = self._runtime_env()
+        if outcomes:
+            env['MUTEST_OUTCOMES_OUT'] = outcomes
+        payload = encode_payload(request)
+        read_fd = None
+        pass_fds = ()
+        if len(payload) > MAX_ENV_PAYLOAD and os.name == 'posix':
+            read_fd, write_fd = os.pipe()
+            env['MUTEST_PAYLOAD_FD'] = str(read_fd)
+            pass_fds = (read_fd,)
+            threading.Thread(target=_write_pipe, args=(write_fd, payload), daemon=True).start()
+        else:
+            env['MUTEST_PAYLOAD'] = payload
+
+        try:
+            result = run_test_command(self.inject_command, timeout=timeout or self.timeout,
+                                      env=env, pass_fds=pass_fds)
+            return self._verdict(mutant, mutant_number, result.returncode)
+
+        except subprocess.TimeoutExpired:
+            return self._verdict(mutant, mutant_number, None)
+
+        finally:
+            if read_fd is not None:
+                os.close(read_fd)
+
+    def execute_mutant_with_forkserver(self, mutant, mutant_number, server, select=None, timeout=None,
+                                       outcomes=None, order=None):
+        """
+        Execute tests against a single mutant in a child of a warm fork server
+
+        The mutated module is swapped in memory inside the forked child, so
+        no file is written. Schemata mutants only switch the active mutant id
+        of the schemata module loaded in the server. A server that dies is
+        restarted once.
+        """
+        timeout = timeout or self.timeout
+
+        def run():
+            if self._uses_schemata(mutant):
+                return server.run_schemata_mutant(
+                    self.source_file_path, mutant['info']['id'], timeout=timeout, select=select,
+                    outcomes=outcomes, order=order, fail_fast=self.fail_fast)
+            return server.run_mutant(
+                self.source_file_path, self._mutant_code(mutant), timeout=timeout, select=select,
+                outcomes=outcomes, order=order, fail_fast=self.fail_fast)
+
+        try:
+            return_code = run()
+        except ForkServerError:
+            server.close()
+            server.start()
+            return_code = run()
+
+        return self._verdict(mutant, mutant_number, return_code)
+
+    def _uses_schemata(self, mutant):
+        """True if the mutant is left to the schemata module instead of being rendered"""
+        return mutant.get('code') is None and mutant['info'].get('schema', False)
+
+    def _mutant_code(self, mutant):
+        """Source code of a mutant, rendered when a worker is about to run it"""
+        if mutant.get('code') is not None:
+            return mutant['code']
+        with self._patcher_lock:
+            if self._patcher is None:
+                with open(self.source_file_path, 'r') as f:
+                    self._patcher = SourcePatcher(f.read())
+        return self._patcher.render(mutant['info'])
+
+    def _open_worker(self, worker_id, isolated):
+        """
+        Prepare everything one worker needs to execute mutants
+
+        The resources of a worker do not depend on the source file, so
+        executors with the same worker_key() can run their mutants on it.
+
+        Args:
+            worker_id: Number of the worker
+            isolated: True if the worker must not write to the working copy
+
+        Returns:
+            (worker, close): worker is passed to _test_mutant(), close()
+            releases the worker's resources
+        """
+        if self.runner == 'forkserver':
+            try:
+                server = ForkServer(self.test_command).start()
+                return ('forkserver', server), server.close
+            except ForkServerError as e:
+                print(f"Note: fork server unavailable ({e}), worker {worker_id} "
+                      f"falls back to running the test command.")
+
+        if self.inject_command:
+            return ('memory', None), lambda: None
+
+        if isolated:
+            sandbox = WorkerSandbox(os.getcwd(), worker_id).create()
+            return ('sandbox', sandbox), sandbox.cleanup
+
+        return ('in_place', None), lambda: None
+
+    def worker_key(self):
+        """
+        What the resources of a worker depend on
+
+        Fork servers are warmed up for one test command; in-memory injection
+        needs nothing, and a sandbox is a copy of the project that serves
+        any test command.
+        """
+        if self.runner == 'forkserver':
+            return ('forkserver', self.test_command)
+        return ('memory',) if self.inject_command else ('files',)
+
+    def _run_on(self, worker, mutant, mutant_number, select=None, timeout=None):
+        """
+        Execute one mutant with the resources of a worker
+
+        With the kill matrix enabled, the test process writes the node ids
+        of the tests that failed to a temporary file, and a killed mutant's
+        result gets them as 'killing_tests'. With fail-fast, the tests run
+        in the order of the kill history and stop at the first failure; a
+        killed mutant's result gets the test that killed it as
+        'killing_test' (which goes into the history) and every result the
+        number of tests that ran as 'tests_run'.
+        """
+        outcomes = None
+        if self.kill_matrix or self.fail_fast:
+            fd, outcomes = tempfile.mkstemp(prefix='mutest-outcomes-', suffix='.json')
+            os.close(fd)
+        order = self._test_order(mutant['info'], select) if self.fail_fast else None
+
+        kind, resource = worker
+        try:
+            if kind == 'forkserver':
+                result = self.execute_mutant_with_forkserver(
+                    mutant, mutant_number, resource, select, timeout, outcomes, order)
+            elif kind == 'memory':
+                result = self.execute_mutant_in_memory(
+                    mutant, mutant_number, select, timeout, outcomes, order)
+            elif kind == 'sandbox':
+                result = self.execute_mutant_in_sandbox(
+                    mutant, mutant_number, resource, select, timeout, outcomes, order)
             else:
-                status = 'survived'
+                result = self.execute_mutant(mutant, mutant_number, select, timeout, outcomes, order)
+
+            if outcomes:
+                recorded = read_outcomes(outcomes) or {}
+                # Empty if the tests failed before any of them ran (e.g. on import)
+                failed = recorded.get('failed', [])
+                if self.fail_fast and result['status'] != 'timeout':
+                    result['tests_run'] = len(recorded.get('durations', {}))
+                if result['status'] == 'killed' and self.kill_matrix:
+                    result['killing_tests'] = failed
+                elif result['status'] == 'killed' and failed:
+                    result['killing_test'] = failed[0]
+                    self.history.record(mutant['info'], failed[:1])
+            return result
+        finally:
+            if outcomes:
+                os.remove(outcomes)
 
+    def _plugin_command(self, outcomes, order=None):
+        """
+        (command, env) that run the test command writing its failed tests
+        to outcomes, with fail-fast and order if enabled, or the plain test
+        command (env None) if there is nothing for the plugin to do
+        """
+        if not outcomes:
+            return self.test_command, None
+        env = self._runtime_env()
+        env['MUTEST_OUTCOMES_OUT'] = outcomes
+        if self.fail_fast:
+            # A request without a mutant only sets up the run
+            env['MUTEST_PAYLOAD'] = encode_payload({'order': order, 'fail_fast': True})
+        return self.plugin_command, env
+
+    def _test_order(self, mutation_info, select):
+        """Tests to run first against a mutant with fail-fast (see killhistory.py)"""
+        reaching = select
+        if reaching is None and self.coverage is not None:
+            reaching = self.coverage.tests_for(mutation_info)
+        return self.history.order(mutation_info, reaching, self.test_durations)
+
+    def _test_mutant(self, worker, mutant, mutant_number):
+        """
+        Run one mutant on a worker, restricted to the tests that reach it
+
+        A mutant no test reaches is reported as 'no_coverage' without
+        running anything: it is guaranteed to survive.
+        """
+        select = self.coverage.tests_for(mutant['info']) if self.coverage else None
+
+        if select == []:
             return {
                 'mutant_number': mutant_number,
-                'status': status,
-                'mutation_info': mutant['info'],
-                'return_code': result.returncode
+                'status': 'no_coverage',
+                'mutation_info': mutant['info']
             }
 
-        except subprocess.TimeoutExpired:
+        if not self.test_selection:
+            select = None
+
+        if select:
+            result = self._execute(worker, mutant, mutant_number, select)
+            result['selected_tests'] = len(select)
+            if result['status'] != 'survived' or not self.confirm_survivors:
+                return result
+
+        result = self._execute(worker, mutant, mutant_number, None)
+        if select is not None:
+            result['confirmed'] = True
+        return result
+
+    def _execute(self, worker, mutant, mutant_number, select):
+        """Run a mutant, re-checking a timeout once with a longer limit if enabled"""
+        result = self._run_on(worker, mutant, mutant_number, select)
+        if result['status'] == 'timeout' and self.recheck_timeouts:
+            result = self._run_on(worker, mutant, mutant_number, select,
+                                  timeout=self.timeout * RECHECK_TIMEOUT_FACTOR)
+            result['rechecked'] = True
+        return result
+
+    def _verdict(self, mutant, mutant_number, return_code):
+        """Build the result dict for a mutant from the test return code (None = timeout)"""
+        if return_code is None:
             return {
                 'mutant_number': mutant_number,
                 'status': 'timeout',
                 'mutation_info': mutant['info']
             }
 
-        finally:
-            # Restore original file
-            shutil.move(backup_path, self.source_file_path)
+        # Determine if mutant was killed
+        if return_code != 0:
+            status = 'killed'
+        else:
+            status = 'survived'
+
+        return {
+            'mutant_number': mutant_number,
+            'status': status,
+            'mutation_info': mutant['info'],
+            'return_code': return_code
+        }
 
-    def run_mutation_tests(self, mutants):
+    def run_mutation_tests(self, mutants, population=None, on_result=None):
         """
         Run tests against all mutants
 
+        Args:
+            mutants: Mutants to test
+            population: Number of mutants these were sampled from (None =
+                        not a sample), used for the score's confidence interval
+            on_result: Called with (executor, result) for each verdict,
+                       e.g. a report.SurvivorStream; reused verdicts (from
+                       the cache or an interrupted run) come first
+
         Returns:
             dict with killed, survived, and score
         """
@@ -362,51 +1133,373 @@ class MutationTestExecutor:
             print("Cannot proceed - original tests must pass first!")
             return None
 
-        print(f"Testing {len(mutants)} mutants...\n")
+        numbered = self.prepare_run(mutants)
+        if on_result is not None:
+            for result in self.reused:
+                on_result(self, result)
+
+        # Early stopping needs every prefix of the run to be a random sample
+        should_stop = None
+        if self.stop_margin is not None or self.stop_threshold is not None:
+            random.Random(self.seed).shuffle(numbered)
+            population_size = population or len(mutants)
+            should_stop = lambda done: self._converged(self.reused + done, population_size)
+            if self.survivors_first:
+                print("Note: early stopping tests mutants in random order, "
+                      "ignoring --survivors-first.")
+        elif self.survivors_first:
+            predictor = self.survival_predictor()
+            numbered.sort(key=lambda item: predictor.rank(item[1]['info']))
+
+        workers = 0
+        if self.jobs is not None:
+            workers = min(resolve_jobs(self.jobs), len(numbered))
+            if workers and not self.can_run_isolated():
+                print("Note: source file is outside the current directory, "
+                      "running mutants sequentially.")
+                workers = 0
+
+        total = len(mutants)
+
+        def report(executor, result):
+            info = result['mutation_info']
+            print(f"Mutant {result['mutant_number']}/{total}: "
+                  f"{info['type']} at line {info['line']} "
+                  f"({info['original']} -> {info['mutated']})... "
+                  f"{result['status'].upper()}")
+            if on_result is not None:
+                on_result(executor, result)
+
+        results = []
+        if numbered:
+            if workers:
+                print(f"Testing {len(numbered)} mutants with {workers} parallel workers...\n")
+            else:
+                print(f"Testing {len(numbered)} mutants...\n")
+            results, self.stopped_early = run_scheduled(
+                [(self, i, mutant) for i, mutant in numbered], workers, report, should_stop)
+            if self.stopped_early:
+                print(f"\nStopped early: the score estimate converged after "
+                      f"{len(self.reused) + len(results)} of {len(mutants)} mutants.")
+
+        return self.finish_run(mutants, results, population)
+
+    def survival_predictor(self, operators=None):
+        """
+        SurvivalPredictor of this file, from the coverage map and the
+        earlier runs in the store (call after prepare_run())
+
+        Args:
+            operators: ResultStore.operator_history(), if already looked up
+        """
+        previous = ()
+        if self.store is not None:
+            previous = self.store.previous_results(self.source_file_path, self.test_command, self.run_id)
+            if operators is None:
+                operators = self.store.operator_history()
+        return SurvivalPredictor(previous, operators, self.coverage)
+
+    def prepare_run(self, mutants):
+        """
+        Open the run in the store and set aside the mutants whose verdicts
+        can be reused (from an interrupted run or the cache)
 
-        killed = []
-        survived = []
-        timeout = []
+        Returns:
+            List of (number, mutant) pairs that still have to be tested;
+            the reused result dicts are kept in self.reused
+        """
+        with open(self.source_file_path, 'r') as f:
+            self._original_code = f.read()
+        self.stopped_early = False
+
+        numbered = list(enumerate(mutants, 1))
+        self.reused = []
+        if self.store is not None:
+            self.run_id, completed = self.store.open_run(
+                self.source_file_path, self.test_command, mutants, resume=self.resume)
+            if completed:
+                print(f"Resuming interrupted run of {self.source_file_path}: {len(completed)} "
+                      f"of {len(mutants)} mutants already tested.\n")
+            numbered, self.reused = self._split_completed(numbered, completed)
+
+        if self.cache is not None:
+            numbered, cached = self._split_cached(numbered)
+            if cached:
+                print(f"Reusing {len(cached)} cached results for {self.source_file_path}, "
+                      f"{len(numbered)} mutants left to test.\n")
+            for result in cached:
+                self._record(result)
+                if result.get('killing_tests'):
+                    self.history.record(result['mutation_info'], result['killing_tests'])
+            self.reused += cached
+
+        return numbered
+
+    def finish_run(self, mutants, results, population=None):
+        """
+        Close the run and tally the reused and new verdicts
 
-        for i, mutant in enumerate(mutants, 1):
-            print(f"Testing mutant {i}/{len(mutants)}: "
-                  f"{mutant['info']['type']} at line {mutant['info']['line']} "
-                  f"({mutant['info']['original']} -> {mutant['info']['mutated']})...",
-                  end=" ")
+        Args:
+            mutants: All mutants passed to prepare_run()
+            results: Result dicts of the mutants tested since
+            population: See run_mutation_tests()
 
-            result = self.execute_mutant(mutant, i)
+        Returns:
+            Summary dict, as returned by run_mutation_tests()
+        """
+        if self.store is not None:
+            self.store.finish(self.run_id)
+        if self.fail_fast:
+            self.history.save()
+
+        results = sorted(self.reused + results, key=lambda r: r['mutant_number'])
+
+        if self.stopped_early:
+            # The score is an estimate over the mutants that were tested
+            population = population or len(mutants)
+            tested = {r['mutant_number'] for r in results}
+            mutants = [m for i, m in enumerate(mutants, 1) if i in tested]
+
+        summary = self._summarize(mutants, results, population)
+        summary['executed_count'] = len(results)
+        summary['stopped_early'] = self.stopped_early
+        return summary
+
+    def can_run_isolated(self):
+        """False if parallel workers would have to write mutants outside their sandboxes"""
+        writes_files = self.runner == 'subprocess' and not self.inject_command
+        return not writes_files or is_inside(self.source_file_path, os.getcwd())
+
+    def _converged(self, results, population):
+        """True once the running score estimate is precise enough to stop testing"""
+        return score_converged(results, population, self.confidence,
+                               self.stop_margin, self.stop_threshold)
+
+    def _record(self, result):
+        """Persist a verdict as soon as it is known"""
+        if self.store is not None:
+            self.store.record(self.run_id, result)
+        if self.cache is not None and not result.get('cached'):
+            self.cache.put(result['mutation_info'], result)
+
+    def _split_completed(self, numbered, completed):
+        """
+        Separate mutants already tested by an interrupted run
 
-            if result['status'] == 'killed':
-                print("KILLED")
-                killed.append(result)
-            elif result['status'] == 'survived':
-                print("SURVIVED")
-                survived.append(result)
+        Returns:
+            (pending, reused) - (number, mutant) pairs still to test, and
+            the recorded result dicts of the others
+        """
+        pending = []
+        reused = []
+        for i, mutant in numbered:
+            if i in completed:
+                result = completed[i]
+                result['mutation_info'] = mutant['info']
+                reused.append(result)
             else:
-                print("TIMEOUT")
-                timeout.append(result)
+                pending.append((i, mutant))
+        return pending, reused
 
-        # Calculate mutation score
-        total = len(mutants)
-        killed_count = len(killed)
-        survived_count = len(survived)
-        timeout_count = len(timeout)
+    def _split_cached(self, numbered):
+        """
+        Separate mutants with a cached verdict from those that must be tested
 
-        if total > 0:
-            mutation_score = (killed_count / total) * 100
-        else:
-            mutation_score = 0
+        Returns:
+            (pending, cached) - (number, mutant) pairs still to test, and
+            result dicts rebuilt from the cache
+        """
+        pending = []
+        cached = []
+        for i, mutant in numbered:
+            record = self.cache.get(mutant['info'])
+            if record is None or not self._reusable(record):
+                pending.append((i, mutant))
+                continue
+            result = dict(record)
+            result.update({'mutant_number': i, 'mutation_info': mutant['info'], 'cached': True})
+            cached.append(result)
+        return pending, cached
+
+    def _reusable(self, record):
+        """True if a cached verdict holds for the options of this run"""
+        if record['status'] == 'no_coverage':
+            # Only a run that recorded coverage skips the mutant as well
+            return self.coverage is not None
+        if record['status'] == 'survived' and 'selected_tests' in record:
+            # It survived the tests that reach it, not necessarily the full suite
+            return self.test_selection and not self.confirm_survivors
+        if record['status'] == 'killed' and self.kill_matrix:
+            return 'killing_tests' in record
+        return True
 
-        return {
-            'total': total,
-            'killed': killed,
-            'survived': survived,
-            'timeout': timeout,
-            'killed_count': killed_count,
-            'survived_count': survived_count,
-            'timeout_count': timeout_count,
-            'mutation_score': mutation_score
-        }
+    def _summarize(self, mutants, results, population=None):
+        """Tally per-mutant results into the summary dict used by the reports"""
+        summary = summarize_results(len(mutants), results, population, self.confidence)
+        summary['baseline_duration'] = self.baseline_duration
+        summary['mutant_timeout'] = self.timeout
+        if self.kill_matrix:
+            summary['kill_matrix'] = KillMatrix.from_results(results, self.test_durations)
+        return summary
+
+
+def score_converged(results, population, confidence, stop_margin=None, stop_threshold=None):
+    """
+    True once a running score estimate is precise enough to stop testing
+
+    Args:
+        results: Result dicts of the mutants tested so far (in random order)
+        population: Number of mutants they are drawn from
+        stop_margin: Stop once the confidence interval is within this many
+                     percentage points either side of the estimate
+        stop_threshold: Stop once the interval lies entirely above or below
+                        this score
+    """
+    if len(results) < MIN_EARLY_STOP_MUTANTS:
+        return False
+
+    killed = sum(1 for r in results if r['status'] == 'killed')
+    low, high = score_interval(killed, len(results), population, confidence)
+
+    if stop_threshold is not None and threshold_verdict((low, high), stop_threshold) is not None:
+        return True
+    return stop_margin is not None and (high - low) / 2 <= stop_margin
+
+
+def run_scheduled(tasks, workers, on_result, should_stop=None):
+    """
+    Test mutants, of one or more source files, on a pool of workers
+
+    Workers pull (executor, mutant number, mutant) tasks from a single shared
+    iterator, so a file with few mutants never leaves a worker idle while
+    another file still has mutants waiting. Workers inject mutants in memory
+    or use a fork server when they can, and fall back to a private sandbox
+    when mutants must be written to disk. A worker opens these resources
+    the first time it gets a task that needs them (see worker_key()), so
+    executors with different test commands can share the pool.
+
+    Args:
+        tasks: Iterable of (executor, mutant_number, mutant), consumed lazily
+        workers: Number of worker threads (0 = test in the calling thread,
+                 writing to the working copy if nothing else is possible)
+        on_result: Called with (executor, result) as each verdict arrives;
+                   verdicts are recorded before it is called
+        should_stop: Called with the results so far after every verdict;
+                     once it returns True, workers finish the mutant they
+                     are testing and take no new ones
+
+    Returns:
+        (results, stopped) - result dicts in completion order, and True if
+        should_stop ended the run before every task was tested
+    """
+    tasks = iter(tasks)
+    task_lock = threading.Lock()
+    lock = threading.Lock()
+    stop = threading.Event()
+    results = []
+
+    def next_task():
+        with task_lock:
+            if stop.is_set():
+                return None
+            return next(tasks, None)
+
+    def worker(worker_id, isolated):
+        # worker_key() -> (worker, close)
+        opened = {}
+        try:
+            while True:
+                task = next_task()
+                if task is None:
+                    return
+                executor, i, mutant = task
+                key = executor.worker_key()
+                if key not in opened:
+                    opened[key] = executor._open_worker(worker_id, isolated)
+                result = executor._test_mutant(opened[key][0], mutant, i)
+                with lock:
+                    executor._record(result)
+                    results.append(result)
+                    on_result(executor, result)
+                    if should_stop is not None and not stop.is_set() and should_stop(results):
+                        stop.set()
+        finally:
+            for _, close in opened.values():
+                close()
+
+    if workers:
+        threads = [threading.Thread(target=worker, args=(n, True), daemon=True)
+                   for n in range(1, workers + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        worker(1, False)
+
+    # Whatever is left was either cut off by should_stop or by failed workers
+    left = sum(1 for _ in tasks)
+    if left and not stop.is_set():
+        print(f"WARNING: {left} mutants were not tested because a worker failed.")
+    return results, stop.is_set() and left > 0
+
+
+def summarize_results(total, results, population=None, confidence=0.95):
+    """
+    Tally per-mutant results into the summary dict used by the reports
+
+    Args:
+        total: Number of mutants the results belong to
+        results: Result dicts, one per tested mutant
+        population: Number of mutants these were sampled from (None = not a sample)
+        confidence: Confidence level of the score interval
+    """
+    killed = [r for r in results if r['status'] == 'killed']
+    survived = [r for r in results if r['status'] == 'survived']
+    timeout = [r for r in results if r['status'] == 'timeout']
+    no_coverage = [r for r in results if r['status'] == 'no_coverage']
+
+    # Calculate mutation score
+    killed_count = len(killed)
+    survived_count = len(survived)
+    timeout_count = len(timeout)
+    no_coverage_count = len(no_coverage)
+    cached_count = sum(1 for r in results if r.get('cached'))
+
+    if total > 0:
+        mutation_score = (killed_count / total) * 100
+    else:
+        mutation_score = 0
+
+    # Score over the mutants the tests actually execute
+    covered = total - no_coverage_count
+    if covered > 0:
+        covered_mutation_score = (killed_count / covered) * 100
+    else:
+        covered_mutation_score = 0
+
+    # A sample only estimates the score of the population it came from
+    population = population or total
+    score_low, score_high = score_interval(killed_count, total, population, confidence)
+
+    return {
+        'total': total,
+        'killed': killed,
+        'survived': survived,
+        'timeout': timeout,
+        'no_coverage': no_coverage,
+        'killed_count': killed_count,
+        'survived_count': survived_count,
+        'timeout_count': timeout_count,
+        'no_coverage_count': no_coverage_count,
+        'cached_count': cached_count,
+        'mutation_score': mutation_score,
+        'covered_mutation_score': covered_mutation_score,
+        'population': population,
+        'sampled': population > total,
+        'confidence': confidence,
+        'score_interval': (score_low, score_high)
+    }
 
 
 # ============================================================================
@@ -423,7 +1516,13 @@ def print_mutation_report(results):
     print(f"Killed: {results['killed_count']}")
     print(f"Survived: {results['survived_count']}")
     print(f"Timeout: {results['timeout_count']}")
+    print(f"No Coverage: {results['no_coverage_count']}")
     print(f"\nMutation Score: {results['mutation_score']:.2f}%")
+    if results['sampled']:
+        low, high = results['score_interval']
+        print(f"{results['confidence']:.0%} Confidence Interval: {low:.2f}% - {high:.2f}% "
+              f"(sample of {results['total']} from {results['population']} mutants)")
+    print(f"Covered Mutation Score: {results['covered_mutation_score']:.2f}%")
 
     if results['survived']:
         print("\n" + "-" * 60)
@@ -0,0 +1,232 @@
+"""
+Source patching for Mutest.
+
+A mutant differs from the original module in a single operator, so instead
+of re-generating the whole module from a modified AST its source is made by
+splicing the replacement operator into the original text, at the position
+recorded for the mutated node. Every other byte of the file stays as it was:
+comments, formatting and, above all, line numbers, so tracebacks from a
+mutant point at the real source.
+
+    total = price * (1 + rate)   ->   total = price * (1 - rate)
+
+When the replacement binds more or less tightly than the original operator
+(a + b * c -> a + b - c would regroup), the affected expressions are wrapped
+in parentheses so the spliced code parses to the mutated tree. Every patch
+is parsed again and compared with the mutated tree; one that does not match
+is rendered with ast.unparse() instead.
+"""
+import ast
+import copy
+import io
+from points import PATH_STEP, mutation_applied, node_at
+
+
+OPERATOR_SYMBOLS = {
+    'Add': '+', 'Sub': '-', 'Mult': '*', 'Div': '/', 'FloorDiv': '//',
+    'Mod': '%', 'Pow': '**',
+    'Lt': '<', 'LtE': '<=', 'Gt': '>', 'GtE': '>=', 'Eq': '==', 'NotEq': '!=',
+    'And': 'and', 'Or': 'or',
+}
+
+# Binding strength of expressions, loosest first (Python language reference, 6.17)
+NAMED_EXPR, LAMBDA, IF_EXP, OR, AND, NOT, COMPARE = range(7)
+BINARY_PRECEDENCE = {
+    ast.BitOr: 7, ast.BitXor: 8, ast.BitAnd: 9, ast.LShift: 10, ast.RShift: 10,
+    ast.Add: 11, ast.Sub: 11,
+    ast.Mult: 12, ast.MatMult: 12, ast.Div: 12, ast.FloorDiv: 12, ast.Mod: 12,
+    ast.Pow: 14,
+}
+UNARY, AWAIT, ATOM = 13, 15, 16
+
+
+def precedence(node):
+    """Binding strength of an expression node (ATOM for anything unbreakable)"""
+    if isinstance(node, ast.BinOp):
+        return BINARY_PRECEDENCE[type(node.op)]
+    if isinstance(node, ast.BoolOp):
+        return AND if isinstance(node.op, ast.And) else OR
+    if isinstance(node, ast.UnaryOp):
+        return NOT if isinstance(node.op, ast.Not) else UNARY
+    return {
+        ast.NamedExpr: NAMED_EXPR, ast.Lambda: LAMBDA, ast.IfExp: IF_EXP,
+        ast.Compare: COMPARE, ast.Await: AWAIT,
+    }.get(type(node), ATOM)
+
+
+def operator_precedence(name):
+    """Binding strength of an operator given by its ast class name"""
+    if name in ('And', 'Or'):
+        return AND if name == 'And' else OR
+    op = getattr(ast, name)
+    if issubclass(op, ast.cmpop):
+        return COMPARE
+    return BINARY_PRECEDENCE[op]
+
+
+class SourcePatcher:
+    """Renders mutants of one module by patching its source text"""
+
+    def __init__(self, source_code, tree=None):
+        """
+        Args:
+            source_code: Original source of the module
+            tree: The module parsed from source_code (parsed again if None)
+        """
+        self.source_code = source_code
+        self.lines = io.StringIO(source_code).readlines()
+
+        self.line_starts = [0]
+        for line in self.lines:
+            self.line_starts.append(self.line_starts[-1] + len(line))
+
+        self.tree = ast.parse(source_code) if tree is None else tree
+
+    def offset(self, line, col):
+        """Index in the source text of an ast position (col counts UTF-8 bytes)"""
+        text = self.lines[line - 1] if line <= len(self.lines) else ''
+        if not text.isascii():
+            col = len(text.encode('utf-8')[:col].decode('utf-8', errors='replace'))
+        return self.line_starts[line - 1] + col
+
+    def _start(self, node):
+        return self.offset(node.lineno, node.col_offset)
+
+    def _end(self, node):
+        return self.offset(node.end_lineno, node.end_col_offset)
+
+    def _find_symbol(self, start, stop, symbol):
+        """
+        Index of the operator symbol between two operands
+
+        Apart from the operator, the text between two operands can only hold
+        whitespace, parentheses, line continuations and comments.
+        """
+        found = None
+        position = start
+        for line in self.source_code[start:stop].splitlines(keepends=True):
+            code = line.split('#', 1)[0]
+            if code.strip(' \t\f\r\n\\()'):
+                if found is not None or code.strip(' \t\f\r\n\\()') != symbol:
+                    return None
+                found = position + code.index(symbol)
+            position += len(line)
+        return found
+
+    def render(self, mutation_info):
+        """
+        Source code of a mutant (safe to call from several threads)
+
+        Mutants whose operator cannot be located in the text, or whose
+        patched text does not parse to the mutated tree, are rendered from
+        the mutated tree with ast.unparse() instead, which does not keep
+        the original formatting.
+        """
+        code = self.patch(mutation_info)
+        if code is None or not self.parses_to_mutant(code, mutation_info):
+            # Other threads may be reading self.tree, so a copy is mutated
+            with mutation_applied(copy.deepcopy(self.tree), mutation_info) as tree:
+                code = ast.unparse(tree)
+        return code
+
+    def parses_to_mutant(self, code, mutation_info):
+        """
+        True if patched code parses to the original module with exactly
+        this mutation applied
+
+        A patch only edits text inside the top-level statement holding the
+        mutation point, so only that statement is parsed again and compared.
+        """
+        step = PATH_STEP.match(mutation_info['path'])
+        if step is None or step.group(1) != 'body' or step.group(2) is None:
+            return False
+        index = int(step.group(2))
+        statement = self.tree.body[index]
+
+        first_line = min([statement.lineno] + [d.lineno for d in
+                                               getattr(statement, 'decorator_list', [])])
+        start = self.line_starts[first_line - 1]
+        end = self._end(statement) + len(code) - len(self.source_code)
+        path = 'body[0]' + mutation_info['path'][step.end():]
+        try:
+            tree = ast.parse(code[start:end])
+            node = node_at(tree, path)
+        except (SyntaxError, ValueError, LookupError):
+            return False
+        if len(tree.body) != 1:
+            return False
+
+        if isinstance(node, ast.Compare):
+            ops = node.ops[mutation_info.get('op_index', 0):][:1]
+        else:
+            ops = [getattr(node, 'op', None)]
+        if [type(op).__name__ for op in ops] != [mutation_info['mutated']]:
+            return False
+
+        # Undo the mutation in the parsed copy; the rest must be the original
+        # statement (positions are not compared, so added parentheses match)
+        reverted = dict(mutation_info, path=path, original=mutation_info['mutated'],
+                        mutated=mutation_info['original'])
+        try:
+            with mutation_applied(tree, reverted):
+                return ast.dump(tree.body[0]) == ast.dump(statement)
+        except LookupError:
+            return False
+
+    def patch(self, mutation_info):
+        """
+        Patch a mutation into the source text
+
+        Returns:
+            The patched source, or None if the operator could not be located
+        """
+        node = node_at(self.tree, mutation_info['path'])
+
+        if isinstance(node, ast.Compare):
+            index = mutation_info.get('op_index', 0)
+            operands = [node.left if index == 0 else node.comparators[index - 1],
+                        node.comparators[index]]
+        elif isinstance(node, ast.BinOp):
+            operands = [node.left, node.right]
+        else:
+            operands = node.values
+
+        original = OPERATOR_SYMBOLS[mutation_info['original']]
+        mutated = OPERATOR_SYMBOLS[mutation_info['mutated']]
+
+        # (start, end, replacement) edits of the source text
+        edits = []
+        for left, right in zip(operands, operands[1:]):
+            position = self._find_symbol(self._end(left), self._start(right), original)
+            if position is None:
+                return None
+            edits.append((position, position + len(original), mutated))
+
+        original_rank = operator_precedence(mutation_info['original'])
+        mutated_rank = operator_precedence(mutation_info['mutated'])
+        if mutated_rank < original_rank:
+            # A looser operator must not merge the expression into its surroundings
+            wrapped = [node]
+        elif mutated_rank > original_rank:
+            # A tighter one must not split its operands (a right operand of the
+            # same precedence would regroup as well, and and/or would flatten)
+            merges = isinstance(node, ast.BoolOp)
+            wrapped = [operand for i, operand in enumerate(operands)
+                       if precedence(operand) < mutated_rank
+                       or ((i > 0 or merges) and precedence(operand) == mutated_rank)]
+        else:
+            wrapped = []
+        for expression in wrapped:
+            edits.append((self._start(expression), self._start(expression), '('))
+            edits.append((self._end(expression), self._end(expression), ')'))
+
+        # At the same offset, a ')' closing the left operand goes before the
+        # operator it touches: insertions (start == end) sort first
+        pieces = []
+        position = 0
+        for start, end, text in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+            pieces.append(self.source_code[position:start])
+            pieces.append(text)
+            position = end
+        pieces.append(self.source_code[position:])
+        return ''.join(pieces)
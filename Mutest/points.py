@@ -0,0 +1,72 @@
+"""
+Mutation point addressing for Mutest.
+
+Every mutation point records the path of its node from the module root,
+e.g. 'body[2].body[0].value.right', next to its exact source span. The path
+leads straight to the node in any tree parsed from the same source (or a
+copy of one), so applying a mutant is a lookup instead of a search.
+"""
+import ast
+import re
+from contextlib import contextmanager
+
+
+# Node types of the mutation point kinds
+POINT_NODES = {
+    'ArithmeticOperator': ast.BinOp,
+    'ComparisonOperator': ast.Compare,
+    'LogicalOperator': ast.BoolOp,
+}
+
+PATH_STEP = re.compile(r'(\w+)(?:\[(\d+)\])?')
+
+
+def path_step(field, index=None):
+    """One step of a node path: a field, subscripted for list fields"""
+    return field if index is None else f'{field}[{index}]'
+
+
+def node_at(tree, path):
+    """
+    Node at a path in a parsed module
+
+    Raises:
+        LookupError if the tree has no node at that path
+    """
+    node = tree
+    for match in PATH_STEP.finditer(path):
+        field, index = match.groups()
+        try:
+            node = getattr(node, field)
+            if index is not None:
+                node = node[int(index)]
+        except (AttributeError, IndexError, TypeError):
+            raise LookupError(f"no node at '{path}'")
+    return node
+
+
+@contextmanager
+def mutation_applied(tree, mutation_info):
+    """
+    Apply a mutation to a parsed module in place for the duration of a block
+
+        with mutation_applied(tree, info):
+            code = compile(tree, path, 'exec')
+    """
+    node = node_at(tree, mutation_info['path'])
+    if not isinstance(node, POINT_NODES[mutation_info['type']]):
+        raise LookupError(f"no {mutation_info['type']} point at '{mutation_info['path']}'")
+
+    mutated_op = getattr(ast, mutation_info['mutated'])()
+    if isinstance(node, ast.Compare):
+        index = mutation_info.get('op_index', 0)
+        original_op, node.ops[index] = node.ops[index], mutated_op
+    else:
+        original_op, node.op = node.op, mutated_op
+    try:
+        yield tree
+    finally:
+        if isinstance(node, ast.Compare):
+            node.ops[index] = original_op
+        else:
+            node.op = original_op
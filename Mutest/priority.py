@@ -0,0 +1,79 @@
+"""
+Survival prediction for Mutest.
+
+The survivors are what a developer acts on, yet in a long run they are
+scattered among hundreds of kills. With --survivors-first the mutants are
+tested in order of how likely they are to survive, so the first results
+are the ones worth writing tests for:
+
+    1. mutants that survived the previous run of the same file and tests
+    2. mutants the previous run did not test (new or edited code)
+    3. mutants the previous run killed
+
+Within each group, mutants on code few tests execute (none at all comes
+first) and operator changes that often escaped the tests in earlier runs
+go first.
+"""
+
+
+# Verdicts of the previous run a mutant's rank is based on
+PREVIOUSLY_SURVIVED, NO_PREVIOUS_VERDICT, PREVIOUSLY_KILLED = 0, 1, 2
+
+
+def point_key(mutation_info):
+    """What identifies a mutation point from one run to the next"""
+    return (mutation_info['type'], mutation_info.get('function'), mutation_info['line'],
+            mutation_info['col'], mutation_info.get('op_index', 0),
+            mutation_info['original'], mutation_info['mutated'])
+
+
+class SurvivalPredictor:
+    """Ranks the mutants of one source file by how likely they are to survive"""
+
+    def __init__(self, previous=(), operators=None, coverage=None):
+        """
+        Args:
+            previous: Result dicts of the previous run of the file
+            operators: (original, mutated) -> (not killed, tested) over
+                       earlier runs (see ResultStore.operator_history())
+            coverage: CoverageMap of the file, if recorded
+        """
+        self.previous = {}
+        for result in previous:
+            if result.get('mutation_info') and result['status'] != 'timeout':
+                self.previous[point_key(result['mutation_info'])] = result['status']
+        self.operators = operators or {}
+        self.coverage = coverage
+        self.test_count = len(coverage.tests) if coverage is not None else 0
+
+    def survival(self, mutation_info):
+        """
+        Estimated chance (0 to 1) that a mutant survives, ignoring the previous run
+
+        A mutant no test reaches always survives; otherwise the share of
+        tests that do not reach it and the smoothed rate at which its
+        operator change escaped before are averaged.
+        """
+        escaped, tested = self.operators.get(
+            (mutation_info['original'], mutation_info['mutated']), (0, 0))
+        # Laplace smoothing: an operator change never seen counts as a coin flip
+        estimates = [(escaped + 1) / (tested + 2)]
+
+        if self.coverage is not None:
+            reaching = self.coverage.tests_for(mutation_info)
+            if reaching == []:
+                return 1.0
+            if reaching is not None and self.test_count:
+                estimates.append(1 - len(reaching) / self.test_count)
+        return sum(estimates) / len(estimates)
+
+    def rank(self, mutation_info):
+        """Sort key of a mutant, most likely survivor first"""
+        status = self.previous.get(point_key(mutation_info))
+        if status is None:
+            group = NO_PREVIOUS_VERDICT
+        elif status == 'killed':
+            group = PREVIOUSLY_KILLED
+        else:
+            group = PREVIOUSLY_SURVIVED
+        return group, -self.survival(mutation_info)
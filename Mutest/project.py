@@ -0,0 +1,418 @@
+"""
+Whole-project mutation runs for Mutest.
+
+`mutest run src/ "pytest tests/"` mutates every Python file under src/. The
+files share a single baseline run (one instrumented test run records the
+coverage of all of them) and a single pool of workers: mutants of every file
+go into one global queue, so small files never leave workers idle while a
+large file is still being tested. The combined results keep a per-file
+breakdown for the reports.
+
+Parsing the files and enumerating their mutants is fanned out over a process
+pool, and each file's mutants join the queue as soon as it is done, so tests
+start running while the rest of the tree is still being enumerated.
+
+A run can also mix test commands (start.py's "Run ALL" does): every command
+gets one baseline for all the files it tests, and all their mutants still
+share the one pool of workers.
+"""
+import fnmatch
+import glob
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cache import TEST_FILE_PATTERNS
+from gitdiff import changed_lines
+from killmatrix import KillMatrix
+from mutest001 import (MutantGenerator, resolve_jobs, restore_backup, run_scheduled,
+                       score_converged, summarize_results)
+from sampling import sample_fraction, sample_per_operator
+from sandbox import IGNORED_PATTERNS
+
+
+def _matches(path, patterns):
+    """True if a path, or its file name, matches any of the glob patterns"""
+    posix_path = path.replace(os.sep, '/')
+    name = os.path.basename(path)
+    return any(fnmatch.fnmatch(posix_path, pattern) or fnmatch.fnmatch(name, pattern)
+               for pattern in patterns)
+
+
+def discover_sources(targets, include=(), exclude=()):
+    """
+    Python source files named by a mix of files, directories and glob patterns
+
+    Directories are searched recursively. Files found in directories or by
+    patterns must match one of the include patterns (default '*.py') and
+    none of the exclude patterns; test files (test_*.py, *_test.py,
+    conftest.py) and the directories sandboxes leave out (.git, .venv, ...)
+    are always skipped. Files named explicitly are always kept.
+
+    Args:
+        targets: Paths or glob patterns (e.g. 'src/', 'pkg/**/*.py')
+        include: Glob patterns matched against the path or file name
+        exclude: Glob patterns matched against the path or file name
+
+    Returns:
+        Sorted list of file paths, without duplicates
+    """
+    include = tuple(include) or ('*.py',)
+    exclude = tuple(exclude) + TEST_FILE_PATTERNS
+
+    def wanted(path):
+        return _matches(path, include) and not _matches(path, exclude)
+
+    files = set()
+    for target in targets:
+        if os.path.isfile(target):
+            files.add(os.path.normpath(target))
+            continue
+
+        if os.path.isdir(target):
+            roots = [target]
+        else:
+            matched = glob.glob(target, recursive=True)
+            files.update(os.path.normpath(path) for path in matched
+                         if os.path.isfile(path) and wanted(path))
+            roots = [path for path in matched if os.path.isdir(path)]
+
+        for root in roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(d for d in dirnames
+                                     if not _matches(d, IGNORED_PATTERNS)
+                                     and not _matches(os.path.join(dirpath, d), exclude))
+                for filename in filenames:
+                    path = os.path.normpath(os.path.join(dirpath, filename))
+                    if wanted(path):
+                        files.add(path)
+
+    return sorted(files)
+
+
+# ============================================================================
+# MUTANT ENUMERATION
+# ============================================================================
+
+def enumerate_file(source_file, since=None, schemata=False, tce=True, sample=None,
+                   per_operator=None, seed=0, index_cache=None):
+    """
+    Parse a source file and generate (and sample) its mutants
+
+    Runs in enumeration worker processes, so it takes and returns only
+    plain, picklable values.
+
+    Args:
+        source_file: Path of the source file
+        since: Only mutate lines changed against this git ref (None = all)
+        schemata, tce, index_cache: See MutantGenerator
+        sample: Stratified fraction of the mutants to keep (None = all)
+        per_operator: Keep at most this many mutants per operator type
+        seed: Seed of the sample
+
+    Returns:
+        dict with source_file, mutants, population (the number of mutants
+        the sample was drawn from), equivalent_count, duplicate_count and
+        out_of_scope_count
+
+    Raises:
+        OSError if the file cannot be read, SyntaxError if it cannot be
+        parsed, gitdiff.GitDiffError if the diff against since fails
+    """
+    # Undo a mutant left in the source file by an interrupted in-place run
+    restore_backup(source_file)
+
+    with open(source_file, 'r') as f:
+        source_code = f.read()
+
+    # Restrict mutation to lines changed against the base ref
+    lines = changed_lines(source_file, since) if since else None
+
+    generator = MutantGenerator(schemata=schemata, tce=tce, index_cache=index_cache)
+    mutants = generator.generate_mutants(source_code, lines=lines)
+
+    population = len(mutants)
+    if sample:
+        mutants = sample_fraction(mutants, sample, seed=seed)
+    elif per_operator:
+        mutants = sample_per_operator(mutants, per_operator, seed=seed)
+
+    return {
+        'source_file': source_file,
+        'mutants': mutants,
+        'population': population,
+        'equivalent_count': len(generator.equivalent),
+        'duplicate_count': len(generator.duplicates),
+        'out_of_scope_count': generator.out_of_scope_count,
+    }
+
+
+def enumerate_sources(source_files, processes=None, **options):
+    """
+    Enumerate the mutants of several source files in parallel
+
+    The files are handed to a pool of processes right away; the returned
+    iterator yields each file's enumerate_file() dict as soon as that file
+    is done, in completion order. Files that cannot be read, parsed or
+    diffed are skipped with a warning.
+
+    Args:
+        source_files: Paths of the source files
+        processes: Size of the process pool (None = one per CPU core);
+                   with 1, files are enumerated lazily in the calling
+                   process as the iterator is consumed
+        options: Keyword arguments of enumerate_file()
+
+    Returns:
+        Iterator of enumerate_file() dicts
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(source_files))
+
+    if processes <= 1:
+        return _enumerate_inline(source_files, options)
+
+    # Spawned, not forked: the run's worker threads may already be going
+    pool = ProcessPoolExecutor(max_workers=processes,
+                               mp_context=multiprocessing.get_context('spawn'))
+    futures = {pool.submit(enumerate_file, path, **options): path for path in source_files}
+    return _enumerate_completed(pool, futures)
+
+
+def _enumerate_inline(source_files, options):
+    for path in source_files:
+        try:
+            yield enumerate_file(path, **options)
+        except Exception as e:
+            print(f"WARNING: Skipping {path}: {e}")
+
+
+def _enumerate_completed(pool, futures):
+    try:
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                print(f"WARNING: Skipping {futures[future]}: {e}")
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+# ============================================================================
+# PROJECT RUN
+# ============================================================================
+
+def normalize_command(test_command):
+    """A test command with its spacing normalized (commands that only differ in spacing are the same)"""
+    return ' '.join(test_command.split())
+
+
+class ProjectRun:
+    """Mutation run over several source files with shared baselines and one worker pool"""
+
+    def __init__(self, executors, enumerated, on_result=None):
+        """
+        Args:
+            executors: MutationTestExecutors, one per (source file, test
+                       command) pair; executors with the same test command
+                       (up to spacing, see normalize_command())
+                       share one baseline run, and the first executor's
+                       options (jobs, early stopping) apply to the whole run
+            enumerated: Iterable of enumerate_file() dicts, one per source
+                        file (see enumerate_sources()); it is consumed
+                        while mutants are already being tested
+            on_result: Called with (executor, result) for each verdict,
+                       e.g. a report.SurvivorStream; the reused verdicts
+                       of a file come as soon as it is enumerated
+        """
+        self.executors = executors
+        self.enumerated = enumerated
+        self.on_result = on_result
+        self.lead = executors[0]
+        self.entries = []
+        self.summaries = {}
+        self.file_counts = {}
+        self.counts = {'equivalent_count': 0, 'duplicate_count': 0, 'out_of_scope_count': 0}
+
+    def _run_baselines(self):
+        """
+        Run the original tests once per test command
+
+        Returns:
+            The executors whose tests pass on the original code
+        """
+        groups = {}
+        for executor in self.executors:
+            groups.setdefault(normalize_command(executor.test_command), []).append(executor)
+
+        passing = []
+        for command, group in groups.items():
+            if len(groups) > 1:
+                print(f"Baseline for {command} ({len(group)} source file{'s' if len(group) > 1 else ''})")
+            if group[0].run_original_tests(peers=group[1:]):
+                passing.extend(group)
+            elif len(groups) > 1:
+                print(f"Skipping {', '.join(e.source_file_path for e in group)} "
+                      f"- original tests must pass first!")
+        return passing
+
+    def _tasks(self, executors):
+        """Yield the (executor, number, mutant) tasks of each file as it is enumerated"""
+        by_path = {}
+        for executor in executors:
+            by_path.setdefault(executor.source_file_path, []).append(executor)
+
+        for entry in self.enumerated:
+            self.file_counts[entry['source_file']] = {key: entry[key] for key in self.counts}
+            for key in self.counts:
+                self.counts[key] += entry[key]
+            mutants = entry['mutants']
+            print(f"Enumerated {len(mutants)} mutants of {entry['source_file']}")
+            if not mutants:
+                continue
+
+            # A file tested by several commands is enumerated once
+            for executor in by_path.get(entry['source_file'], []):
+                self.entries.append((executor, mutants, entry['population']))
+                numbered = executor.prepare_run(mutants)
+                if self.on_result is not None:
+                    for result in executor.reused:
+                        self.on_result(executor, result)
+                for i, mutant in numbered:
+                    yield executor, i, mutant
+
+    def _survivors_first(self, tasks):
+        """Sort tasks of all files by predicted survival (see priority.py)"""
+        operators = self.lead.store.operator_history() if self.lead.store is not None else None
+        predictors = {}
+        for executor, _, _ in tasks:
+            if id(executor) not in predictors:
+                predictors[id(executor)] = executor.survival_predictor(operators)
+        return sorted(tasks, key=lambda task: predictors[id(task[0])].rank(task[2]['info']))
+
+    def run(self):
+        """
+        Run the baselines, then test the mutants of every file
+
+        The summary of each executor is kept in self.summaries, and the
+        equivalent, duplicate and out-of-scope counts of each source file
+        in self.file_counts.
+
+        Returns:
+            Combined summary dict (see combine_results()), or None if the
+            original tests fail for every test command
+        """
+        lead = self.lead
+        executors = self._run_baselines()
+        if not executors:
+            print("Cannot proceed - original tests must pass first!")
+            return None
+
+        tasks = self._tasks(executors)
+
+        # Early stopping needs every prefix of the run to be a random sample,
+        # so it waits for the whole tree to be enumerated
+        should_stop = None
+        if lead.stop_margin is not None or lead.stop_threshold is not None:
+            tasks = list(tasks)
+            random.Random(lead.seed).shuffle(tasks)
+            population = sum(population for _, _, population in self.entries)
+            reused = [result for executor, _, _ in self.entries for result in executor.reused]
+            should_stop = lambda done: score_converged(
+                reused + done, population, lead.confidence, lead.stop_margin, lead.stop_threshold)
+            if lead.survivors_first:
+                print("Note: early stopping tests mutants in random order, "
+                      "ignoring --survivors-first.")
+        elif lead.survivors_first:
+            # Likely survivors of every file go first, so the tree is enumerated up front
+            tasks = self._survivors_first(list(tasks))
+
+        workers = 0
+        if lead.jobs is not None:
+            workers = resolve_jobs(lead.jobs)
+            if workers and not all(executor.can_run_isolated() for executor in executors):
+                print("Note: some source files are outside the current directory, "
+                      "running mutants sequentially.")
+                workers = 0
+
+        by_executor = {id(executor): [] for executor in executors}
+        done = 0
+
+        def report(executor, result):
+            nonlocal done
+            by_executor[id(executor)].append(result)
+            done += 1
+            info = result['mutation_info']
+            print(f"[{done}] {executor.source_file_path}:{info['line']} "
+                  f"{info['type']} ({info['original']} -> {info['mutated']})... "
+                  f"{result['status'].upper()}")
+            if self.on_result is not None:
+                self.on_result(executor, result)
+
+        file_count = len({executor.source_file_path for executor in executors})
+        print(f"Testing mutants of {file_count} files"
+              f"{f' with {workers} parallel workers' if workers else ''}...\n")
+        _, stopped = run_scheduled(tasks, workers, report, should_stop)
+        if stopped:
+            reused = sum(len(executor.reused) for executor, _, _ in self.entries)
+            print(f"\nStopped early: the score estimate converged after {reused + done} of "
+                  f"{sum(len(mutants) for _, mutants, _ in self.entries)} mutants.")
+
+        file_results = []
+        for executor, mutants, population in self.entries:
+            executor.stopped_early = stopped
+            summary = executor.finish_run(mutants, by_executor[id(executor)], population)
+            self.summaries[executor] = summary
+            file_results.append((executor.source_file_path, summary))
+        combined = combine_results(file_results, lead)
+        combined.update(self.counts)
+        return combined
+
+
+def combine_results(file_results, lead):
+    """
+    Merge the summaries of several source files into one
+
+    The combined result dicts get the 'source_file' they belong to, and the summary
+    gets a 'files' list with the counts and scores of each file.
+
+    Args:
+        file_results: List of (source file path, summary dict)
+        lead: Executor whose confidence level and timeouts apply to the run
+    """
+    file_results = sorted(file_results, key=lambda item: item[0])
+    results = []
+    files = []
+    for path, summary in file_results:
+        for status in ('killed', 'survived', 'timeout', 'no_coverage'):
+            # Copies, so the summary of the single file stays as it was
+            results.extend(dict(result, source_file=path) for result in summary[status])
+        files.append({
+            'source_file': path,
+            'total': summary['total'],
+            'killed_count': summary['killed_count'],
+            'survived_count': summary['survived_count'],
+            'timeout_count': summary['timeout_count'],
+            'no_coverage_count': summary['no_coverage_count'],
+            'mutation_score': summary['mutation_score'],
+            'covered_mutation_score': summary['covered_mutation_score'],
+        })
+
+    results.sort(key=lambda r: (r['source_file'], r['mutant_number']))
+    combined = summarize_results(
+        sum(summary['total'] for _, summary in file_results),
+        results,
+        sum(summary['population'] for _, summary in file_results),
+        lead.confidence
+    )
+    combined.update({
+        'files': files,
+        'executed_count': sum(summary['executed_count'] for _, summary in file_results),
+        'stopped_early': any(summary['stopped_early'] for _, summary in file_results),
+        'baseline_duration': lead.baseline_duration,
+        'mutant_timeout': lead.timeout,
+    })
+    if lead.kill_matrix:
+        combined['kill_matrix'] = KillMatrix.from_results(results, lead.test_durations)
+    return combined
@@ -1,9 +1,21 @@
 """
 Report generation module for Mutest mutation testing tool.
-Supports text, HTML, and JSON report formats.
+Supports text, HTML, and JSON report formats, and a text report of the
+surviving mutants that grows while the run is still going.
 """
 from datetime import datetime
 import json
+import threading
+from mutest001 import MUTEST_VERSION
+
+
+def _location(mutant):
+    """Where a mutant is, with its file when the run covered several files"""
+    info = mutant['mutation_info']
+    location = f"Line {info['line']}, Column {info['col']}"
+    if mutant.get('source_file'):
+        location = f"{mutant['source_file']}, {location}"
+    return location
 
 
 def generate_text_report(results, output_file, source_file, test_command):
@@ -26,10 +38,26 @@ def generate_text_report(results, output_file, source_file, test_command):
         f.write(f"Total Mutants:    {results['total']}\n")
         f.write(f"Killed:           {results['killed_count']} ({results['killed_count']/results['total']*100:.1f}%)\n")
         f.write(f"Survived:         {results['survived_count']} ({results['survived_count']/results['total']*100:.1f}%)\n")
-        f.write(f"Timeout:          {results['timeout_count']} ({results['timeout_count']/results['total']*100:.1f}%)\n\n")
+        f.write(f"Timeout:          {results['timeout_count']} ({results['timeout_count']/results['total']*100:.1f}%)\n")
+        f.write(f"No Coverage:      {results['no_coverage_count']} ({results['no_coverage_count']/results['total']*100:.1f}%)\n")
+        if results.get('cached_count'):
+            f.write(f"From Cache:       {results['cached_count']} (unchanged since a previous run)\n")
+        if results.get('since'):
+            f.write(f"Out of Scope:     {results['out_of_scope_count']} (skipped, on lines unchanged since {results['since']})\n")
+        if results.get('equivalent_count') or results.get('duplicate_count'):
+            f.write(f"Equivalent:       {results.get('equivalent_count', 0)} (skipped, same bytecode as the original)\n")
+            f.write(f"Duplicates:       {results.get('duplicate_count', 0)} (skipped, same bytecode as another mutant)\n")
+        f.write("\n")
 
         score = results['mutation_score']
-        f.write(f"Mutation Score:   {score:.2f}%\n\n")
+        f.write(f"Mutation Score:   {score:.2f}%\n")
+        if results.get('sampled'):
+            low, high = results['score_interval']
+            f.write(f"Confidence:       {low:.2f}% - {high:.2f}% at {results['confidence']:.0%} "
+                    f"(sample of {results['total']} from {results['population']} mutants)\n")
+        if results.get('stopped_early'):
+            f.write(f"Executed:         {results['executed_count']} mutants (stopped early once the estimate converged)\n")
+        f.write(f"Covered Score:    {results['covered_mutation_score']:.2f}% (excluding no-coverage mutants)\n\n")
 
         # Quality assessment
         if score >= 97:
@@ -43,6 +71,19 @@ def generate_text_report(results, output_file, source_file, test_command):
 
         f.write("\n")
 
+        # Per-file breakdown of a run over several files
+        if results.get('files'):
+            f.write("=" * 70 + "\n")
+            f.write(f"FILES ({len(results['files'])})\n")
+            f.write("=" * 70 + "\n\n")
+
+            f.write(f"{'Score':>8}  {'Killed':>6}  {'Surv.':>5}  {'Time':>4}  {'NoCov':>5}  {'Total':>5}  File\n")
+            for entry in results['files']:
+                f.write(f"{entry['mutation_score']:7.2f}%  {entry['killed_count']:6}  "
+                        f"{entry['survived_count']:5}  {entry['timeout_count']:4}  "
+                        f"{entry['no_coverage_count']:5}  {entry['total']:5}  {entry['source_file']}\n")
+            f.write("\n")
+
         # Killed mutants
         if results['killed']:
             f.write("=" * 70 + "\n")
@@ -53,7 +94,7 @@ def generate_text_report(results, output_file, source_file, test_command):
                 info = mutant['mutation_info']
                 f.write(f"Mutant #{mutant['mutant_number']}:\n")
                 f.write(f"  Type:     {info['type']}\n")
-                f.write(f"  Location: Line {info['line']}, Column {info['col']}\n")
+                f.write(f"  Location: {_location(mutant)}\n")
                 f.write(f"  Change:   {info['original']} → {info['mutated']}\n")
                 f.write(f"  Status:   KILLED ✓\n\n")
 
@@ -70,7 +111,7 @@ def generate_text_report(results, output_file, source_file, test_command):
                 info = mutant['mutation_info']
                 f.write(f"Mutant #{mutant['mutant_number']}:\n")
                 f.write(f"  Type:     {info['type']}\n")
-                f.write(f"  Location: Line {info['line']}, Column {info['col']}\n")
+                f.write(f"  Location: {_location(mutant)}\n")
                 f.write(f"  Change:   {info['original']} → {info['mutated']}\n")
                 f.write(f"  Status:   SURVIVED ✗\n")
                 f.write(f"  Action:   Add test case to detect this mutation\n\n")
@@ -85,9 +126,26 @@ def generate_text_report(results, output_file, source_file, test_command):
                 info = mutant['mutation_info']
                 f.write(f"Mutant #{mutant['mutant_number']}:\n")
                 f.write(f"  Type:     {info['type']}\n")
-                f.write(f"  Location: Line {info['line']}, Column {info['col']}\n")
+                f.write(f"  Location: {_location(mutant)}\n")
                 f.write(f"  Change:   {info['original']} → {info['mutated']}\n")
-                f.write(f"  Status:   TIMEOUT ⏱\n\n")
+                f.write("  Status:   TIMEOUT ⏱\n\n")
+
+        # Mutants on code the tests never execute
+        if results['no_coverage']:
+            f.write("=" * 70 + "\n")
+            f.write(f"NO COVERAGE MUTANTS ({len(results['no_coverage'])}) - ACTION NEEDED!\n")
+            f.write("=" * 70 + "\n\n")
+
+            f.write("No test executes these lines, so these mutants were not run.\n")
+            f.write("Add tests that exercise this code:\n\n")
+
+            for mutant in results['no_coverage']:
+                info = mutant['mutation_info']
+                f.write(f"Mutant #{mutant['mutant_number']}:\n")
+                f.write(f"  Type:     {info['type']}\n")
+                f.write(f"  Location: {_location(mutant)}\n")
+                f.write(f"  Change:   {info['original']} → {info['mutated']}\n")
+                f.write("  Status:   NO COVERAGE ∅\n\n")
 
         f.write("=" * 70 + "\n")
         f.write("END OF REPORT\n")
@@ -228,6 +286,11 @@ def generate_html_report(results, output_file, source_file, test_command):
             border-left: 4px solid #ffc107;
         }}
 
+        .stat-card.no-coverage {{
+            background: #e2e3e5;
+            border-left: 4px solid #6c757d;
+        }}
+
         .stat-value {{
             font-size: 2rem;
             font-weight: bold;
@@ -251,6 +314,22 @@ def generate_html_report(results, output_file, source_file, test_command):
             color: #495057;
         }}
 
+        .file-table {{
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 0.95rem;
+        }}
+
+        .file-table th, .file-table td {{
+            padding: 0.5rem;
+            border-bottom: 1px solid #dee2e6;
+            text-align: right;
+        }}
+
+        .file-table th:first-child, .file-table td:first-child {{
+            text-align: left;
+        }}
+
         .mutant-card {{
             background: #f8f9fa;
             border-left: 4px solid #6c757d;
@@ -272,6 +351,10 @@ def generate_html_report(results, output_file, source_file, test_command):
             border-left-color: #ffc107;
         }}
 
+        .mutant-card.no-coverage {{
+            border-left-color: #6c757d;
+        }}
+
         .mutant-header {{
             display: flex;
             justify-content: space-between;
@@ -306,6 +389,11 @@ def generate_html_report(results, output_file, source_file, test_command):
             color: #000;
         }}
 
+        .mutant-status.no-coverage {{
+            background: #6c757d;
+            color: white;
+        }}
+
         .mutant-detail {{
             margin: 0.25rem 0;
             color: #6c757d;
@@ -351,12 +439,17 @@ def generate_html_report(results, output_file, source_file, test_command):
                 <div><strong>Generated:</strong> {timestamp}</div>
                 <div><strong>Source File:</strong> {source_file}</div>
                 <div><strong>Test Command:</strong> {test_command}</div>
+                {f"<div><strong>Skipped:</strong> {results.get('equivalent_count', 0)} equivalent and {results.get('duplicate_count', 0)} duplicate mutants (identical bytecode)</div>" if results.get('equivalent_count') or results.get('duplicate_count') else ''}
+                {f"<div><strong>Executed:</strong> {results['executed_count']} of {results['population']} mutants (stopped early once the score estimate converged)</div>" if results.get('stopped_early') else ''}
+                {f"<div><strong>Changed Since:</strong> {results['since']} ({results['out_of_scope_count']} mutants on unchanged lines skipped as out of scope)</div>" if results.get('since') else ''}
             </div>
 
             <div class="score-card">
                 <div class="score-label">Mutation Score</div>
                 <div class="score-value">{score:.1f}%</div>
                 <div class="score-label">{score_label}</div>
+                {f"<div class='score-label'>{results['confidence']:.0%} CI: {results['score_interval'][0]:.1f}% – {results['score_interval'][1]:.1f}% (sample of {results['total']} from {results['population']} mutants)</div>" if results.get('sampled') else ''}
+                <div class="score-label">Covered code: {results['covered_mutation_score']:.1f}%</div>
             </div>
 
             <div class="stats-grid">
@@ -372,8 +465,16 @@ def generate_html_report(results, output_file, source_file, test_command):
                     <div class="stat-value">{results['timeout_count']}</div>
                     <div class="stat-label">Timeouts</div>
                 </div>
+                <div class="stat-card no-coverage">
+                    <div class="stat-value">{results['no_coverage_count']}</div>
+                    <div class="stat-label">No Coverage</div>
+                </div>
             </div>
 
+            {'<div class="section"><h2 class="section-title">📁 Files (' + str(len(results['files'])) + ')</h2><table class="file-table"><tr><th>File</th><th>Score</th><th>Killed</th><th>Survived</th><th>Timeout</th><th>No Coverage</th><th>Total</th></tr>' + ''.join([f'''
+                <tr><td>{entry['source_file']}</td><td>{entry['mutation_score']:.1f}%</td><td>{entry['killed_count']}</td><td>{entry['survived_count']}</td><td>{entry['timeout_count']}</td><td>{entry['no_coverage_count']}</td><td>{entry['total']}</td></tr>
+            ''' for entry in results['files']]) + '</table></div>' if results.get('files') else ''}
+
             {'<div class="section"><h2 class="section-title">🎯 Killed Mutants (' + str(len(results['killed'])) + ')</h2>' + ''.join([f'''
                 <div class="mutant-card killed">
                     <div class="mutant-header">
@@ -381,7 +482,7 @@ def generate_html_report(results, output_file, source_file, test_command):
                         <span class="mutant-status killed">KILLED</span>
                     </div>
                     <div class="mutant-detail"><strong>Type:</strong> {mutant['mutation_info']['type']}</div>
-                    <div class="mutant-detail"><strong>Location:</strong> Line {mutant['mutation_info']['line']}, Column {mutant['mutation_info']['col']}</div>
+                    <div class="mutant-detail"><strong>Location:</strong> {_location(mutant)}</div>
                     <div class="mutation-change">
                         <span class="original">{mutant['mutation_info']['original']}</span> → <span class="mutated">{mutant['mutation_info']['mutated']}</span>
                     </div>
@@ -395,7 +496,7 @@ def generate_html_report(results, output_file, source_file, test_command):
                         <span class="mutant-status survived">SURVIVED</span>
                     </div>
                     <div class="mutant-detail"><strong>Type:</strong> {mutant['mutation_info']['type']}</div>
-                    <div class="mutant-detail"><strong>Location:</strong> Line {mutant['mutation_info']['line']}, Column {mutant['mutation_info']['col']}</div>
+                    <div class="mutant-detail"><strong>Location:</strong> {_location(mutant)}</div>
                     <div class="mutation-change">
                         <span class="original">{mutant['mutation_info']['original']}</span> → <span class="mutated">{mutant['mutation_info']['mutated']}</span>
                     </div>
@@ -412,16 +513,30 @@ def generate_html_report(results, output_file, source_file, test_command):
                         <span class="mutant-status timeout">TIMEOUT</span>
                     </div>
                     <div class="mutant-detail"><strong>Type:</strong> {mutant['mutation_info']['type']}</div>
-                    <div class="mutant-detail"><strong>Location:</strong> Line {mutant['mutation_info']['line']}, Column {mutant['mutation_info']['col']}</div>
+                    <div class="mutant-detail"><strong>Location:</strong> {_location(mutant)}</div>
                     <div class="mutation-change">
                         <span class="original">{mutant['mutation_info']['original']}</span> → <span class="mutated">{mutant['mutation_info']['mutated']}</span>
                     </div>
                 </div>
             ''' for mutant in results['timeout']]) + '</div>' if results['timeout'] else ''}
+
+            {'<div class="section"><h2 class="section-title">🚫 No Coverage Mutants (' + str(len(results['no_coverage'])) + ') - Not Executed by Any Test</h2>' + ''.join([f'''
+                <div class="mutant-card no-coverage">
+                    <div class="mutant-header">
+                        <span class="mutant-number">Mutant #{mutant['mutant_number']}</span>
+                        <span class="mutant-status no-coverage">NO COVERAGE</span>
+                    </div>
+                    <div class="mutant-detail"><strong>Type:</strong> {mutant['mutation_info']['type']}</div>
+                    <div class="mutant-detail"><strong>Location:</strong> {_location(mutant)}</div>
+                    <div class="mutation-change">
+                        <span class="original">{mutant['mutation_info']['original']}</span> → <span class="mutated">{mutant['mutation_info']['mutated']}</span>
+                    </div>
+                </div>
+            ''' for mutant in results['no_coverage']]) + '</div>' if results['no_coverage'] else ''}
         </div>
 
         <div class="footer">
-            Generated by Mutest v0.0.1 • {timestamp}
+            Generated by Mutest v{MUTEST_VERSION} • {timestamp}
         </div>
     </div>
 </body>
@@ -440,21 +555,110 @@ def generate_json_report(results, output_file, source_file, test_command):
             "generated_at": timestamp,
             "source_file": source_file,
             "test_command": test_command,
-            "mutest_version": "0.0.1"
+            "mutest_version": MUTEST_VERSION,
+            "since": results.get('since'),
+            "baseline_duration": results.get('baseline_duration'),
+            "mutant_timeout": results.get('mutant_timeout')
         },
         "summary": {
             "total_mutants": results['total'],
             "killed_count": results['killed_count'],
             "survived_count": results['survived_count'],
             "timeout_count": results['timeout_count'],
-            "mutation_score": round(results['mutation_score'], 2)
+            "no_coverage_count": results['no_coverage_count'],
+            "cached_count": results.get('cached_count', 0),
+            "out_of_scope_count": results.get('out_of_scope_count', 0),
+            "equivalent_count": results.get('equivalent_count', 0),
+            "duplicate_count": results.get('duplicate_count', 0),
+            "mutation_score": round(results['mutation_score'], 2),
+            "mutation_score_interval": [round(bound, 2) for bound in results.get('score_interval', (results['mutation_score'],) * 2)],
+            "confidence": results.get('confidence'),
+            "sampled": results.get('sampled', False),
+            "population": results.get('population', results['total']),
+            "executed_count": results.get('executed_count', results['total']),
+            "stopped_early": results.get('stopped_early', False),
+            "covered_mutation_score": round(results['covered_mutation_score'], 2)
         },
+        "files": [
+            dict(entry, mutation_score=round(entry['mutation_score'], 2),
+                 covered_mutation_score=round(entry['covered_mutation_score'], 2))
+            for entry in results.get('files', [])
+        ],
         "mutants": {
             "killed": results['killed'],
             "survived": results['survived'],
-            "timeout": results['timeout']
+            "timeout": results['timeout'],
+            "no_coverage": results['no_coverage']
         }
     }
 
+    if results.get('kill_matrix') is not None:
+        report_data["kill_matrix"] = results['kill_matrix'].to_dict()
+
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(report_data, f, indent=2, ensure_ascii=False)
+
+
+class SurvivorStream:
+    """
+    Text report of the surviving mutants, written as each one is confirmed
+
+    Pass it as the on_result callback of a run; every survivor (and every
+    mutant no test reaches) is appended and flushed right away, so tests
+    can be written for the first survivors while the rest of the run is
+    still confirming kills.
+    """
+
+    def __init__(self, output_file, test_command=None):
+        """
+        Args:
+            output_file: Path of the report (overwritten)
+            test_command: Command the tests are run with (None = several
+                          commands, each survivor names its own)
+        """
+        self.output_file = output_file
+        self.test_command = test_command
+        self.count = 0
+        self._sources = {}
+        self._lock = threading.Lock()
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write("=" * 70 + "\n")
+            f.write("MUTEST - SURVIVING MUTANTS (LIVE)\n")
+            f.write("=" * 70 + "\n\n")
+            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            if test_command is not None:
+                f.write(f"Test Command: {test_command}\n")
+            f.write("\n")
+            f.write("Mutants are added here as soon as they are confirmed to survive.\n\n")
+
+    def _source_line(self, path, line):
+        lines = self._sources.get(path)
+        if lines is None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                lines = []
+            self._sources[path] = lines
+        return lines[line - 1].strip() if 0 < line <= len(lines) else ''
+
+    def __call__(self, executor, result):
+        if result['status'] not in ('survived', 'no_coverage'):
+            return
+
+        info = result['mutation_info']
+        path = executor.source_file_path
+        with self._lock:
+            self.count += 1
+            with open(self.output_file, 'a', encoding='utf-8') as f:
+                f.write(f"Survivor {self.count}: {path}, Line {info['line']}, Column {info['col']}\n")
+                f.write(f"  Type:     {info['type']}\n")
+                f.write(f"  Change:   {info['original']} → {info['mutated']}\n")
+                f.write(f"  Code:     {self._source_line(path, info['line'])}\n")
+                if self.test_command is None:
+                    f.write(f"  Tests:    {executor.test_command}\n")
+                if result['status'] == 'no_coverage':
+                    f.write("  Status:   NO COVERAGE ✗ (no test executes this line)\n\n")
+                else:
+                    f.write("  Status:   SURVIVED ✗\n\n")
@@ -0,0 +1 @@
+"""Runtime support loaded inside test processes (see mutest_runtime.py)"""
@@ -0,0 +1,451 @@
+"""
+Runtime support loaded inside the test process.
+
+Mutest passes this module to pytest as a plugin (`-p mutest_runtime`). When
+it is imported it installs a `sys.meta_path` finder that serves the mutated
+source of one module from memory, so mutants never have to be written over
+the real source file. It also provides the switches used by schemata modules
+(see schemata.py), restricts the run to selected tests (in a given order,
+stopping at the first failure if asked to), records per-test
+line coverage during the instrumented baseline run and reports which tests
+failed (for the kill matrix, see killmatrix.py).
+
+Test processes only get this directory (runtime/) on their path. The rest
+of Mutest lives one directory up in modules with generic names (sampling,
+store, cache, ...) that would shadow the project's own modules, so the few
+the runtime needs are loaded through import_mutest_module().
+
+The executor describes what to do in environment variables:
+    MUTEST_PAYLOAD         JSON request, zlib-compressed and base64-encoded
+    MUTEST_PAYLOAD_FD      or: inherited pipe the same payload can be read from
+    MUTEST_COVERAGE_PATH   source files to record per-test line coverage for
+                           (separated by os.pathsep)
+    MUTEST_COVERAGE_OUT    JSON file the coverage maps are written to
+    MUTEST_OUTCOMES_OUT    JSON file the failed tests and test durations are written to
+
+The payload may contain:
+    id        number of the mutant (for diagnostics)
+    path      source file being mutated, with
+    code      its mutated source
+    schemata  or: source file to serve as a schemata module, with
+    active    the id of the mutant to switch on
+    select    node ids of the only tests to run
+    order     node ids of tests to run first, in this order
+    fail_fast stop at the first failing test, with quiet output
+"""
+import base64
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import json
+import operator
+import os
+import sys
+import threading
+import zlib
+
+
+# sys.monitoring (Python 3.12+) gives much cheaper line probes than sys.settrace
+MONITORING = getattr(sys, 'monitoring', None)
+
+# Encoded payloads larger than this go through a pipe instead of the
+# environment (Linux limits a single environment string to 128 KiB)
+MAX_ENV_PAYLOAD = 96 * 1024
+
+# Mutest's own modules, kept off the test process's path
+MUTEST_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mutant switched on in schemata modules (0 = run the original code)
+ACTIVE_MUTANT = 0
+
+BINARY_OPERATORS = {
+    'Add': operator.add, 'Sub': operator.sub, 'Mult': operator.mul,
+    'Div': operator.truediv, 'FloorDiv': operator.floordiv,
+    'Mod': operator.mod, 'Pow': operator.pow,
+}
+
+COMPARISON_OPERATORS = {
+    'Lt': operator.lt, 'LtE': operator.le, 'Gt': operator.gt,
+    'GtE': operator.ge, 'Eq': operator.eq, 'NotEq': operator.ne,
+}
+
+
+def binop(left, right, op, alternatives):
+    """Schemata switch for an arithmetic operator"""
+    for mutant_id, mutated in alternatives:
+        if mutant_id == ACTIVE_MUTANT:
+            return BINARY_OPERATORS[mutated](left, right)
+    return BINARY_OPERATORS[op](left, right)
+
+
+def compare(left, right, op, alternatives):
+    """Schemata switch for a comparison operator"""
+    for mutant_id, mutated in alternatives:
+        if mutant_id == ACTIVE_MUTANT:
+            return COMPARISON_OPERATORS[mutated](left, right)
+    return COMPARISON_OPERATORS[op](left, right)
+
+
+def activate(mutant_id):
+    """Switch schemata modules to the given mutant (0 = original code)"""
+    global ACTIVE_MUTANT
+    ACTIVE_MUTANT = mutant_id
+
+
+def encode_payload(request):
+    """Compress and encode a request for transport to the test process"""
+    data = json.dumps(request).encode('utf-8')
+    return base64.b64encode(zlib.compress(data)).decode('ascii')
+
+
+def decode_payload(payload):
+    """Inverse of encode_payload()"""
+    return json.loads(zlib.decompress(base64.b64decode(payload)).decode('utf-8'))
+
+
+# ============================================================================
+# IMPORT HOOK
+# ============================================================================
+
+class MutantFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Serves mutated code for one source path instead of the file on disk"""
+
+    def __init__(self, path, code, mutant_id=None):
+        """
+        Args:
+            path: Real path of the source file being mutated
+            code: Mutated source code, or a parsed (schemata) module
+            mutant_id: Number of the mutant being served
+        """
+        self.path = os.path.realpath(path)
+        self.code = code
+        self.mutant_id = mutant_id
+
+    def find_spec(self, fullname, path, target=None):
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or not spec.origin or os.path.realpath(spec.origin) != self.path:
+            return None
+        return importlib.util.spec_from_file_location(fullname, spec.origin, loader=self)
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        module.__mutest_mutant__ = self.mutant_id
+        exec_code(self.code, module)
+
+
+def exec_code(code, module):
+    """
+    Execute mutated code (source text or a parsed module) in a module namespace
+
+    The runtime is made available to it under the name schemata modules use.
+    """
+    module.__dict__['__mutest_rt__'] = sys.modules[__name__]
+    exec(compile(code, module.__file__, 'exec'), module.__dict__)
+
+
+def import_mutest_module(name):
+    """
+    Import one of Mutest's own modules without exposing the others to the tests
+
+    Inside a test process, Mutest's directory is put on sys.path only for
+    the import. Afterwards every Mutest module is taken out of sys.modules
+    again, and project modules of the same names are put back, so an
+    `import sampling` in the tests still finds the project's sampling.py.
+    """
+    if MUTEST_DIR in (os.path.abspath(entry) for entry in sys.path):
+        # Mutest's own process
+        return importlib.import_module(name)
+
+    own = set()
+    for entry in os.listdir(MUTEST_DIR):
+        if entry.endswith('.py'):
+            own.add(entry[:-3])
+        elif os.path.isfile(os.path.join(MUTEST_DIR, entry, '__init__.py')):
+            own.add(entry)
+
+    def is_own(key):
+        return key.split('.')[0] in own
+
+    shadowed = {key: sys.modules.pop(key) for key in list(sys.modules) if is_own(key)}
+    sys.path.insert(0, MUTEST_DIR)
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.remove(MUTEST_DIR)
+        for key in [key for key in sys.modules if is_own(key)]:
+            del sys.modules[key]
+        sys.modules.update(shadowed)
+
+
+def load_schemata(path):
+    """Build the schemata module for a source file, ready for exec_code()"""
+    generator = import_mutest_module('mutest001').MutantGenerator()
+    build_schemata = import_mutest_module('schemata').build_schemata
+
+    with open(path, 'r') as f:
+        source_code = f.read()
+
+    tree, points = generator.find_mutation_points(source_code)
+    tree, _ = build_schemata(tree, points)
+    return tree
+
+
+def install_finder(request):
+    """
+    Install a MutantFinder for the mutant described by a request
+
+    Returns:
+        The installed finder, or None if the request names no mutant
+    """
+    mutant_id = request.get('id')
+
+    if request.get('schemata'):
+        activate(request.get('active', 0))
+        finder = MutantFinder(request['schemata'], load_schemata(request['schemata']), mutant_id)
+    elif request.get('path'):
+        finder = MutantFinder(request['path'], request['code'], mutant_id)
+    else:
+        return None
+
+    sys.meta_path.insert(0, finder)
+    return finder
+
+
+def read_request(environ=None):
+    """Read the request passed by the executor, or an empty dict"""
+    environ = os.environ if environ is None else environ
+
+    if 'MUTEST_PAYLOAD_FD' in environ:
+        with os.fdopen(int(environ['MUTEST_PAYLOAD_FD']), 'r') as pipe:
+            return decode_payload(pipe.read())
+    if environ.get('MUTEST_PAYLOAD'):
+        return decode_payload(environ['MUTEST_PAYLOAD'])
+    return {}
+
+
+# ============================================================================
+# LINE COVERAGE
+# ============================================================================
+
+class LineRecorder:
+    """
+    Records which lines of a set of source files execute, per bucket and file
+
+    On Python 3.12+ every line is a sys.monitoring probe that disables
+    itself after its first hit (and is re-armed when the bucket changes), so
+    recording costs almost nothing once a line has been seen. Older versions
+    fall back to a sys.settrace function that only traces frames of the
+    recorded files.
+    """
+
+    # sys.monitoring tool ids not reserved for debuggers, coverage or profilers
+    TOOL_IDS = (3, 4)
+
+    def __init__(self, paths):
+        """
+        Args:
+            paths: Source files to record (other files are not traced)
+        """
+        self.paths = {os.path.realpath(path) for path in paths}
+        # bucket -> real path of a recorded file -> executed line numbers
+        self.buckets = {}
+        self.files = self.buckets.setdefault(None, {})
+        self._traced_files = {}
+        self._tool_id = None
+
+    def switch(self, bucket):
+        """Record subsequent lines under bucket (None = outside any test)"""
+        self.files = self.buckets.setdefault(bucket, {})
+        if self._tool_id is not None:
+            MONITORING.restart_events()
+
+    def start(self):
+        if MONITORING is not None:
+            for tool_id in self.TOOL_IDS:
+                try:
+                    MONITORING.use_tool_id(tool_id, 'mutest')
+                except ValueError:
+                    continue
+                self._tool_id = tool_id
+                MONITORING.register_callback(tool_id, MONITORING.events.LINE, self._probe)
+                MONITORING.set_events(tool_id, MONITORING.events.LINE)
+                return
+
+        threading.settrace(self._trace_call)
+        sys.settrace(self._trace_call)
+
+    def stop(self):
+        if self._tool_id is not None:
+            MONITORING.set_events(self._tool_id, 0)
+            MONITORING.register_callback(self._tool_id, MONITORING.events.LINE, None)
+            MONITORING.free_tool_id(self._tool_id)
+            self._tool_id = None
+            return
+
+        sys.settrace(None)
+        threading.settrace(None)
+
+    def _traced_path(self, filename):
+        """Real path of a code object's file if it is recorded, else ''"""
+        path = self._traced_files.get(filename)
+        if path is None:
+            path = os.path.realpath(filename)
+            path = path if path in self.paths else ''
+            self._traced_files[filename] = path
+        return path
+
+    def _probe(self, code, line_number):
+        path = self._traced_path(code.co_filename)
+        if path:
+            self.files.setdefault(path, set()).add(line_number)
+        return MONITORING.DISABLE
+
+    def _trace_call(self, frame, event, arg):
+        if not self._traced_path(frame.f_code.co_filename):
+            return None
+        return self._trace_line
+
+    def _trace_line(self, frame, event, arg):
+        if event == 'line':
+            path = self._traced_path(frame.f_code.co_filename)
+            self.files.setdefault(path, set()).add(frame.f_lineno)
+        return self._trace_line
+
+
+# ============================================================================
+# TEST OUTCOMES
+# ============================================================================
+
+class OutcomeRecorder:
+    """Collects the tests that fail (in the order they fail) and how long each test took"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: JSON file write() stores {'failed': [node ids],
+                  'durations': {node id: seconds}} in
+        """
+        self.path = path
+        self.failed = []
+        self.durations = {}
+
+    def add(self, report):
+        """Take a pytest TestReport (a test fails if any of its phases fails)"""
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        if report.failed and report.nodeid not in self.failed:
+            self.failed.append(report.nodeid)
+
+    def write(self):
+        with open(self.path, 'w') as f:
+            json.dump({'failed': self.failed, 'durations': self.durations}, f)
+
+
+def read_outcomes(path):
+    """
+    Test outcomes written by an OutcomeRecorder
+
+    Returns:
+        dict with 'failed' and 'durations', or None if the file is missing
+        or unreadable
+    """
+    try:
+        with open(path, 'r') as f:
+            outcomes = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return outcomes if isinstance(outcomes, dict) and 'failed' in outcomes else None
+
+
+# ============================================================================
+# PYTEST PLUGIN HOOKS
+# ============================================================================
+
+REQUEST = {}
+RECORDER = None
+OUTCOMES = None
+
+
+def select_items(items, selected, config=None):
+    """Keep only the test items whose node ids are in selected (in place)"""
+    selected = set(selected)
+    dropped = [item for item in items if item.nodeid not in selected]
+    if dropped and config is not None:
+        config.hook.pytest_deselected(items=dropped)
+    items[:] = [item for item in items if item.nodeid in selected]
+
+
+def order_items(items, order):
+    """Move the test items named in order to the front, in that order (in place)"""
+    rank = {nodeid: i for i, nodeid in enumerate(order)}
+    items.sort(key=lambda item: rank.get(item.nodeid, len(rank)))
+
+
+def apply_fail_fast(config):
+    """Make a pytest run stop at its first failure (-x) and report quietly (-q)"""
+    config.option.maxfail = 1
+    config.option.verbose = min(config.option.verbose, -1)
+
+
+def pytest_configure(config):
+    if REQUEST.get('fail_fast'):
+        apply_fail_fast(config)
+
+
+def pytest_collection_modifyitems(session, config, items):
+    if REQUEST.get('select') is not None:
+        select_items(items, REQUEST['select'], config)
+    if REQUEST.get('order'):
+        order_items(items, REQUEST['order'])
+
+
+def pytest_runtest_logstart(nodeid, location):
+    if RECORDER is not None:
+        RECORDER.switch(nodeid)
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    if RECORDER is not None:
+        RECORDER.switch(None)
+
+
+def pytest_runtest_logreport(report):
+    if OUTCOMES is not None:
+        OUTCOMES.add(report)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if OUTCOMES is not None:
+        OUTCOMES.write()
+    if RECORDER is None:
+        return
+    RECORDER.stop()
+    coverage = {path: {'global': [], 'tests': {}} for path in RECORDER.paths}
+    for nodeid, files in RECORDER.buckets.items():
+        for path, lines in files.items():
+            if nodeid is None:
+                coverage[path]['global'] = sorted(lines)
+            else:
+                coverage[path]['tests'][nodeid] = sorted(lines)
+    with open(os.environ['MUTEST_COVERAGE_OUT'], 'w') as f:
+        json.dump({'files': coverage}, f)
+
+
+def _start_from_environment():
+    """Set up whatever the executor asked for"""
+    global REQUEST, RECORDER, OUTCOMES
+    REQUEST = read_request()
+    install_finder(REQUEST)
+
+    if os.environ.get('MUTEST_OUTCOMES_OUT'):
+        OUTCOMES = OutcomeRecorder(os.environ['MUTEST_OUTCOMES_OUT'])
+
+    if os.environ.get('MUTEST_COVERAGE_PATH') and os.environ.get('MUTEST_COVERAGE_OUT'):
+        RECORDER = LineRecorder(os.environ['MUTEST_COVERAGE_PATH'].split(os.pathsep))
+        RECORDER.start()
+
+
+# Plugin modules are imported before pytest collects (and imports) any test
+# module, which is exactly when the finder and the recorder have to be in place
+_start_from_environment()
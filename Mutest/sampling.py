@@ -0,0 +1,145 @@
+"""
+Mutant sampling for Mutest.
+
+On large code bases a trustworthy estimate of the mutation score is often
+enough. This module draws seeded, stratified samples of the generated
+mutants and puts a confidence interval on the score measured on a sample.
+
+Mutants are stratified by operator type and enclosing function, so every
+kind of mutation and every part of the module is represented in the sample
+in proportion to its share of the mutants.
+"""
+import math
+import random
+from statistics import NormalDist
+
+
+def _strata(mutants):
+    """Group mutants by (operator type, enclosing function), in generation order"""
+    strata = {}
+    for mutant in mutants:
+        info = mutant['info']
+        strata.setdefault((info['type'], info.get('function')), []).append(mutant)
+    return strata
+
+
+def sample_fraction(mutants, fraction, seed=0):
+    """
+    Draw a stratified sample of a fraction of the mutants
+
+    Each stratum gets its proportional share of the sample; the slots left
+    over by rounding go to the strata with the largest remainders.
+
+    Args:
+        mutants: Mutants as returned by MutantGenerator.generate_mutants()
+        fraction: Share of the mutants to keep (0 < fraction <= 1)
+        seed: Seed of the random draw
+
+    Returns:
+        The sampled mutants, in generation order
+    """
+    if not mutants:
+        return []
+    rng = random.Random(seed)
+    strata = _strata(mutants)
+    size = min(len(mutants), max(1, round(fraction * len(mutants))))
+
+    quotas = {key: len(group) * size / len(mutants) for key, group in strata.items()}
+    counts = {key: int(quota) for key, quota in quotas.items()}
+    by_remainder = sorted(strata, key=lambda key: (quotas[key] - counts[key], rng.random()), reverse=True)
+    for key in by_remainder[:size - sum(counts.values())]:
+        counts[key] += 1
+
+    sample = []
+    for key, group in strata.items():
+        sample.extend(rng.sample(group, counts[key]))
+    return _in_order(mutants, sample)
+
+
+def sample_per_operator(mutants, count, seed=0):
+    """
+    Draw up to count mutants of every operator type
+
+    Within an operator type the draw is spread over the enclosing functions
+    round-robin, so one large function cannot take the whole quota.
+
+    Returns:
+        The sampled mutants, in generation order
+    """
+    rng = random.Random(seed)
+    by_type = {}
+    for (operator_type, _), group in _strata(mutants).items():
+        shuffled = list(group)
+        rng.shuffle(shuffled)
+        by_type.setdefault(operator_type, []).append(shuffled)
+
+    sample = []
+    for groups in by_type.values():
+        rng.shuffle(groups)
+        taken = 0
+        while taken < count and any(groups):
+            for group in groups:
+                if group and taken < count:
+                    sample.append(group.pop())
+                    taken += 1
+    return _in_order(mutants, sample)
+
+
+def _in_order(mutants, sample):
+    chosen = {id(mutant) for mutant in sample}
+    return [mutant for mutant in mutants if id(mutant) in chosen]
+
+
+def score_interval(killed, sampled, population=None, confidence=0.95):
+    """
+    Wilson score interval for a mutation score measured on a sample
+
+    When the sample was drawn without replacement from a known population,
+    the finite population correction narrows the interval (down to a single
+    point when every mutant was run).
+
+    Args:
+        killed: Mutants killed in the sample
+        sampled: Size of the sample
+        population: Number of mutants the sample was drawn from
+        confidence: Confidence level of the interval
+
+    Returns:
+        (low, high) mutation score bounds in percent
+    """
+    if sampled == 0:
+        return 0.0, 100.0
+
+    p = killed / sampled
+    correction = 1.0
+    if population and population > 1:
+        correction = max(0.0, (population - sampled) / (population - 1))
+    if correction == 0:
+        return p * 100, p * 100
+
+    n = sampled / correction
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - half_width) * 100, min(1.0, center + half_width) * 100
+
+
+def threshold_verdict(interval, threshold):
+    """
+    Where a score lies relative to a threshold, given its confidence interval
+
+    Args:
+        interval: (low, high) bounds in percent, as returned by score_interval()
+        threshold: Score in percent
+
+    Returns:
+        'above' if the whole interval is at or above the threshold, 'below'
+        if it lies entirely below it, or None while it straddles the threshold
+    """
+    low, high = interval
+    if low >= threshold:
+        return 'above'
+    if high < threshold:
+        return 'below'
+    return None
@@ -0,0 +1,89 @@
+"""
+Worker sandboxes for parallel mutation testing.
+
+Each parallel worker gets its own private copy of the project tree so that
+mutants can be written to disk and tested side by side without ever touching
+the developer's working copy.
+"""
+import os
+import shutil
+import tempfile
+
+
+# Directories and files that are never needed to run the tests of a mutant
+IGNORED_PATTERNS = (
+    '.git', '.hg', '.svn',
+    '__pycache__', '*.pyc', '*.pyo', '*.backup',
+    '.pytest_cache', '.mypy_cache', '.ruff_cache', '.mutest_cache',
+    '.tox', '.nox', '.venv', 'venv', 'node_modules',
+    'reports', 'htmlcov',
+)
+
+
+class WorkerSandbox:
+    """A private copy of the project tree owned by a single worker"""
+
+    def __init__(self, project_root, worker_id):
+        """
+        Args:
+            project_root: Directory the test command is normally run from
+            worker_id: Number of the worker that owns this sandbox
+        """
+        self.project_root = os.path.abspath(project_root)
+        self.worker_id = worker_id
+        self.base_dir = None
+        self.root = None
+
+    def create(self):
+        """Copy the project tree into a fresh temporary directory"""
+        self.base_dir = tempfile.mkdtemp(prefix=f'mutest-worker{self.worker_id}-')
+        self.root = os.path.join(self.base_dir, os.path.basename(self.project_root))
+        shutil.copytree(
+            self.project_root,
+            self.root,
+            symlinks=True,
+            ignore=shutil.ignore_patterns(*IGNORED_PATTERNS)
+        )
+        return self
+
+    def cleanup(self):
+        """Remove the sandbox from disk"""
+        if self.base_dir:
+            shutil.rmtree(self.base_dir, ignore_errors=True)
+            self.base_dir = None
+            self.root = None
+
+    def path_for(self, path):
+        """Map a path inside the project tree to the same path in the sandbox"""
+        relative = os.path.relpath(os.path.abspath(path), self.project_root)
+        return os.path.join(self.root, relative)
+
+    def env(self, base=None):
+        """
+        Environment for test processes running in this sandbox.
+
+        PYTHONPATH entries pointing into the project are redirected to the
+        sandbox, and bytecode caching is disabled so a mutant is never
+        shadowed by a stale .pyc written for the previous one.
+
+        Args:
+            base: Environment to adapt (default: os.environ)
+        """
+        env = dict(os.environ if base is None else base)
+        entries = []
+        for entry in env.get('PYTHONPATH', '').split(os.pathsep):
+            if entry and is_inside(entry, self.project_root):
+                entry = self.path_for(entry)
+            if entry:
+                entries.append(entry)
+        if entries:
+            env['PYTHONPATH'] = os.pathsep.join(entries)
+        env['PYTHONDONTWRITEBYTECODE'] = '1'
+        return env
+
+
+def is_inside(path, directory):
+    """Return True if path lives inside directory"""
+    path = os.path.abspath(path)
+    directory = os.path.abspath(directory)
+    return path == directory or path.startswith(directory + os.sep)
@@ -0,0 +1,160 @@
+"""
+Mutant schemata for Mutest.
+
+Instead of producing one full copy of a module per mutant, a schemata module
+contains every mutant at once: each mutation point is rewritten into a
+runtime switch on the active mutant id held by mutest_runtime. The module is
+compiled and imported once, and a test process can step through mutants just
+by changing mutest_runtime.ACTIVE_MUTANT.
+
+    a + b      ->  __mutest_rt__.binop(a, b, 'Add', ((1, 'Sub'), (2, 'Mult'), ...))
+    a < b      ->  __mutest_rt__.compare(a, b, 'Lt', ((7, 'LtE'), ...))
+    a and b    ->  (a or b) if __mutest_rt__.ACTIVE_MUTANT == 9 else (a and b)
+
+Only points inside function bodies are switched. Expressions evaluated at
+import time (module and class level, decorators, default arguments) would be
+frozen with whatever mutant was active when the module was imported, so their
+mutants are still rendered as separate source files. Chained comparisons
+(a < b < c) are not switched either, since rewriting them would change how
+often the middle operand is evaluated.
+"""
+import ast
+import copy
+from points import node_at
+
+
+# Name under which the runtime module is injected into the schemata module
+RUNTIME_NAME = '__mutest_rt__'
+
+
+def _runtime_attr(name):
+    return ast.Attribute(value=ast.Name(id=RUNTIME_NAME, ctx=ast.Load()), attr=name, ctx=ast.Load())
+
+
+class SchemataTransformer(ast.NodeTransformer):
+    """Rewrites mutation points into switches on the active mutant id"""
+
+    def __init__(self, switches):
+        """
+        Args:
+            switches: Mapping of id() of a mutated node -> list of
+                      (mutant id, mutated operator name)
+        """
+        self.switches = switches
+        self.switched = set()
+        self.function_depth = 0
+
+    def visit_FunctionDef(self, node):
+        if self.function_depth:
+            # Nested definitions are evaluated each time the outer function runs
+            self.function_depth += 1
+            self.generic_visit(node)
+            self.function_depth -= 1
+            return node
+
+        self.function_depth += 1
+        node.body = [self.visit(statement) for statement in node.body]
+        self.function_depth -= 1
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        if self.function_depth:
+            self.function_depth += 1
+            self.generic_visit(node)
+            self.function_depth -= 1
+            return node
+
+        self.function_depth += 1
+        node.body = self.visit(node.body)
+        self.function_depth -= 1
+        return node
+
+    def _alternatives(self, node):
+        if not self.function_depth or id(node) not in self.switches:
+            return None
+        alternatives = self.switches[id(node)]
+        self.switched.update(mutant_id for mutant_id, _ in alternatives)
+        return tuple(alternatives)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+
+        alternatives = self._alternatives(node)
+        if alternatives is None:
+            return node
+
+        call = ast.Call(
+            func=_runtime_attr('binop'),
+            args=[node.left, node.right,
+                  ast.Constant(type(node.op).__name__), ast.Constant(alternatives)],
+            keywords=[]
+        )
+        return ast.copy_location(call, node)
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+
+        if len(node.ops) != 1:
+            return node
+
+        alternatives = self._alternatives(node)
+        if alternatives is None:
+            return node
+
+        call = ast.Call(
+            func=_runtime_attr('compare'),
+            args=[node.left, node.comparators[0],
+                  ast.Constant(type(node.ops[0]).__name__), ast.Constant(alternatives)],
+            keywords=[]
+        )
+        return ast.copy_location(call, node)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+
+        alternatives = self._alternatives(node)
+        if alternatives is None:
+            return node
+
+        # Operands are duplicated rather than wrapped in lambdas so that
+        # short-circuit evaluation is preserved in every scope
+        switched = node
+        for mutant_id, mutated in alternatives:
+            mutated_node = copy.deepcopy(node)
+            mutated_node.op = ast.And() if mutated == 'And' else ast.Or()
+            test = ast.Compare(
+                left=_runtime_attr('ACTIVE_MUTANT'),
+                ops=[ast.Eq()],
+                comparators=[ast.Constant(mutant_id)]
+            )
+            switched = ast.copy_location(
+                ast.IfExp(test=test, body=mutated_node, orelse=switched), node
+            )
+        return switched
+
+
+def build_schemata(tree, points):
+    """
+    Rewrite a parsed module into a schemata module
+
+    Args:
+        tree: Parsed module (modified in place)
+        points: Mutation info dicts with 'id', as returned by
+                MutantGenerator.find_mutation_points()
+
+    Returns:
+        (tree, switched) - the rewritten module, ready for compile(), and the
+        set of mutant ids that can be activated at runtime
+    """
+    # Points are looked up by their node path; the transformer then only has
+    # to recognise the very node objects (tree is not copied in between)
+    switches = {}
+    for info in points:
+        node = node_at(tree, info['path'])
+        switches.setdefault(id(node), []).append((info['id'], info['mutated']))
+
+    transformer = SchemataTransformer(switches)
+    tree = ast.fix_missing_locations(transformer.visit(tree))
+    return tree, transformer.switched
@@ -6,13 +6,24 @@ import os
 import sys
 import json
 from pathlib import Path
-from mutest001 import MutantGenerator, MutationTestExecutor
-from report import generate_text_report, generate_html_report, generate_json_report
+from mutest001 import MutantGenerator, MutationTestExecutor, resolve_jobs, restore_backup
+from cache import PointIndexCache, ResultCache
+from project import ProjectRun, enumerate_sources, normalize_command
+from store import ResultStore
+from report import SurvivorStream, generate_text_report, generate_html_report, generate_json_report
 
 
 # Test configurations: loaded from test_config.json
 TEST_CONFIGS = {}
 
+# How the menu runs mutants: executor options by choice of get_run_mode()
+RUN_MODES = {
+    '1': {'jobs': 0, 'survivors_first': True, 'resume': True},
+    '2': {'jobs': 0, 'survivors_first': True, 'resume': False},
+    '3': {'jobs': None, 'survivors_first': False, 'resume': False},
+}
+DEFAULT_RUN_MODE = RUN_MODES['1']
+
 
 def load_saved_configs():
     """Load test configurations from JSON file"""
@@ -267,8 +278,33 @@ def get_report_format():
         print(f"Invalid choice. Please enter 1, 2, 3, or 4.")
 
 
-def run_mutation_test(source_file, test_command, test_name):
-    """Run mutation test for a single configuration"""
+def get_run_mode():
+    """Prompt user to select how mutants are run"""
+    print("\nRun Options:")
+    print("  [1] Standard   - Parallel, likely survivors first, resume an interrupted run (recommended)")
+    print("  [2] Fresh      - Parallel, likely survivors first, ignore interrupted runs")
+    print("  [3] Sequential - One mutant at a time in source order, ignore interrupted runs")
+
+    while True:
+        choice = input("\nSelect run option (1-3): ").strip()
+
+        if choice in RUN_MODES:
+            return RUN_MODES[choice]
+
+        print("Invalid choice. Please enter 1, 2, or 3.")
+
+
+def describe_run_mode(mode):
+    """One line saying how mutants are run"""
+    workers = resolve_jobs(mode['jobs']) if mode['jobs'] is not None else 1
+    parts = [f"{workers} parallel workers" if workers > 1 else "one mutant at a time",
+             "likely survivors first" if mode['survivors_first'] else "source order",
+             "resuming an interrupted run" if mode['resume'] else "starting over"]
+    return ', '.join(parts)
+
+
+def run_mutation_test(source_file, test_command, test_name, mode=DEFAULT_RUN_MODE):
+    """Run mutation test for a single configuration (mode: one of RUN_MODES)"""
     print("\n" + "=" * 70)
     print(f"Testing: {test_name}")
     print("=" * 70)
@@ -276,6 +312,9 @@ def run_mutation_test(source_file, test_command, test_name):
     print(f"Tests:  {test_command}")
     print()
 
+    # Undo a mutant left in the source file by an interrupted run
+    restore_backup(source_file)
+
     # Read source code
     try:
         with open(source_file, 'r') as f:
@@ -292,6 +331,9 @@ def run_mutation_test(source_file, test_command, test_name):
     generator = MutantGenerator()
     mutants = generator.generate_mutants(source_code)
     print(f"Generated {len(mutants)} mutants")
+    if generator.equivalent or generator.duplicates:
+        print(f"Skipped {len(generator.equivalent)} equivalent and "
+              f"{len(generator.duplicates)} duplicate mutants (identical bytecode)")
 
     if len(mutants) == 0:
         print("No mutations found. The source file may not have mutable operators.")
@@ -299,15 +341,40 @@ def run_mutation_test(source_file, test_command, test_name):
 
     # Run mutation tests
     print(f"\nRunning tests against {len(mutants)} mutants...")
+    print(f"Mode: {describe_run_mode(mode)}")
+    survivors = open_survivor_stream(f"{test_name.lower().replace(' ', '_')}_survivors.txt", test_command)
     print("-" * 70)
-    executor = MutationTestExecutor(source_file, test_command)
-    results = executor.run_mutation_tests(mutants)
+    store = ResultStore()
+    executor = MutationTestExecutor(source_file, test_command, jobs=mode['jobs'],
+                                    cache=ResultCache(source_file, test_command),
+                                    store=store, resume=mode['resume'],
+                                    survivors_first=mode['survivors_first'])
+    try:
+        results = executor.run_mutation_tests(mutants, on_result=survivors)
+    finally:
+        store.close()
 
     if not results:
         print("ERROR: Mutation testing failed!")
         return None
 
-    # Display summary
+    results['equivalent_count'] = len(generator.equivalent)
+    results['duplicate_count'] = len(generator.duplicates)
+
+    print_results_summary(results)
+    return results
+
+
+def open_survivor_stream(filename, test_command=None):
+    """Start the live report of surviving mutants in the reports directory"""
+    Path('reports').mkdir(exist_ok=True)
+    stream = SurvivorStream(os.path.join('reports', filename), test_command)
+    print(f"Survivors are written to {stream.output_file} as soon as they are confirmed")
+    return stream
+
+
+def print_results_summary(results):
+    """Print the summary of one configuration's results"""
     print("\n" + "=" * 70)
     print("RESULTS SUMMARY")
     print("=" * 70)
@@ -315,7 +382,9 @@ def run_mutation_test(source_file, test_command, test_name):
     print(f"Killed:           {results['killed_count']} (GOOD - tests caught these)")
     print(f"Survived:         {results['survived_count']} (BAD - tests missed these)")
     print(f"Timeout:          {results['timeout_count']}")
+    print(f"No Coverage:      {results['no_coverage_count']} (BAD - no test runs this code)")
     print(f"\nMutation Score:   {results['mutation_score']:.2f}%")
+    print(f"Covered Score:    {results['covered_mutation_score']:.2f}%")
 
     if results['mutation_score'] >= 97:
         print("Status:           EXCELLENT test coverage!")
@@ -328,7 +397,104 @@ def run_mutation_test(source_file, test_command, test_name):
 
     print("=" * 70)
 
-    return results
+
+def plan_jobs(configs):
+    """
+    Plan a run of several configurations as one job per distinct pair of
+    source file and test command
+
+    Args:
+        configs: Test configurations by key, as in TEST_CONFIGS
+
+    Returns:
+        List of job dicts with 'source', 'test_cmd' and the 'keys' of the
+        configurations the job's results are reported for
+    """
+    jobs = {}
+    for key, config in configs.items():
+        pair = (os.path.normpath(config['source']), normalize_command(config['test_cmd']))
+        if pair not in jobs:
+            jobs[pair] = {'source': pair[0], 'test_cmd': config['test_cmd'], 'keys': []}
+        jobs[pair]['keys'].append(key)
+    return list(jobs.values())
+
+
+def run_all_tests(report_format, mode=DEFAULT_RUN_MODE):
+    """
+    Run every configuration as one job graph (mode: one of RUN_MODES)
+
+    Identical (source, test command) pairs run once, each test command's
+    baseline runs once for all the sources it tests, and the mutants of
+    every job share one pool of workers. Each configuration still gets its
+    own summary and reports.
+
+    Returns:
+        List of {'name', 'results', 'source', 'test_cmd'} dicts of the
+        configurations that produced results
+    """
+    jobs = plan_jobs(TEST_CONFIGS)
+    for job in jobs:
+        if len(job['keys']) > 1:
+            names = ', '.join(f"[{key}] {TEST_CONFIGS[key]['name']}" for key in job['keys'])
+            print(f"Same source and tests, run once: {names}")
+
+    runnable = []
+    for job in jobs:
+        if os.path.exists(job['source']):
+            runnable.append(job)
+        else:
+            print(f"ERROR: Could not find source file: {job['source']}")
+    if not runnable:
+        return []
+
+    commands = {normalize_command(job['test_cmd']) for job in runnable}
+    print(f"Planned {len(runnable)} jobs for {len(TEST_CONFIGS)} tests "
+          f"({len(commands)} baseline runs)")
+    print(f"Mode: {describe_run_mode(mode)}\n")
+
+    store = ResultStore()
+    for job in runnable:
+        job['executor'] = MutationTestExecutor(
+            job['source'], job['test_cmd'], jobs=mode['jobs'],
+            cache=ResultCache(job['source'], job['test_cmd']),
+            store=store, resume=mode['resume'], survivors_first=mode['survivors_first'])
+
+    sources = sorted({job['source'] for job in runnable})
+    survivors = open_survivor_stream('all_survivors.txt')
+    project_run = ProjectRun([job['executor'] for job in runnable],
+                             enumerate_sources(sources, index_cache=PointIndexCache()),
+                             on_result=survivors)
+    try:
+        project_run.run()
+    finally:
+        store.close()
+
+    all_results = []
+    for job in runnable:
+        results = project_run.summaries.get(job['executor'])
+        for key in job['keys']:
+            config = TEST_CONFIGS[key]
+            print("\n" + "=" * 70)
+            print(f"Testing: {config['name']}")
+            print("=" * 70)
+            print(f"Source: {config['source']}")
+            print(f"Tests:  {config['test_cmd']}")
+            if not results:
+                print("No results: the original tests failed or the source has no mutable operators.")
+                continue
+
+            results.update(project_run.file_counts.get(job['source'], {}))
+            print_results_summary(results)
+            all_results.append({
+                'name': config['name'],
+                'results': results,
+                'source': config['source'],
+                'test_cmd': config['test_cmd']
+            })
+            generate_reports(results, report_format, config['source'],
+                             config['test_cmd'], config['name'])
+
+    return all_results
 
 
 def generate_reports(results, report_format, source_file, test_command, test_name):
@@ -376,8 +542,9 @@ def run_tests_menu():
     if test_choice == 'back':
         return
 
-    # Get report format
+    # Get report format and run options
     report_format = get_report_format()
+    mode = get_run_mode()
 
     print("\n" + "=" * 70)
     print("Starting Mutation Testing...")
@@ -386,31 +553,7 @@ def run_tests_menu():
     # Run selected test(s)
     if test_choice == 'all':
         print(f"\nRunning ALL {len(TEST_CONFIGS)} tests...\n")
-        all_results = []
-
-        for key, config in TEST_CONFIGS.items():
-            results = run_mutation_test(
-                config['source'],
-                config['test_cmd'],
-                config['name']
-            )
-
-            if results:
-                all_results.append({
-                    'name': config['name'],
-                    'results': results,
-                    'source': config['source'],
-                    'test_cmd': config['test_cmd']
-                })
-                generate_reports(
-                    results,
-                    report_format,
-                    config['source'],
-                    config['test_cmd'],
-                    config['name']
-                )
-
-            print("\n")
+        all_results = run_all_tests(report_format, mode)
 
         # Print overall summary
         print("\n" + "=" * 70)
@@ -428,7 +571,8 @@ def run_tests_menu():
         results = run_mutation_test(
             config['source'],
             config['test_cmd'],
-            config['name']
+            config['name'],
+            mode
         )
 
         if results:
@@ -465,8 +609,9 @@ def main():
             # Ask if user wants to run the new test now
             run_now = input("Would you like to run this test now? (y/n): ").strip().lower()
             if run_now == 'y':
-                # Get report format
+                # Get report format and run options
                 report_format = get_report_format()
+                mode = get_run_mode()
 
                 print("\n" + "=" * 70)
                 print("Starting Mutation Testing...")
@@ -477,7 +622,8 @@ def main():
                 results = run_mutation_test(
                     config['source'],
                     config['test_cmd'],
-                    config['name']
+                    config['name'],
+                    mode
                 )
 
                 if results:
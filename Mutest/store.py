@@ -0,0 +1,186 @@
+"""
+Crash-safe results store for Mutest.
+
+Every verdict is committed to a local SQLite database as soon as its mutant
+finishes, so an interrupted run (Ctrl-C, OOM kill, CI preemption) loses at
+most the mutants that were being tested at that moment. A later run of the
+same source, tests and mutants can resume from where it stopped.
+
+A run is identified by a fingerprint of the source code, the test command
+and the list of mutation points; resuming only ever picks up an unfinished
+run with the same fingerprint. Earlier runs also serve as history for
+predicting which mutants will survive (see priority.py).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+
+DEFAULT_DB_PATH = os.path.join('.mutest_cache', 'runs.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fingerprint TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    test_command TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_fingerprint ON runs (fingerprint, finished_at);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    mutant_number INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (run_id, mutant_number)
+);
+"""
+
+
+def run_fingerprint(source_code, test_command, mutants):
+    """Identify a run by its source, test command and mutation points"""
+    points = [
+        (m['info']['type'], m['info']['original'], m['info']['mutated'],
+         m['info']['line'], m['info']['col'], m['info'].get('op_index', 0))
+        for m in mutants
+    ]
+    data = json.dumps([source_code, test_command, points])
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ResultStore:
+    """SQLite database of mutation runs and the verdicts recorded so far"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        """
+        Args:
+            path: Database file (created on first use)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Verdicts arrive from worker threads; every access holds the lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def open_run(self, source_file_path, test_command, mutants, resume=False):
+        """
+        Start a run, or pick up the last unfinished run of the same mutants
+
+        Returns:
+            (run_id, completed) - completed maps mutant numbers to the
+            result dicts already recorded (empty for a new run)
+        """
+        with open(source_file_path, 'r') as f:
+            fingerprint = run_fingerprint(f.read(), test_command, mutants)
+
+        with self._lock:
+            if resume:
+                row = self.connection.execute(
+                    'SELECT id FROM runs WHERE fingerprint = ? AND finished_at IS NULL '
+                    'ORDER BY id DESC LIMIT 1',
+                    (fingerprint,)
+                ).fetchone()
+                if row is not None:
+                    rows = self.connection.execute(
+                        'SELECT mutant_number, result FROM results WHERE run_id = ?', (row[0],)
+                    ).fetchall()
+                    return row[0], {number: json.loads(result) for number, result in rows}
+
+            cursor = self.connection.execute(
+                'INSERT INTO runs (fingerprint, source_file, test_command, total, started_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (fingerprint, os.path.abspath(source_file_path), test_command,
+                 len(mutants), datetime.now().isoformat())
+            )
+            self.connection.commit()
+            return cursor.lastrowid, {}
+
+    def record(self, run_id, result):
+        """Commit the verdict of one mutant"""
+        with self._lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO results (run_id, mutant_number, status, result) '
+                'VALUES (?, ?, ?, ?)',
+                (run_id, result['mutant_number'], result['status'], json.dumps(result))
+            )
+            self.connection.commit()
+
+    def finish(self, run_id):
+        """Mark a run as complete, so it is never resumed"""
+        with self._lock:
+            self.connection.execute(
+                'UPDATE runs SET finished_at = ? WHERE id = ?',
+                (datetime.now().isoformat(), run_id)
+            )
+            self.connection.commit()
+
+    def previous_results(self, source_file_path, test_command, current_run=None):
+        """
+        Verdicts of the previous run of a source file and test command
+
+        The run does not have to be finished or to have the same mutants,
+        but it must have recorded at least one verdict.
+
+        Args:
+            current_run: Id of the run in progress, which is skipped
+
+        Returns:
+            List of result dicts (empty if there is no earlier run)
+        """
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT id FROM runs WHERE source_file = ? AND test_command = ? AND id != ? '
+                'AND EXISTS (SELECT 1 FROM results WHERE run_id = runs.id) '
+                'ORDER BY id DESC LIMIT 1',
+                (os.path.abspath(source_file_path), test_command, current_run or 0)
+            ).fetchone()
+            if row is None:
+                return []
+            rows = self.connection.execute(
+                'SELECT result FROM results WHERE run_id = ?', (row[0],)
+            ).fetchall()
+        return [json.loads(result) for result, in rows]
+
+    def operator_history(self, runs=50):
+        """
+        How often mutants of each operator change escaped the tests
+
+        Args:
+            runs: Number of most recent runs (of any source file) to look at
+
+        Returns:
+            dict of (original, mutated) -> (not killed, tested)
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT status, result FROM results WHERE run_id IN '
+                '(SELECT id FROM runs ORDER BY id DESC LIMIT ?)',
+                (runs,)
+            ).fetchall()
+
+        history = {}
+        for status, result in rows:
+            if status == 'timeout':
+                continue
+            info = json.loads(result).get('mutation_info') or {}
+            key = (info.get('original'), info.get('mutated'))
+            escaped, tested = history.get(key, (0, 0))
+            history[key] = (escaped + (status != 'killed'), tested + 1)
+        return history
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,86 @@
+# file: tests/test_cache.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from cache import ResultCache
+from coverage_map import CoverageMap
+from mutest001 import MutantGenerator, MutationTestExecutor
+
+
+SOURCE = 'def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n'
+COMMAND = 'pytest tests -q'
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / 'calc.py').write_text(SOURCE)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def make_cache():
+    return ResultCache('calc.py', COMMAND, cache_dir='.mutest_cache', tests_hash='tests')
+
+
+def make_executor(**options):
+    return MutationTestExecutor('calc.py', COMMAND, cache=make_cache(), **options)
+
+
+def cached_statuses(executor, mutants):
+    _, cached = executor._split_cached(list(enumerate(mutants, 1)))
+    return {result['mutant_number']: result['status'] for result in cached}
+
+
+def test_verdict_round_trip(project):
+    mutant = MutantGenerator().generate_mutants(SOURCE)[0]
+    cache = make_cache()
+    cache.put(mutant['info'], {'status': 'killed', 'return_code': 1, 'killing_tests': ['t']})
+    assert make_cache().get(mutant['info']) == {'status': 'killed', 'return_code': 1, 'killing_tests': ['t']}
+
+
+def test_edit_in_other_function_keeps_key(project):
+    mutant = next(m for m in MutantGenerator().generate_mutants(SOURCE) if m['info']['function'] == 'add')
+    key = make_cache().key(mutant['info'])
+    (project / 'calc.py').write_text(SOURCE.replace('a - b', 'b - a'))
+    assert make_cache().key(mutant['info']) == key
+    (project / 'calc.py').write_text(SOURCE.replace('a + b', 'a + b + 0'))
+    assert make_cache().key(mutant['info']) != key
+
+
+def test_timeouts_are_not_cached(project):
+    mutant = MutantGenerator().generate_mutants(SOURCE)[0]
+    make_cache().put(mutant['info'], {'status': 'timeout'})
+    assert make_cache().get(mutant['info']) is None
+
+
+def test_no_coverage_is_only_reused_with_coverage(project):
+    mutants = MutantGenerator().generate_mutants(SOURCE)[:1]
+    make_cache().put(mutants[0]['info'], {'status': 'no_coverage'})
+
+    assert cached_statuses(make_executor(reachability=False), mutants) == {}
+    executor = make_executor()
+    executor.coverage = CoverageMap({})
+    assert cached_statuses(executor, mutants) == {1: 'no_coverage'}
+
+
+def test_survivor_of_selected_tests_needs_unconfirmed_selection(project):
+    mutants = MutantGenerator().generate_mutants(SOURCE)[:2]
+    cache = make_cache()
+    cache.put(mutants[0]['info'], {'status': 'survived', 'return_code': 0, 'selected_tests': 1})
+    cache.put(mutants[1]['info'], {'status': 'survived', 'return_code': 0, 'selected_tests': 1,
+                                   'confirmed': True})
+
+    assert cached_statuses(make_executor(), mutants) == {2: 'survived'}
+    assert cached_statuses(make_executor(test_selection=True, confirm_survivors=True), mutants) == {2: 'survived'}
+    assert cached_statuses(make_executor(test_selection=True), mutants) == {1: 'survived', 2: 'survived'}
+
+
+def test_kill_matrix_needs_killing_tests(project):
+    mutants = MutantGenerator().generate_mutants(SOURCE)[:2]
+    cache = make_cache()
+    cache.put(mutants[0]['info'], {'status': 'killed', 'return_code': 1})
+    cache.put(mutants[1]['info'], {'status': 'killed', 'return_code': 1, 'killing_tests': ['t']})
+
+    assert cached_statuses(make_executor(kill_matrix=True), mutants) == {2: 'killed'}
+    assert cached_statuses(make_executor(), mutants) == {1: 'killed', 2: 'killed'}
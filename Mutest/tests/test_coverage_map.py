@@ -0,0 +1,66 @@
+# file: tests/test_coverage_map.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from coverage_map import CoverageMap
+from mutest001 import MutantGenerator, MutationTestExecutor
+
+
+SOURCE = 'def double(x):\n    return x * 2\n'
+
+
+def test_tests_for_lines():
+    coverage = CoverageMap({'test_a': [1, 2], 'test_b': [1]}, global_lines=[5])
+    assert coverage.tests_for({'line': 2}) == ['test_a']
+    assert coverage.tests_for({'line': 3}) == []
+    assert coverage.tests_for({'line': 1, 'end_line': 2}) == ['test_a', 'test_b']
+    assert coverage.tests_for({'line': 5}) is None
+
+
+def test_is_empty():
+    assert CoverageMap({}).is_empty()
+    assert CoverageMap({'test_a': []}).is_empty()
+    assert not CoverageMap({}, global_lines=[1]).is_empty()
+    assert not CoverageMap({'test_a': [2]}).is_empty()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / 'double.py').write_text(SOURCE)
+    (tmp_path / 'tests').mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('PYTHONPATH', raising=False)
+    return tmp_path
+
+
+def test_code_tested_in_a_subprocess_is_not_reported_as_no_coverage(project, capsys):
+    (project / 'tests' / 'test_double.py').write_text(
+        'import subprocess\n'
+        'import sys\n'
+        '\n\n'
+        'def test_double():\n'
+        '    output = subprocess.check_output([sys.executable, "-c", "import double; print(double.double(2))"])\n'
+        '    assert output.strip() == b"4"\n'
+    )
+    executor = MutationTestExecutor('double.py', f'{sys.executable} -m pytest -q tests', jobs=None)
+    assert executor.run_original_tests()
+    assert executor.coverage is None
+    assert 'No test executed double.py' in capsys.readouterr().out
+
+    mutant = MutantGenerator().generate_mutants(SOURCE)[0]
+    assert executor._test_mutant(('memory', None), mutant, 1)['status'] != 'no_coverage'
+
+
+def test_code_tested_in_process_keeps_its_coverage(project):
+    (project / 'tests' / 'test_double.py').write_text(
+        'import sys\n'
+        'sys.path.insert(0, ".")\n'
+        'from double import double\n'
+        '\n\n'
+        'def test_double():\n'
+        '    assert double(2) == 4\n'
+    )
+    executor = MutationTestExecutor('double.py', f'{sys.executable} -m pytest -q tests', jobs=None)
+    assert executor.run_original_tests()
+    assert executor.coverage.tests_for({'line': 2}) == ['tests/test_double.py::test_double']
@@ -0,0 +1,76 @@
+# file: tests/test_gitdiff.py
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from gitdiff import GitDiffError, changed_lines, parse_diff, touches_lines
+
+
+DIFF = '''\
+diff --git a/calc.py b/calc.py
+index 1111111..2222222 100644
+--- a/calc.py
++++ b/calc.py
+@@ -2 +2 @@ def add(a, b):
+-    return a + b
++    return a + b + 0
+@@ -10,0 +11,3 @@ def sub(a, b):
++def mul(a, b):
++    return a * b
++
+@@ -20,2 +23,0 @@ def div(a, b):
+-    # unused
+-    pass
+'''
+
+
+def test_parse_diff_changed_and_added_lines():
+    assert parse_diff(DIFF) == {2, 11, 12, 13, 23, 24}
+
+
+def test_parse_diff_deletion_marks_both_neighbours():
+    assert parse_diff('@@ -5,3 +4,0 @@\n-a\n-b\n-c\n') == {4, 5}
+
+
+def test_parse_diff_ignores_lines_that_look_like_hunks():
+    assert parse_diff('+@@ -1 +1 @@ not a header\n') == set()
+    assert parse_diff('') == set()
+
+
+def test_touches_lines_uses_the_whole_span():
+    assert touches_lines({'line': 3, 'end_line': 5}, {5})
+    assert touches_lines({'line': 3}, {3})
+    assert not touches_lines({'line': 3, 'end_line': 5}, {2, 6})
+
+
+def git(*args, cwd):
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    if shutil.which('git') is None:
+        pytest.skip('git is not installed')
+    (tmp_path / 'calc.py').write_text('def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n')
+    git('init', '-q', cwd=tmp_path)
+    git('add', 'calc.py', cwd=tmp_path)
+    git('commit', '-q', '-m', 'calc', cwd=tmp_path)
+    return tmp_path
+
+
+def test_changed_lines_include_uncommitted_edits(repo):
+    (repo / 'calc.py').write_text('def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return b - a\n')
+    assert changed_lines(str(repo / 'calc.py'), 'HEAD') == {6}
+
+
+def test_untracked_file_is_changed_everywhere(repo):
+    (repo / 'new.py').write_text('x = 1\ny = 2\n')
+    assert changed_lines(str(repo / 'new.py'), 'HEAD') == {1, 2}
+
+
+def test_unknown_ref_raises(repo):
+    with pytest.raises(GitDiffError, match="unknown git ref 'nope'"):
+        changed_lines(str(repo / 'calc.py'), 'nope')
@@ -0,0 +1,70 @@
+# file: tests/test_killhistory.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from killhistory import KillHistory
+
+
+def point(line, function='add'):
+    return {'line': line, 'function': function}
+
+
+def make_history(path=None):
+    history = KillHistory(path)
+    history.record(point(2), ['test_line'])
+    history.record(point(3), ['test_function'])
+    history.record(point(3), ['test_function'])
+    history.record(point(9, 'sub'), ['test_file', 'test_function'])
+    history.record(point(9, 'sub'), ['test_file'])
+    history.record(point(9, 'sub'), ['test_file'])
+    return history
+
+
+def test_same_line_before_same_function_before_same_file():
+    assert make_history().order(point(2)) == ['test_line', 'test_function', 'test_file']
+    assert make_history().order(point(4)) == ['test_function', 'test_line', 'test_file']
+    assert make_history().order(point(20, 'mul')) == ['test_file', 'test_function', 'test_line']
+
+
+def test_tests_not_reaching_the_mutant_are_dropped():
+    order = make_history().order(point(2), reaching=['test_file', 'test_new'])
+    assert order == ['test_file', 'test_new']
+
+
+def test_faster_test_wins_a_tie():
+    history = KillHistory()
+    history.record(point(2), ['test_a_slow', 'test_b_fast'])
+    durations = {'test_a_slow': 2.0, 'test_b_fast': 0.1}
+    assert history.order(point(2), durations=durations) == ['test_b_fast', 'test_a_slow']
+    # Without durations the node id breaks the tie
+    assert history.order(point(2)) == ['test_a_slow', 'test_b_fast']
+
+
+def test_empty_history_orders_reaching_tests_by_duration():
+    order = KillHistory().order(point(2), reaching=['test_b', 'test_a', 'test_c'],
+                                durations={'test_a': 1.0, 'test_b': 0.5})
+    assert order == ['test_c', 'test_b', 'test_a']
+    assert KillHistory().order(point(2)) == []
+
+
+def test_saved_history_loads_with_the_same_order(tmp_path):
+    path = str(tmp_path / 'kills' / 'calc.json')
+    history = make_history(path)
+    history.save()
+
+    loaded = KillHistory.load(path)
+    assert loaded.lines == history.lines
+    assert loaded.order(point(2)) == history.order(point(2))
+    assert loaded.order(point(4)) == history.order(point(4))
+
+
+def test_missing_or_corrupt_history_loads_empty(tmp_path):
+    assert KillHistory.load(str(tmp_path / 'none.json')).tests == {}
+    (tmp_path / 'bad.json').write_text('{"lines": [')
+    assert KillHistory.load(str(tmp_path / 'bad.json')).tests == {}
+
+
+def test_memory_only_history_is_not_saved(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_history().save()
+    assert list(tmp_path.iterdir()) == []
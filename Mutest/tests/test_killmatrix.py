@@ -0,0 +1,134 @@
+# file: tests/test_killmatrix.py
+import json
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from click.testing import CliRunner
+from cli import cli
+from killmatrix import KillMatrix, keyword_selection, minimize_tests
+
+
+RESULTS = [
+    {'mutant_number': 1, 'status': 'killed', 'killing_tests': ['test_add', 'test_total']},
+    {'mutant_number': 2, 'status': 'killed', 'killing_tests': ['test_discount']},
+    {'mutant_number': 3, 'status': 'survived', 'killing_tests': []},
+    {'mutant_number': 4, 'status': 'killed', 'killing_tests': ['test_total', 'test_discount']},
+    {'mutant_number': 5, 'status': 'killed', 'killing_tests': ['test_edge']},
+]
+
+DURATIONS = {'test_add': 0.1, 'test_discount': 0.2, 'test_total': 2.0, 'test_edge': 0.1, 'test_noop': 0.05}
+
+
+def test_rows_are_bitsets_of_killed_columns():
+    matrix = KillMatrix.from_results(RESULTS, DURATIONS)
+    assert matrix.mutants == [1, 2, 3, 4, 5]
+    assert matrix.killed_by('test_total') == 0b01001
+    assert matrix.killed_by('test_discount') == 0b01010
+    assert matrix.killed_by('test_noop') == 0
+    assert matrix.killers(4) == ['test_discount', 'test_total']
+    assert matrix.killers(3) == []
+    assert matrix.mutants_in(matrix.killed()) == [1, 2, 4, 5]
+    assert matrix.kill_counts()['test_total'] == 2
+
+
+def test_json_round_trip_keeps_every_kill():
+    matrix = KillMatrix.from_results(RESULTS, DURATIONS)
+    loaded = KillMatrix.from_dict(json.loads(json.dumps(matrix.to_dict())))
+    assert loaded.tests == matrix.tests
+    assert loaded.mutants == matrix.mutants
+    assert loaded.rows == matrix.rows
+    assert loaded.durations == matrix.durations
+    for mutant in matrix.mutants:
+        assert loaded.killers(mutant) == matrix.killers(mutant)
+
+
+def test_round_trip_of_multi_file_keys():
+    results = [{'source_file': 'a.py', 'mutant_number': 1, 'killing_tests': ['test_a']},
+               {'source_file': 'b.py', 'mutant_number': 1, 'killing_tests': ['test_b']}]
+    matrix = KillMatrix.from_results(results)
+    loaded = KillMatrix.from_dict(json.loads(json.dumps(matrix.to_dict())))
+    assert loaded.mutants == [('a.py', 1), ('b.py', 1)]
+    assert loaded.killers(('b.py', 1)) == ['test_b']
+
+
+def test_wide_rows_survive_hex_encoding():
+    matrix = KillMatrix()
+    for mutant in range(200):
+        matrix.record(mutant, ['test_even'] if mutant % 2 == 0 else [])
+    loaded = KillMatrix.from_dict(matrix.to_dict())
+    assert loaded.mutants_in(loaded.killed_by('test_even')) == list(range(0, 200, 2))
+
+
+def test_minimized_tests_keep_every_kill():
+    matrix = KillMatrix.from_dict(KillMatrix.from_results(RESULTS, DURATIONS).to_dict())
+    selected = minimize_tests(matrix)
+    assert matrix.killed(selected) == matrix.killed()
+    # The slow test only kills mutants that faster tests also kill
+    assert sorted(selected) == ['test_add', 'test_discount', 'test_edge']
+
+
+def test_minimize_drops_tests_made_redundant_by_later_picks():
+    matrix = KillMatrix(durations={'test_wide': 1.0, 'test_a': 0.1, 'test_b': 0.1})
+    matrix.record(1, ['test_wide', 'test_a'])
+    matrix.record(2, ['test_wide', 'test_b'])
+    matrix.record(3, ['test_wide'])
+    selected = minimize_tests(matrix)
+    assert selected == ['test_wide']
+
+
+def test_minimize_without_kills_selects_nothing():
+    matrix = KillMatrix.from_results([{'mutant_number': 1, 'killing_tests': []}], {'test_a': 0.1})
+    assert minimize_tests(matrix) == []
+
+
+def test_keyword_selection_reports_substring_and_same_name_matches():
+    tests = ['tests/test_calc.py::test_add', 'tests/test_calc.py::test_add_negative',
+             'tests/test_calc.py::TestCart::test_total', 'tests/test_shop.py::TestOrder::test_total',
+             'tests/test_calc.py::test_discount[10]', 'tests/test_calc.py::test_discount[20]',
+             'tests/test_calc.py::test_edge']
+    kept = ['tests/test_calc.py::test_add', 'tests/test_calc.py::TestCart::test_total',
+            'tests/test_calc.py::test_discount[10]']
+    expression, extra = keyword_selection(tests, kept)
+    assert expression == 'test_add or test_discount or test_total'
+    assert extra == ['tests/test_calc.py::test_add_negative', 'tests/test_shop.py::TestOrder::test_total',
+                     'tests/test_calc.py::test_discount[20]']
+
+
+def test_keyword_selection_without_collisions_is_exact():
+    tests = ['tests/test_calc.py::test_add', 'tests/test_calc.py::test_edge']
+    assert keyword_selection(tests, tests[:1]) == ('test_add', [])
+
+
+def write_report(tmp_path, results, durations):
+    report = tmp_path / 'report.json'
+    report.write_text(json.dumps({'kill_matrix': KillMatrix.from_results(results, durations).to_dict()}))
+    return str(report)
+
+
+def test_minimize_command_writes_node_ids(tmp_path):
+    report = write_report(tmp_path, RESULTS, DURATIONS)
+    output = tmp_path / 'fast_tests.txt'
+    result = CliRunner().invoke(cli, ['minimize', report, '-o', str(output)])
+    assert result.exit_code == 0, result.output
+    assert sorted(output.read_text().split()) == ['test_add', 'test_discount', 'test_edge']
+
+
+def test_minimize_command_without_kills_selects_nothing(tmp_path):
+    report = write_report(tmp_path, [{'mutant_number': 1, 'killing_tests': []}], {'test_a': 0.1})
+    output = tmp_path / 'fast_tests.txt'
+    for args in (['-o', str(output)], ['-f', 'k']):
+        result = CliRunner().invoke(cli, ['minimize', report] + args)
+        assert result.exit_code == 0, result.output
+        assert 'nothing to select' in result.output
+        assert '-k' not in result.output
+    assert not output.exists()
+
+
+def test_minimize_command_warns_when_k_selects_more(tmp_path):
+    results = [{'mutant_number': 1, 'killing_tests': ['t.py::test_add']},
+               {'mutant_number': 2, 'killing_tests': ['t.py::test_add', 't.py::test_add_negative']}]
+    report = write_report(tmp_path, results, {'t.py::test_add': 0.1, 't.py::test_add_negative': 0.1})
+    result = CliRunner().invoke(cli, ['minimize', report, '-f', 'k'])
+    assert result.exit_code == 0, result.output
+    assert 'also selects 1 other test (e.g. t.py::test_add_negative)' in result.output
+    assert 'pytest -k "test_add"' in result.output
@@ -0,0 +1,89 @@
+# file: tests/test_patching.py
+import ast
+import copy
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from mutest001 import MutantGenerator
+from patching import SourcePatcher
+from points import mutation_applied
+
+
+SOURCES = [
+    # Operands right next to the operator
+    'x = a+b-c\n',
+    'x = 2.0+rc-bc\n',
+    'y = l+s-(l*s)\n',
+    'z = size+nrows-1\n',
+    # Non-ASCII text before the operator on the same line
+    'x = "é"+s+"ü"\n',
+    'def f(s):\n    return "ünïcode" + s * 2 - len("é")\n',
+    # Nested binary operators and precedence changes
+    'x = a + b * c - d / e\n',
+    'x = (a - b) * (c + d) ** 2\n',
+    'x = a * b + c * d\n',
+    # Comparisons and boolean operators
+    'ok = 0 < x <= 10 and y != z or w\n',
+    'if a > b and (c or d):\n    pass\n',
+    '@decorate(a + b)\ndef f(x):\n    return x if x > 0 else -x + 1\n',
+]
+
+
+def mutated_dump(source_code, info):
+    tree = copy.deepcopy(ast.parse(source_code))
+    with mutation_applied(tree, info) as tree:
+        return ast.dump(tree)
+
+
+def points_of(source_code):
+    _, points = MutantGenerator().find_mutation_points(source_code)
+    return points
+
+
+@pytest.mark.parametrize('source_code', SOURCES)
+def test_patch_reparses_to_mutated_tree(source_code):
+    patcher = SourcePatcher(source_code)
+    points = points_of(source_code)
+    assert points
+    for info in points:
+        code = patcher.patch(info)
+        assert code is not None
+        assert ast.dump(ast.parse(code)) == mutated_dump(source_code, info)
+        assert patcher.parses_to_mutant(code, info)
+
+
+def test_closing_parenthesis_goes_before_adjacent_operator():
+    source_code = 'x = a+b-c\n'
+    info = next(p for p in points_of(source_code) if p['original'] == 'Sub' and p['mutated'] == 'Mult')
+    assert SourcePatcher(source_code).patch(info) == 'x = (a+b)*c\n'
+
+
+def test_non_ascii_line_patches_at_the_right_column():
+    source_code = 'x = "é"+s+"ü"\n'
+    patcher = SourcePatcher(source_code)
+    outer = [p for p in points_of(source_code) if p['mutated'] == 'Mult' and p['path'] == 'body[0].value']
+    assert patcher.patch(outer[0]) == 'x = ("é"+s)*"ü"\n'
+
+
+def test_patch_keeps_formatting_and_comments():
+    source_code = 'total = price * (1 + rate)  # with tax\n'
+    info = next(p for p in points_of(source_code) if p['original'] == 'Add' and p['mutated'] == 'Sub')
+    assert SourcePatcher(source_code).patch(info) == 'total = price * (1 - rate)  # with tax\n'
+
+
+def test_text_that_does_not_parse_to_the_mutant_is_rejected():
+    source_code = 'x = a+b-c\n'
+    patcher = SourcePatcher(source_code)
+    info = next(p for p in points_of(source_code) if p['original'] == 'Sub' and p['mutated'] == 'Mult')
+    assert not patcher.parses_to_mutant('x = (a+b*)-c\n', info)
+    assert not patcher.parses_to_mutant('x = a+b*c\n', info)
+    assert not patcher.parses_to_mutant('x = a+b-c\n', info)
+
+
+def test_render_falls_back_to_unparse(monkeypatch):
+    source_code = 'x = a+b-c\n'
+    patcher = SourcePatcher(source_code)
+    info = next(p for p in points_of(source_code) if p['original'] == 'Sub' and p['mutated'] == 'Mult')
+    monkeypatch.setattr(patcher, 'patch', lambda mutation_info: 'x = (a+b*)-c\n')
+    assert ast.dump(ast.parse(patcher.render(info))) == mutated_dump(source_code, info)
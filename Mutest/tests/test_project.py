@@ -0,0 +1,62 @@
+# file: tests/test_project.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from project import discover_sources
+
+
+FILES = [
+    'src/calc.py',
+    'src/conftest.py',
+    'src/test_calc.py',
+    'src/calc_test.py',
+    'src/notes.txt',
+    'src/pkg/__init__.py',
+    'src/pkg/shapes.py',
+    'src/pkg/generated/schema.py',
+    'src/.venv/lib/site.py',
+    'src/__pycache__/calc.py',
+    'tests/test_shapes.py',
+    'setup.py',
+]
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    for name in FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_directory_is_searched_recursively(tree):
+    assert discover_sources(['src']) == ['src/calc.py', 'src/pkg/__init__.py', 'src/pkg/generated/schema.py',
+                                         'src/pkg/shapes.py']
+
+
+def test_include_and_exclude_patterns(tree):
+    assert discover_sources(['src'], include=['shapes.py', 'calc.py']) == ['src/calc.py', 'src/pkg/shapes.py']
+    assert discover_sources(['src'], exclude=['__init__.py', 'src/pkg/generated']) == ['src/calc.py',
+                                                                                      'src/pkg/shapes.py']
+
+
+def test_glob_patterns_skip_test_files(tree):
+    assert discover_sources(['src/*.py']) == ['src/calc.py']
+    assert discover_sources(['**/shapes.py', 'tests/*.py']) == ['src/pkg/shapes.py']
+
+
+def test_files_named_explicitly_are_always_kept(tree):
+    assert discover_sources(['src/test_calc.py', 'src/notes.txt'], exclude=['*.txt']) == [
+        'src/notes.txt', 'src/test_calc.py']
+
+
+def test_targets_are_merged_without_duplicates(tree):
+    assert discover_sources(['src/pkg', 'src/pkg/shapes.py', 'src/**/shapes.py', 'setup.py']) == [
+        'setup.py', 'src/pkg/__init__.py', 'src/pkg/generated/schema.py', 'src/pkg/shapes.py']
+
+
+def test_missing_target_yields_nothing(tree):
+    assert discover_sources(['nowhere', 'src/*.pyx']) == []
@@ -0,0 +1,81 @@
+# file: tests/test_runtime.py
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from forkserver import ForkServer, fork_supported
+from mutest001 import MutantGenerator, MutationTestExecutor
+from runtime.mutest_runtime import encode_payload
+
+
+# Project modules named like Mutest's own
+PROJECT = {
+    'sampling.py': 'def mean(values):\n    return sum(values) / len(values)\n',
+    'points.py': 'ORIGIN = (0, 0)\n',
+    'tests/test_project.py': (
+        'from sampling import mean\n'
+        'from points import ORIGIN\n'
+        '\n\n'
+        'def test_mean():\n'
+        '    assert mean([1, 2, 3]) == 2\n'
+        '\n\n'
+        'def test_origin():\n'
+        '    assert ORIGIN == (0, 0)\n'
+    ),
+}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    for name, code in PROJECT.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(code)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PYTHONPATH', str(tmp_path))
+    return tmp_path
+
+
+def run_plugin(executor, **env):
+    # The pytest script, unlike `python -m pytest`, does not put the project ahead of PYTHONPATH
+    pytest_script = shutil.which('pytest')
+    if pytest_script is None:
+        pytest.skip('pytest script not found')
+    command = [pytest_script, '-q', '-p', 'mutest_runtime', '-p', 'no:cacheprovider', 'tests']
+    return subprocess.run(command, capture_output=True, text=True, env=dict(executor._runtime_env(), **env))
+
+
+def test_runtime_does_not_shadow_project_modules(project):
+    executor = MutationTestExecutor('sampling.py', 'pytest -q tests')
+    result = run_plugin(executor)
+    assert result.returncode == 0, result.stdout
+
+
+def test_schemata_loads_without_shadowing_project_modules(project):
+    _, points = MutantGenerator().find_mutation_points(PROJECT['sampling.py'])
+    mutant = next(p for p in points if p['mutated'] == 'Mult')
+    executor = MutationTestExecutor('sampling.py', 'pytest -q tests')
+
+    original = run_plugin(executor, MUTEST_PAYLOAD=encode_payload({'schemata': 'sampling.py', 'active': 0}))
+    assert original.returncode == 0, original.stdout
+
+    mutated = run_plugin(executor, MUTEST_PAYLOAD=encode_payload({'schemata': 'sampling.py', 'active': mutant['id']}))
+    assert mutated.returncode == 1
+    assert 'test_mean' in mutated.stdout
+    assert 'test_origin' not in mutated.stdout
+
+
+@pytest.mark.skipif(not fork_supported(), reason='os.fork() is not available')
+def test_fork_server_collects_project_modules_first(project):
+    server = ForkServer('pytest -q tests').start()
+    try:
+        assert server.collected == 2
+        mutated = PROJECT['sampling.py'].replace('sum(values)', '-sum(values)')
+        assert server.run_mutant('sampling.py', mutated, timeout=30) != 0
+        _, points = MutantGenerator().find_mutation_points(PROJECT['sampling.py'])
+        assert server.run_schemata_mutant('sampling.py', points[0]['id'], timeout=30) != 0
+        assert server.run_schemata_mutant('sampling.py', 0, timeout=30) == 0
+    finally:
+        server.close()
@@ -0,0 +1,114 @@
+# file: tests/test_sampling.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from mutest001 import MIN_EARLY_STOP_MUTANTS, score_converged
+from sampling import sample_fraction, sample_per_operator, score_interval, threshold_verdict
+
+
+def make_mutants(counts):
+    """Mutants of each (operator type, function) stratum, in generation order"""
+    mutants = []
+    for (operator_type, function), count in counts.items():
+        for _ in range(count):
+            mutants.append({'info': {'type': operator_type, 'function': function, 'id': len(mutants) + 1}})
+    return mutants
+
+
+STRATA = {('ArithmeticOperator', 'add'): 40, ('ComparisonOperator', 'add'): 30,
+          ('ComparisonOperator', 'check'): 20, ('LogicalOperator', 'check'): 10}
+
+
+def test_wilson_interval_without_population():
+    low, high = score_interval(8, 10)
+    assert low == pytest.approx(49.02, abs=0.01)
+    assert high == pytest.approx(94.33, abs=0.01)
+
+
+def test_finite_population_correction_narrows_interval():
+    plain = score_interval(8, 10)
+    corrected = score_interval(8, 10, population=20)
+    assert plain[0] < corrected[0] < 80 < corrected[1] < plain[1]
+    # Half the population sampled: the sample counts as (population - 1) mutants
+    assert corrected == pytest.approx(score_interval(8 * 1.9, 19))
+
+
+def test_large_population_matches_uncorrected_interval():
+    assert score_interval(8, 10, population=10 ** 9) == pytest.approx(score_interval(8, 10))
+
+
+def test_full_population_is_a_single_point():
+    assert score_interval(7, 10, population=10) == pytest.approx((70.0, 70.0))
+
+
+def test_interval_stays_within_bounds():
+    assert score_interval(0, 0) == (0.0, 100.0)
+    low, high = score_interval(10, 10)
+    assert 0 < low < high == 100.0
+    low, high = score_interval(0, 10, population=15)
+    assert low == 0.0 < high < 100.0
+
+
+def test_threshold_verdict_needs_whole_interval_on_one_side():
+    assert threshold_verdict((80.0, 90.0), 80) == 'above'
+    assert threshold_verdict((60.0, 79.9), 80) == 'below'
+    assert threshold_verdict((75.0, 85.0), 80) is None
+    assert threshold_verdict((70.0, 80.0), 80) is None
+
+
+def test_sample_fraction_is_proportional_and_seeded():
+    mutants = make_mutants(STRATA)
+    sample = sample_fraction(mutants, 0.5, seed=3)
+
+    assert len(sample) == 50
+    for key, count in STRATA.items():
+        taken = [m for m in sample if (m['info']['type'], m['info']['function']) == key]
+        assert len(taken) == count // 2
+    assert sample == sample_fraction(mutants, 0.5, seed=3)
+    assert [m['info']['id'] for m in sample] == sorted(m['info']['id'] for m in sample)
+
+
+def test_sample_fraction_hands_rounding_slots_to_largest_remainders():
+    mutants = make_mutants({('ArithmeticOperator', 'f'): 5, ('ComparisonOperator', 'f'): 3,
+                            ('LogicalOperator', 'f'): 2})
+    # Quotas 1.5, 0.9 and 0.6: the two leftover slots go to the .9 and .6 strata
+    sample = sample_fraction(mutants, 0.3)
+    assert sorted(m['info']['type'] for m in sample) == [
+        'ArithmeticOperator', 'ComparisonOperator', 'LogicalOperator']
+
+
+def test_sample_per_operator_caps_every_type():
+    sample = sample_per_operator(make_mutants(STRATA), 15, seed=1)
+    types = [m['info']['type'] for m in sample]
+    assert types.count('ArithmeticOperator') == 15
+    assert types.count('ComparisonOperator') == 15
+    assert types.count('LogicalOperator') == 10
+
+
+def make_results(killed, survived):
+    return [{'status': 'killed'}] * killed + [{'status': 'survived'}] * survived
+
+
+def test_score_never_converges_on_few_mutants():
+    results = make_results(MIN_EARLY_STOP_MUTANTS - 1, 0)
+    assert not score_converged(results, 1000, 0.95, stop_margin=50, stop_threshold=10)
+
+
+def test_score_converges_once_interval_clears_threshold():
+    # 20 of 20 killed: [84.1, 100]; 10 of 20: [30.1, 69.9]
+    assert score_converged(make_results(20, 0), 1000, 0.95, stop_threshold=80)
+    assert score_converged(make_results(0, 20), 1000, 0.95, stop_threshold=20)
+    assert not score_converged(make_results(10, 10), 1000, 0.95, stop_threshold=50)
+    assert not score_converged(make_results(20, 0), 1000, 0.95, stop_threshold=90)
+
+
+def test_score_converges_once_interval_is_within_margin():
+    assert score_converged(make_results(10, 10), 1000, 0.95, stop_margin=20)
+    assert not score_converged(make_results(10, 10), 1000, 0.95, stop_margin=19)
+    assert not score_converged(make_results(10, 10), 1000, 0.95)
+
+
+def test_only_kills_count_towards_the_score():
+    results = make_results(0, 10) + [{'status': 'timeout'}] * 10
+    assert score_converged(results, 1000, 0.95, stop_threshold=20)
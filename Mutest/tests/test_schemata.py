@@ -0,0 +1,111 @@
+# file: tests/test_schemata.py
+import sys
+import types
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from runtime import mutest_runtime
+from mutest001 import MutantGenerator
+from schemata import build_schemata
+
+
+SOURCE = '''\
+def price(base, tax):
+    return base + tax
+
+
+def is_adult(age):
+    return age >= 18
+
+
+def both(a, b):
+    return a and b
+
+
+def between(x):
+    return 0 < x < 10
+
+
+BASE = 2
+LIMIT = BASE * 3
+'''
+
+
+def load(source_code):
+    """Schemata module of source_code, with the ids of its switchable mutants"""
+    tree, points = MutantGenerator().find_mutation_points(source_code)
+    tree, switched = build_schemata(tree, points)
+    module = types.ModuleType('schemata_under_test')
+    module.__file__ = 'schemata_under_test.py'
+    mutest_runtime.exec_code(tree, module)
+    return module, points, switched
+
+
+def point(points, function, original, mutated):
+    return next(p for p in points if p.get('function') == function
+                and p['original'] == original and p['mutated'] == mutated)
+
+
+@pytest.fixture(autouse=True)
+def original_code():
+    mutest_runtime.activate(0)
+    yield
+    mutest_runtime.activate(0)
+
+
+def test_original_code_runs_with_no_mutant_active():
+    module, _, _ = load(SOURCE)
+    assert module.price(2, 3) == 5
+    assert module.is_adult(18) is True
+    assert module.both(1, 0) == 0
+    assert module.between(5) is True
+
+
+def test_binop_switch_selects_active_mutant():
+    module, points, switched = load(SOURCE)
+    sub = point(points, 'price', 'Add', 'Sub')
+    mult = point(points, 'price', 'Add', 'Mult')
+    assert {sub['id'], mult['id']} <= switched
+
+    mutest_runtime.activate(sub['id'])
+    assert module.price(2, 3) == -1
+    mutest_runtime.activate(mult['id'])
+    assert module.price(2, 3) == 6
+
+
+def test_compare_switch_selects_active_mutant():
+    module, points, switched = load(SOURCE)
+    gt = point(points, 'is_adult', 'GtE', 'Gt')
+    assert gt['id'] in switched
+
+    mutest_runtime.activate(gt['id'])
+    assert module.is_adult(18) is False
+    assert module.is_adult(19) is True
+
+
+def test_boolop_switch_selects_active_mutant():
+    module, points, switched = load(SOURCE)
+    mutant = point(points, 'both', 'And', 'Or')
+    assert mutant['id'] in switched
+
+    mutest_runtime.activate(mutant['id'])
+    assert module.both(1, 0) == 1
+
+
+def test_other_mutants_leave_function_unchanged():
+    module, points, _ = load(SOURCE)
+    gt = point(points, 'is_adult', 'GtE', 'Gt')
+
+    mutest_runtime.activate(gt['id'])
+    assert module.price(2, 3) == 5
+    assert module.both(1, 0) == 0
+
+
+def test_import_time_and_chained_points_are_not_switched():
+    _, points, switched = load(SOURCE)
+    module_level = [p['id'] for p in points if p['function'] == '<module>']
+    chained = [p['id'] for p in points if p.get('function') == 'between']
+    assert module_level and chained
+    assert not switched & set(module_level)
+    assert not switched & set(chained)
+
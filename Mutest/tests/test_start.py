@@ -0,0 +1,37 @@
+# file: tests/test_start.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from start import plan_jobs
+
+
+def config(source, test_cmd):
+    return {'name': source, 'source': source, 'test_cmd': test_cmd}
+
+
+def test_each_distinct_pair_is_one_job():
+    jobs = plan_jobs({
+        '1': config('calc.py', 'pytest tests/test_calc.py'),
+        '2': config('shapes.py', 'pytest tests/test_calc.py'),
+        '3': config('calc.py', 'pytest tests'),
+    })
+    assert [(job['source'], job['test_cmd'], job['keys']) for job in jobs] == [
+        ('calc.py', 'pytest tests/test_calc.py', ['1']),
+        ('shapes.py', 'pytest tests/test_calc.py', ['2']),
+        ('calc.py', 'pytest tests', ['3']),
+    ]
+
+
+def test_same_source_and_tests_run_once():
+    jobs = plan_jobs({
+        '1': config('calc.py', 'pytest tests'),
+        '2': config('./calc.py', 'pytest  tests '),
+        '3': config('shapes.py', 'pytest tests'),
+    })
+    assert [(job['source'], job['keys']) for job in jobs] == [('calc.py', ['1', '2']), ('shapes.py', ['3'])]
+    # The first configuration's command is run as written
+    assert jobs[0]['test_cmd'] == 'pytest tests'
+
+
+def test_no_configs_no_jobs():
+    assert plan_jobs({}) == []
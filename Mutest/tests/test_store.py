@@ -0,0 +1,129 @@
+# file: tests/test_store.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from mutest001 import MutantGenerator, MutationTestExecutor
+from store import ResultStore
+
+
+SOURCE = 'def add(a, b):\n    return a + b\n'
+COMMAND = 'pytest tests/test_add.py'
+
+
+def make_mutants(mutated=('Sub', 'Mult', 'Div')):
+    return [{'info': {'type': 'ArithmeticOperator', 'original': 'Add', 'mutated': op,
+                      'line': 2, 'col': 11, 'op_index': 0}}
+            for op in mutated]
+
+
+def make_result(number, status, mutated='Sub'):
+    return {'mutant_number': number, 'status': status,
+            'mutation_info': {'original': 'Add', 'mutated': mutated}}
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / 'calc.py'
+    path.write_text(SOURCE)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / 'cache' / 'runs.db'))
+    yield store
+    store.close()
+
+
+def test_interrupted_run_resumes_with_recorded_verdicts(store, source_file):
+    run_id, completed = store.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    assert completed == {}
+    store.record(run_id, make_result(1, 'killed'))
+    store.record(run_id, make_result(2, 'survived', 'Mult'))
+
+    resumed_id, completed = store.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    assert resumed_id == run_id
+    assert completed == {1: make_result(1, 'killed'), 2: make_result(2, 'survived', 'Mult')}
+
+
+def test_verdicts_survive_reopening_the_database(tmp_path, source_file):
+    path = str(tmp_path / 'runs.db')
+    first = ResultStore(path)
+    run_id, _ = first.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    first.record(run_id, make_result(1, 'killed'))
+    first.close()
+
+    second = ResultStore(path)
+    try:
+        resumed_id, completed = second.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    finally:
+        second.close()
+    assert resumed_id == run_id
+    assert list(completed) == [1]
+
+
+def test_finished_run_is_never_resumed(store, source_file):
+    run_id, _ = store.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    store.record(run_id, make_result(1, 'killed'))
+    store.finish(run_id)
+
+    new_id, completed = store.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    assert new_id != run_id
+    assert completed == {}
+
+
+def test_resume_needs_same_source_command_and_mutants(store, source_file):
+    run_id, _ = store.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    store.record(run_id, make_result(1, 'killed'))
+
+    _, completed = store.open_run(str(source_file), COMMAND + ' -x', make_mutants(), resume=True)
+    assert completed == {}
+    _, completed = store.open_run(str(source_file), COMMAND, make_mutants(('Sub', 'Mult')), resume=True)
+    assert completed == {}
+    source_file.write_text(SOURCE.replace('a + b', 'b + a'))
+    _, completed = store.open_run(str(source_file), COMMAND, make_mutants(), resume=True)
+    assert completed == {}
+
+
+def test_without_resume_a_new_run_starts(store, source_file):
+    run_id, _ = store.open_run(str(source_file), COMMAND, make_mutants())
+    store.record(run_id, make_result(1, 'killed'))
+
+    new_id, completed = store.open_run(str(source_file), COMMAND, make_mutants())
+    assert new_id != run_id
+    assert completed == {}
+
+
+def test_previous_results_skip_current_and_empty_runs(store, source_file):
+    first, _ = store.open_run(str(source_file), COMMAND, make_mutants())
+    store.record(first, make_result(1, 'survived'))
+    store.finish(first)
+    current, _ = store.open_run(str(source_file), COMMAND, make_mutants())
+
+    assert store.previous_results(str(source_file), COMMAND, current) == [make_result(1, 'survived')]
+    store.record(current, make_result(1, 'killed'))
+    assert store.previous_results(str(source_file), COMMAND) == [make_result(1, 'killed')]
+
+
+def test_operator_history_counts_escapes(store, source_file):
+    run_id, _ = store.open_run(str(source_file), COMMAND, make_mutants())
+    store.record(run_id, make_result(1, 'killed'))
+    store.record(run_id, make_result(2, 'survived'))
+    store.record(run_id, make_result(3, 'timeout'))
+    assert store.operator_history() == {('Add', 'Sub'): (1, 2)}
+
+
+def test_executor_resumes_only_untested_mutants(store, source_file):
+    mutants = MutantGenerator().generate_mutants(SOURCE)
+    first = MutationTestExecutor(str(source_file), COMMAND, store=store, resume=True)
+    first.prepare_run(mutants)
+    store.record(first.run_id, make_result(2, 'survived', mutants[1]['info']['mutated']))
+
+    # The first run was interrupted before finish_run()
+    second = MutationTestExecutor(str(source_file), COMMAND, store=store, resume=True)
+    pending = second.prepare_run(mutants)
+    assert second.run_id == first.run_id
+    assert [number for number, _ in pending] == [i for i in range(1, len(mutants) + 1) if i != 2]
+    assert [r['mutant_number'] for r in second.reused] == [2]
+    assert second.reused[0]['mutation_info'] == mutants[1]['info']
@@ -0,0 +1,62 @@
+# file: tests/test_tce.py
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mutest001 import MutantGenerator
+
+
+def operators(infos):
+    return [(info['function'], info['original'], info['mutated']) for info in infos]
+
+
+def test_mutant_folding_to_the_original_constant_is_equivalent():
+    # 2 * 2 and 2 + 2 both fold to 4
+    source = 'def f(x):\n    return x + 2 * 2\n\n\nLIMIT = 2 * 2\n'
+    generator = MutantGenerator()
+    mutants = generator.generate_mutants(source)
+
+    assert operators(generator.equivalent) == [('f', 'Mult', 'Add'), ('<module>', 'Mult', 'Add')]
+    assert all(info['equivalent'] for info in generator.equivalent)
+    assert ('Mult', 'Add') not in [(m['info']['original'], m['info']['mutated']) for m in mutants]
+    assert generator.duplicates == []
+
+
+def test_mutant_folding_like_an_earlier_one_is_a_duplicate():
+    # 2 + 2 and 2 * 2 both fold to 4
+    source = 'def f(x):\n    return x + (2 - 2)\n'
+    generator = MutantGenerator()
+    mutants = generator.generate_mutants(source)
+
+    assert len(generator.duplicates) == 1
+    duplicate = generator.duplicates[0]
+    assert (duplicate['original'], duplicate['mutated']) == ('Sub', 'Mult')
+    first = next(m['info'] for m in mutants if (m['info']['original'], m['info']['mutated']) == ('Sub', 'Add'))
+    assert duplicate['duplicate_of'] == first['id']
+    assert generator.equivalent == []
+
+
+def test_duplicates_are_only_detected_within_a_function():
+    source = 'def f(x):\n    return x + (2 - 2)\n\n\ndef g(x):\n    return x + (2 - 2)\n'
+    generator = MutantGenerator()
+    generator.generate_mutants(source)
+    assert [(info['function'], info['mutated']) for info in generator.duplicates] == [('f', 'Mult'), ('g', 'Mult')]
+
+
+def test_without_tce_every_mutant_is_kept():
+    source = 'def f(x):\n    return x + (2 - 2)\n\n\nLIMIT = 2 * 2\n'
+    with_tce = MutantGenerator()
+    kept = with_tce.generate_mutants(source)
+    without_tce = MutantGenerator(tce=False)
+    everything = without_tce.generate_mutants(source)
+
+    assert len(everything) == len(kept) + len(with_tce.equivalent) + len(with_tce.duplicates)
+    assert len(with_tce.equivalent) == 1 and len(with_tce.duplicates) == 1
+    assert without_tce.equivalent == [] and without_tce.duplicates == []
+    assert not any('equivalent' in m['info'] or 'duplicate_of' in m['info'] for m in everything)
+
+
+def test_distinct_mutants_are_all_kept():
+    source = 'def f(x, y):\n    return x + y\n'
+    generator = MutantGenerator()
+    assert len(generator.generate_mutants(source)) == len(MutantGenerator(tce=False).generate_mutants(source))
+    assert generator.equivalent == [] and generator.duplicates == []